@@ -0,0 +1,134 @@
+"""
+Write-path change events.
+
+Mutating services publish a ChangeEvent once their transaction is committed.
+Subscribers react to it; the default subscriber drops only the cache sections
+that depend on the changed entity, so cached reads stay O(1) and can live far
+longer than a day without going stale.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from utilities.common.app_config import config
+from utilities.common.base_fetcher import _build_cache_key
+
+logger = config.setup_logger("backend.common.change_events")
+
+# ---------------------------------------------------------------
+# Entities
+# ---------------------------------------------------------------
+USER = "user"
+INCOME = "income"
+EXPENSE = "expense"
+DIVIDEND = "dividend"
+STOCK = "stock"
+MUTUAL_FUND = "mutual_fund"
+BULLION = "bullion"
+CRYPTO = "crypto"
+REAL_ESTATE = "real_estate"
+PROTECTED_INSTRUMENT = "protected_instrument"
+VALUATION = "valuation"  # market-price refresh of holdings and summaries
+PORTFOLIO_CONFIG = "portfolio_config"
+STOCK_FUNDAMENTALS = "stock_fundamentals"
+STRATEGY_CONFIG = "strategy_config"
+
+# Subscribe to this to receive every event
+ALL = "*"
+
+# Maps the investment_type strings used by the investment services to entities
+INVESTMENT_ENTITIES = {
+    "stock": STOCK,
+    "stocks": STOCK,
+    "mutual fund": MUTUAL_FUND,
+    "bullion": BULLION,
+    "real estate": REAL_ESTATE,
+    "crypto": CRYPTO,
+}
+
+# ---------------------------------------------------------------
+# Cache sections and their dependencies
+# ---------------------------------------------------------------
+DASHBOARD_SUMMARY = _build_cache_key("dashboard", "summary")
+DASHBOARD_FLOWS = _build_cache_key("dashboard", "flows")
+DASHBOARD_HOLDINGS = _build_cache_key("dashboard", "holdings")
+REBALANCING_PLAN = _build_cache_key("rebalancing_screener", "plan")
+STOCK_SCORES = _build_cache_key("stock_scores_v1", "TOP_500_STOCKS")
+STOCK_SCORES_VERSION = _build_cache_key("stock_scores_v1", "VERSION")
+
+# Income/expense/investment flows feed the YTD windows, cash balance and trends
+_FLOW_SECTIONS = [DASHBOARD_SUMMARY, DASHBOARD_FLOWS]
+# Summary rows feed the asset values, returns and the rebalancing plan
+_HOLDING_SECTIONS = [DASHBOARD_SUMMARY, DASHBOARD_HOLDINGS, REBALANCING_PLAN]
+# Investment transactions move both the flows and the summary rows
+_INVESTMENT_SECTIONS = _FLOW_SECTIONS + [DASHBOARD_HOLDINGS, REBALANCING_PLAN]
+
+CACHE_DEPENDENCIES: Dict[str, List[str]] = {
+    INCOME: _FLOW_SECTIONS,
+    EXPENSE: _FLOW_SECTIONS,
+    DIVIDEND: _FLOW_SECTIONS,
+    STOCK: _INVESTMENT_SECTIONS,
+    MUTUAL_FUND: _INVESTMENT_SECTIONS,
+    BULLION: _INVESTMENT_SECTIONS,
+    CRYPTO: _INVESTMENT_SECTIONS,
+    REAL_ESTATE: _INVESTMENT_SECTIONS,
+    VALUATION: _HOLDING_SECTIONS,
+    PORTFOLIO_CONFIG: [REBALANCING_PLAN],
+    STOCK_FUNDAMENTALS: [STOCK_SCORES, STOCK_SCORES_VERSION],
+    STRATEGY_CONFIG: [STOCK_SCORES, STOCK_SCORES_VERSION],
+}
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    entity: str
+    action: str  # create | update | delete | refresh
+    user_id: Optional[int] = None
+
+
+_subscribers: Dict[str, List[Callable[[ChangeEvent], None]]] = defaultdict(list)
+
+
+def subscribe(entity: str, handler: Callable[[ChangeEvent], None]):
+    """Register a handler for events on an entity (or ALL for every event)."""
+    if handler not in _subscribers[entity]:
+        _subscribers[entity].append(handler)
+
+
+def unsubscribe(entity: str, handler: Callable[[ChangeEvent], None]):
+    """Remove a previously registered handler."""
+    if handler in _subscribers[entity]:
+        _subscribers[entity].remove(handler)
+
+
+def publish(entity: str, action: str, user_id: Optional[int] = None) -> ChangeEvent:
+    """
+    Publish a change event to all subscribers.
+
+    Call this only after the write has been committed. Handler failures are
+    logged and never propagate back into the write path.
+    """
+    event = ChangeEvent(entity=entity, action=action, user_id=user_id)
+    for handler in _subscribers[entity] + _subscribers[ALL]:
+        try:
+            handler(event)
+        except Exception as e:
+            logger.warning(f"Change handler failed for {entity}/{action}: {e}")
+    return event
+
+
+def invalidate_cache_sections(event: ChangeEvent):
+    """Default subscriber: delete the cache sections that depend on the entity."""
+    keys = CACHE_DEPENDENCIES.get(event.entity)
+    if not keys:
+        return
+
+    try:
+        config.redis_client().delete(*keys)
+        logger.debug(f"Invalidated {keys} after {event.entity}/{event.action}")
+    except Exception as e:
+        logger.warning(f"Cache invalidation failed for {event.entity}: {e}")
+
+
+subscribe(ALL, invalidate_cache_sections)
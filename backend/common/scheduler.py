@@ -0,0 +1,310 @@
+"""
+In-process background scheduler for the jobs in scripts/jobs.py.
+
+Jobs run off the request path on worker threads, each on its own interval with
+random jitter. A semaphore caps how many run at once, and a Redis lock per job
+makes every run single-flight across all API workers. The time of the last
+successful run is also kept in Redis, so restarts and sibling workers don't
+repeat a job that has just run.
+
+A job can depend on other jobs: it waits until each of them has a successful
+run on record (here or on another worker), and is woken as soon as one
+completes, so e.g. prices are never revalued before forex rates are cached.
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional, Tuple
+
+from utilities.common.app_config import config
+from utilities.common.base_fetcher import _build_cache_key
+
+logger = config.setup_logger("backend.common.scheduler")
+
+# How often a job blocked on its dependencies checks them again
+DEPENDENCY_RETRY_SECONDS = 60
+
+
+@dataclass
+class ScheduledJob:
+    name: str
+    func: Callable
+    interval_seconds: int
+    jitter_seconds: int = 0
+    initial_delay_seconds: int = 0
+    lock_ttl_seconds: int = 1800
+    depends_on: Tuple[str, ...] = ()
+
+    # Status
+    state: str = (
+        "scheduled"  # scheduled | waiting | running | success | failed | skipped
+    )
+    last_started: Optional[str] = None
+    last_finished: Optional[str] = None
+    last_duration_seconds: Optional[float] = None
+    last_error: Optional[str] = None
+    next_run_at: Optional[str] = None
+    run_count: int = 0
+    _wakeup: asyncio.Event = field(default=None, repr=False)
+
+    def status(self) -> dict:
+        return {
+            name: getattr(self, name)
+            for name in (
+                "name",
+                "state",
+                "interval_seconds",
+                "jitter_seconds",
+                "depends_on",
+                "last_started",
+                "last_finished",
+                "last_duration_seconds",
+                "last_error",
+                "next_run_at",
+                "run_count",
+            )
+        }
+
+
+def _iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+class JobScheduler:
+    """Runs registered jobs periodically on background tasks."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 2,
+        notify: Optional[Callable[[str, dict], None]] = None,
+    ):
+        """
+        Args:
+            max_concurrency: Maximum number of jobs running at the same time
+            notify: Optional callback(event, payload) for job completion/failure
+        """
+        self.max_concurrency = max_concurrency
+        self.notify = notify
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.cache_key_prefix = "scheduler"
+
+    def register(
+        self,
+        name: str,
+        func: Callable,
+        interval_seconds: int,
+        jitter_seconds: int = 0,
+        initial_delay_seconds: int = 0,
+        lock_ttl_seconds: int = 1800,
+        depends_on: Tuple[str, ...] = (),
+    ):
+        self.jobs[name] = ScheduledJob(
+            name=name,
+            func=func,
+            interval_seconds=interval_seconds,
+            jitter_seconds=jitter_seconds,
+            initial_delay_seconds=initial_delay_seconds,
+            lock_ttl_seconds=lock_ttl_seconds,
+            depends_on=tuple(depends_on),
+        )
+
+    # ---------------------------------------------------------------
+    # Lifecycle
+    # ---------------------------------------------------------------
+    def start(self):
+        """Start one background task per job. Must be called inside the event loop."""
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        for job in self.jobs.values():
+            job._wakeup = asyncio.Event()
+            self._tasks[job.name] = asyncio.create_task(
+                self._job_loop(job), name=f"job:{job.name}"
+            )
+        logger.info(
+            f"⏰ Scheduler started with {len(self.jobs)} job(s), "
+            f"max concurrency {self.max_concurrency}"
+        )
+
+    async def stop(self):
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._tasks.clear()
+        logger.info("Scheduler stopped")
+
+    def trigger(self, name: str) -> bool:
+        """Run a job as soon as a concurrency slot is free."""
+        job = self.jobs.get(name)
+        if job is None or job._wakeup is None:
+            return False
+        job._wakeup.set()
+        return True
+
+    def status(self, name: Optional[str] = None):
+        if name is not None:
+            job = self.jobs.get(name)
+            return job.status() if job else None
+        return {job_name: job.status() for job_name, job in self.jobs.items()}
+
+    # ---------------------------------------------------------------
+    # Internals
+    # ---------------------------------------------------------------
+    def _redis(self):
+        try:
+            return config.redis_client()
+        except Exception as e:
+            logger.warning(f"Redis unavailable for scheduler, running unlocked: {e}")
+            return None
+
+    def _last_run_key(self, job: ScheduledJob) -> str:
+        return _build_cache_key(self.cache_key_prefix, f"last_run:{job.name}")
+
+    def _get_last_run(self, job: ScheduledJob) -> Optional[float]:
+        client = self._redis()
+        if client is None:
+            return None
+        try:
+            value = client.get(self._last_run_key(job))
+            return float(value) if value else None
+        except Exception as e:
+            logger.warning(f"Could not read last run of {job.name}: {e}")
+            return None
+
+    def _set_last_run(self, job: ScheduledJob, timestamp: float):
+        client = self._redis()
+        if client is None:
+            return
+        try:
+            client.set(self._last_run_key(job), timestamp, ex=job.interval_seconds * 2)
+        except Exception as e:
+            logger.warning(f"Could not record last run of {job.name}: {e}")
+
+    def _dependencies_met(self, job: ScheduledJob) -> bool:
+        """True when every dependency has succeeded here or on another worker."""
+        for name in job.depends_on:
+            dependency = self.jobs.get(name)
+            if dependency is not None and dependency.state == "success":
+                continue
+            if dependency is None or self._get_last_run(dependency) is None:
+                return False
+        return True
+
+    def _wake_dependents(self, job: ScheduledJob):
+        for dependent in self.jobs.values():
+            if job.name in dependent.depends_on and dependent.state == "waiting":
+                if dependent._wakeup is not None:
+                    dependent._wakeup.set()
+
+    def _next_delay(self, job: ScheduledJob) -> float:
+        return job.interval_seconds + random.uniform(0, job.jitter_seconds)
+
+    def _initial_delay(self, job: ScheduledJob) -> float:
+        """Honour a run that already happened elsewhere (other worker, last boot)."""
+        delay = job.initial_delay_seconds + random.uniform(0, job.jitter_seconds)
+        last_run = self._get_last_run(job)
+        if last_run is not None:
+            delay = max(delay, last_run + job.interval_seconds - time.time())
+        return delay
+
+    async def _job_loop(self, job: ScheduledJob):
+        delay = await asyncio.to_thread(self._initial_delay, job)
+        while True:
+            job.next_run_at = _iso(time.time() + delay)
+            forced = False
+            try:
+                await asyncio.wait_for(job._wakeup.wait(), timeout=delay)
+                forced = True
+            except asyncio.TimeoutError:
+                pass
+            job._wakeup.clear()
+
+            if job.depends_on and not await asyncio.to_thread(
+                self._dependencies_met, job
+            ):
+                job.state = "waiting"
+                logger.info(
+                    f"⏳ {job.name} waits for {', '.join(job.depends_on)} to succeed first"
+                )
+                delay = DEPENDENCY_RETRY_SECONDS
+                continue
+
+            async with self._semaphore:
+                await self._run_once(job, forced)
+            delay = self._next_delay(job)
+
+    async def _run_once(self, job: ScheduledJob, forced: bool = False):
+        client = await asyncio.to_thread(self._redis)
+        lock = None
+        if client is not None:
+            lock = client.lock(
+                _build_cache_key(self.cache_key_prefix, f"lock:{job.name}"),
+                timeout=job.lock_ttl_seconds,
+                blocking=False,
+                # acquire and release run on different worker threads
+                thread_local=False,
+            )
+            try:
+                acquired = await asyncio.to_thread(lock.acquire)
+            except Exception as e:
+                logger.warning(
+                    f"Lock for {job.name} unavailable, running unlocked: {e}"
+                )
+                acquired, lock = True, None
+            if not acquired:
+                job.state = "skipped"
+                logger.info(f"⏭️ {job.name} is already running on another worker")
+                return
+
+        try:
+            if not forced:
+                last_run = await asyncio.to_thread(self._get_last_run, job)
+                if last_run is not None and time.time() - last_run < (
+                    job.interval_seconds / 2
+                ):
+                    job.state = "skipped"
+                    logger.info(f"⏭️ {job.name} ran recently on another worker")
+                    return
+
+            started = time.time()
+            job.state = "running"
+            job.last_started = _iso(started)
+            logger.info(f"▶️ Running scheduled job {job.name}")
+            try:
+                await asyncio.to_thread(job.func)
+                job.state = "success"
+                job.last_error = None
+                await asyncio.to_thread(self._set_last_run, job, started)
+                self._wake_dependents(job)
+            except Exception as e:
+                job.state = "failed"
+                job.last_error = str(e)
+                logger.error(f"❌ Scheduled job {job.name} failed: {e}", exc_info=True)
+            finally:
+                job.run_count += 1
+                job.last_finished = _iso(time.time())
+                job.last_duration_seconds = round(time.time() - started, 2)
+
+            await asyncio.to_thread(self._notify, job)
+        finally:
+            if lock is not None:
+                try:
+                    await asyncio.to_thread(lock.release)
+                except Exception as e:
+                    logger.warning(f"Could not release lock for {job.name}: {e}")
+
+    def _notify(self, job: ScheduledJob):
+        if self.notify is None:
+            return
+        event = "job_completed" if job.state == "success" else "job_failed"
+        try:
+            self.notify(event, job.status())
+        except Exception as e:
+            logger.warning(f"Job notification failed for {job.name}: {e}")
+
+
+# Global scheduler instance; jobs are registered and started in the app lifespan
+jobScheduler = JobScheduler(max_concurrency=config.SCHEDULER_MAX_CONCURRENCY)
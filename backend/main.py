@@ -1,10 +1,9 @@
-import json
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, APIRouter
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
 
+from backend.common.scheduler import jobScheduler
 from backend.raiden_integration import raiden_client
 from backend.routes import dashboard_routes, portfolio_routes
 from backend.routes import (
@@ -14,6 +13,7 @@ from backend.routes import (
     income_routes,
 )
 from backend.routes import transaction_import_routes, protected_instrument_routes
+from backend.routes import scheduler_routes
 from backend.routes.analytics import score_routes
 from backend.routes.categories import category_routes
 from backend.routes.configurations import config_routes
@@ -25,33 +25,8 @@ from backend.routes.investments import (
     crypto as crypto_route,
     dividend as dividend_route,
 )
-from backend.services.db_services import get_db
-from scripts.fetch_mutual_funds import mutual_funds_list
-from scripts.fetch_stocks import (
-    common_stock_prices,
-    dividend_stock_prices,
-    dividends_data,
-    dividend_stock_list,
-)
-from utilities.analytics.balancing_screener import BalancingScreener, balancingScreener
-from utilities.analytics.stock_analyzer import get_stock_score
-from utilities.analytics.stock_merger import StockMerger as sM, stockMerger
+from scripts.jobs import register_scheduled_jobs
 from utilities.common.app_config import config
-from utilities.dashboard.dashboard_calculation_helper import DashboardDataCalculator
-from utilities.dashboard.dashboard_calculation_helper import dashboardDataCalculator
-from utilities.fetch_overall_investment_data import (
-    get_investments_symbols,
-)
-from utilities.forex_exchange_rate_fetcher import (
-    ForexExchangeRateFetcher as fF,
-    forexFetcher,
-)
-from utilities.metal_rate_fetcher import MetalRateFetcher as mRF, bullionFetcher
-from utilities.mutual_fund_price_fetcher import (
-    MutualFundPriceFetcher as mfF,
-    mutualFundFetcher,
-)
-from utilities.stock_price_fetcher import StockPriceFetcher as sPF, stockFetcher
 
 # Set up centralized logger for main application
 logger = config.setup_logger("api.main")
@@ -70,73 +45,27 @@ def safe_float(value, default=0.0):
         return default
 
 
-def startup_logic():
-    logger.info("=" * 60)
-    logger.info("Starting application logic...")
-    raiden_client.send_event(
-        "scheduler_started", {"message": "Financer startup logic beginning"}
-    )
-    logger.info("=" * 60)
-    try:
-        db: Session = next(get_db())
-
-        # Fetch exchange rates
-        fF.get_exchange_rates(forexFetcher, "USD", "INR")
-        fF.get_exchange_rates(forexFetcher, "PLN", "INR")
-        fF.get_exchange_rates(forexFetcher, "USD", "PLN")
-
-        # Get all investment data and stock prices upfront
-        all_investment_data = get_investments_symbols(db)
-
-        # Extracting investment specific data from the DB
-        common_stock_list = all_investment_data.get("common_stocks", {})
-        sPF.update_stock_summary(stockFetcher, db, common_stock_prices)
-        sPF.update_stock_summary(
-            stockFetcher, db, dividend_stock_prices, dividends_data
-        )
-
-        logger.info(f"Mutual Fund list: {mutual_funds_list}")
-        mf_data = mfF.get_mutual_fund_rates_bulk(mutualFundFetcher, mutual_funds_list)
-        mfF.update_mutual_fund_investments(mutualFundFetcher, db, mf_data)
-        mfF.update_mutual_fund_summary(mutualFundFetcher, db, mf_data)
-
-        bullion_data = {
-            "Gold": mRF.get_gold_rate(bullionFetcher),
-            "Silver": mRF.get_silver_rate(bullionFetcher),
-        }
-        mRF.update_bullion_investments(bullionFetcher, db, bullion_data)
-        mRF.update_bullion_summary(bullionFetcher, db, bullion_data)
-        DashboardDataCalculator.get_investment_data(dashboardDataCalculator)
-        out = BalancingScreener.run_cycle(balancingScreener)
-        logger.info("Portfolio Rebalancing Plan:")
-        logger.info(json.dumps(out, indent=2))
-
-        common_stock_list.extend(dividend_stock_list)
-
-        sM.merge_stock_lists(stockMerger)
-        sM.merge_with_ticker_data(stockMerger, db)
-        get_stock_score()
-
-        raiden_client.send_event("scheduler_completed", {"status": "success"})
-
-    except Exception as e:
-        raiden_client.send_event("scheduler_failed", {"error": str(e)})
-        logger.error(f"Error executing startup logic: {e}", exc_info=True)
-        # We catch exceptions to prevent app startup failure if logic is buggy
-
-    logger.info("=" * 60)
-    logger.info("Startup logic completed successfully")
-    logger.info("=" * 60)
-
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Register with Raiden and start heartbeat
     raiden_client.register()
     raiden_client.start_heartbeat()
 
-    startup_logic()
+    # Refresh jobs run in the background, the API serves traffic right away
+    if config.SCHEDULER_ENABLED:
+        register_scheduled_jobs(jobScheduler)
+        jobScheduler.notify = raiden_client.send_event
+        jobScheduler.start()
+        raiden_client.send_event(
+            "scheduler_started", {"message": "Financer background jobs scheduled"}
+        )
+    else:
+        logger.info("Background scheduler disabled (SCHEDULER_ENABLED=false)")
+
     yield
+
+    if config.SCHEDULER_ENABLED:
+        await jobScheduler.stop()
     raiden_client.stop_heartbeat()
     logger.info("Shutting down application...")
 
@@ -161,6 +90,7 @@ api_router.include_router(category_routes.router)
 api_router.include_router(score_routes.router)
 api_router.include_router(transaction_import_routes.router)
 api_router.include_router(protected_instrument_routes.router)
+api_router.include_router(scheduler_routes.router)
 
 app.include_router(api_router)
 
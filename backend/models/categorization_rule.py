@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint
+
+from backend.services.db_services import Base
+
+
+class LearnedRule(Base):
+    """
+    A keyword learned from a category or income source the user picked during a
+    bank import. Matched ahead of the keyword rules in bank_config.py and loaded
+    by backend.services.categorization_rules.
+    """
+
+    __tablename__ = "learned_rule"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    rule_type = Column(String(10), nullable=False)  # category | source
+    keyword = Column(String(255), nullable=False)  # lower-cased
+    # expense_category_id for category rules, income_source_id for source rules
+    target_id = Column(Integer, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+    last_updated = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("rule_type", "keyword", name="uq_learned_rule_type_keyword"),
+    )
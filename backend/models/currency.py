@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Float, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, Float, Date, DateTime, Index
 
 from backend.services.db_services import Base
 
@@ -28,3 +28,23 @@ class Regions(Base):
     region_id = Column(Integer, primary_key=True, autoincrement=True)
     region_name = Column(String(255), nullable=False, unique=True)
     currency_id = Column(Integer, ForeignKey("currencies.currency_id"), nullable=False)
+
+
+class FxRateDaily(Base):
+    """
+    Daily exchange rates of every currency the rate API quotes, one row per
+    currency and day. Written by ForexExchangeRateFetcher; aggregate queries
+    join it to convert amounts at today's or the transaction date's rate.
+    """
+
+    __tablename__ = "fx_rate_daily"
+    rate_date = Column(Date, primary_key=True)
+    currency_code = Column(String(3), primary_key=True)
+    units_per_usd = Column(Float, nullable=False)
+    rate_to_inr = Column(Float, nullable=False)  # INR for one unit of currency_code
+    source = Column(String(50), nullable=False)
+    last_updated = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_fx_rate_daily_currency_date", "currency_code", "rate_date"),
+    )
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Float, DateTime, Index
+
+from backend.services.db_services import Base
+
+
+class ImportFingerprint(Base):
+    """
+    One row per transaction confirmed through the bank CSV import, keyed by a
+    hash of its user, type, date, amount, currency and normalized description.
+    The import preview checks new statements against it to flag rows that were
+    already imported. Maintained by backend.services.transaction_import_service.
+    """
+
+    __tablename__ = "import_fingerprint"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
+    fingerprint = Column(String(64), nullable=False)  # sha256 hex
+    txn_type = Column(String(10), nullable=False)  # income | expense
+    txn_date = Column(DateTime, nullable=False)
+    amount = Column(Float, nullable=False)
+    currency = Column(String(255), nullable=False)
+    description_hash = Column(String(64), nullable=False)
+    created_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_import_fingerprint_user_fingerprint", "user_id", "fingerprint"),
+    )
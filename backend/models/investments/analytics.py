@@ -1,4 +1,13 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Float, DateTime, Boolean
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    ForeignKey,
+    Float,
+    DateTime,
+    Boolean,
+    JSON,
+)
 from sqlalchemy.dialects.postgresql import JSONB
 
 from backend.services.db_services import Base
@@ -37,3 +46,47 @@ class StocksValuableData(Base):
     updated_flag = Column(Boolean)
     created_at = Column(DateTime)
     last_updated = Column(DateTime)
+
+
+class StockFundamentalsLatest(Base):
+    """
+    Latest StocksValuableData snapshot of every symbol, with extra_metrics
+    already flattened to the metric names the analyzer scores on. Maintained by
+    utilities.analytics.fundamentals_store whenever fundamentals are written;
+    older snapshots live in its Parquet archive.
+    """
+
+    __tablename__ = "stock_fundamentals_latest"
+    symbol = Column(String(20), primary_key=True)
+    sector = Column(String(50))
+    sub_sector = Column(String(50))
+    date = Column(DateTime)
+    market_cap = Column(Float)
+    close_price = Column(Float)
+    pe_ratio = Column(Float)
+    pb_ratio = Column(Float)
+    peg_ratio = Column(Float)
+    roe = Column(Float)
+    roce = Column(Float)
+    debt_to_equity = Column(Float)
+    promoter_holding = Column(Float)
+    ebitda_margin = Column(Float)
+    ev_ebitda = Column(Float)
+    metrics = Column(JSON)
+    created_at = Column(DateTime)
+    last_updated = Column(DateTime)
+
+
+class StockSymbolAlias(Base):
+    """
+    Tickertape name a stock symbol was fuzzy-matched to, so later merges reuse
+    the match instead of searching again. Written by StockMerger._merge_dataframes.
+    """
+
+    __tablename__ = "stock_symbol_alias"
+    symbol = Column(String(20), primary_key=True)
+    # Normalized company name the match was made for; a renamed company is matched again
+    company_name = Column(String(255), nullable=False)
+    ticker_name = Column(String(255), nullable=False)
+    score = Column(Float)
+    last_updated = Column(DateTime)
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Float, DateTime, Index
+
+from backend.services.db_services import Base
+
+
+class MonthlyRollup(Base):
+    """
+    Materialized per-user, per-month, per-currency totals of income, expense and
+    investment transactions. Maintained by the write paths in
+    backend.services.rollup_services and rebuilt by scripts/backfill_rollups.py.
+    """
+
+    __tablename__ = "monthly_rollup"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
+    # income | expense | Stocks | Bullion | MutualFund | Crypto | RealEstate
+    source = Column(String(20), nullable=False)
+    month = Column(String(7), nullable=False)  # YYYY-MM
+    # Income and expense carry a currency code, investments a currency_id
+    currency = Column(String(255), nullable=True)
+    currency_id = Column(Integer, nullable=True)
+    total_amount = Column(Float, nullable=False)
+    transaction_count = Column(Integer, nullable=False)
+    last_updated = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_monthly_rollup_source_month", "source", "month"),
+        Index("ix_monthly_rollup_user_source_month", "user_id", "source", "month"),
+    )
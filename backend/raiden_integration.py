@@ -3,9 +3,8 @@ import threading
 import time
 from typing import Optional, Dict, Any
 
-import requests
-
 from utilities.common.app_config import config
+from utilities.common.http_client import http_client
 
 logger = config.setup_logger("api.raiden")
 
@@ -41,7 +40,7 @@ class RaidenIntegration:
 
         try:
             logger.info(f"Attempting to register with Raiden at {self.raiden_url}...")
-            response = requests.post(
+            response = http_client("raiden").post(
                 f"{self.raiden_url}/register", json=payload, timeout=5
             )
             response.raise_for_status()
@@ -77,7 +76,7 @@ class RaidenIntegration:
                     "status": "online",
                     "metrics": {"uptime": "running"},
                 }
-                response = requests.post(
+                response = http_client("raiden").post(
                     f"{self.raiden_url}/heartbeat", json=payload, timeout=5
                 )
                 if response.status_code != 200:
@@ -119,7 +118,7 @@ class RaidenIntegration:
     def _send_event_async(self, payload):
         try:
             logger.info(f"Emit event: {payload['event']}")
-            requests.post(self.n8n_url, json=payload, timeout=5)
+            http_client("n8n").post(self.n8n_url, json=payload, timeout=5)
         except Exception as e:
             logger.error(f"Failed to send event to N8N: {e}")
 
@@ -1,10 +1,10 @@
-from fastapi import APIRouter, Query
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from typing import Literal, Optional
 from utilities.common.app_config import config
 
 from backend.services.db_services import get_db
 from sqlalchemy.orm import Session
-from utilities.analytics.stock_analyzer import get_stock_score
+from utilities.analytics.score_index import CursorError, scoreIndex
 from utilities.fetch_overall_investment_data import get_investments_symbols
 
 logger = config.setup_logger("api.routes.analytics.score")
@@ -19,12 +19,20 @@ async def get_stock_scores(
     sector: Optional[str] = Query(None, description="Filter by sector"),
     sub_sector: Optional[str] = Query(None, description="Filter by sub-sector"),
     search: Optional[str] = Query(None, description="Search by symbol"),
+    prefix: Optional[str] = Query(None, description="Symbols starting with"),
     filter_type: Optional[str] = Query(
         None, description="Filter by type: Core, Accelerator, GEM"
     ),
+    sort_by: Optional[str] = Query(
+        None, description="Score or fundamental to sort by (e.g. core, pe_ratio)"
+    ),
+    order: Literal["asc", "desc"] = Query("desc", description="Sort order"),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor of the previous page (overrides page)"
+    ),
 ):
     """
-    Get paginated stock scores with optional filtering.
+    Get paginated stock scores with optional filtering and sorting.
 
     Args:
         page: Page number (1-indexed)
@@ -32,7 +40,11 @@ async def get_stock_scores(
         sector: Filter by sector name
         sub_sector: Filter by sub-sector name
         search: Search by stock symbol (case-insensitive)
+        prefix: Filter by symbol prefix (case-insensitive)
         filter_type: Filter by score type (Core > 0.2, Accelerator > 0.2, GEM > 0.2)
+        sort_by: Numeric field to sort by, stocks without a value last
+        order: "asc" or "desc"
+        cursor: Opaque cursor from a previous response; continues after its last stock
 
     Returns:
         {
@@ -41,46 +53,38 @@ async def get_stock_scores(
             "limit": 100,
             "total": 500,
             "pages": 5,
-            "has_more": true
+            "has_more": true,
+            "next_cursor": "..."
         }
     """
-    # Get all scores
-    all_scores = get_stock_score()
-
-    # Apply filters
-    filtered_scores = all_scores
-
-    if search:
-        search_lower = search.lower()
-        filtered_scores = [
-            s for s in filtered_scores if search_lower in s.get("symbol", "").lower()
-        ]
-
-    if sector:
-        filtered_scores = [s for s in filtered_scores if s.get("sector") == sector]
-
-    if sub_sector:
-        filtered_scores = [
-            s for s in filtered_scores if s.get("sub_sector") == sub_sector
-        ]
-
-    if filter_type:
-        if filter_type == "Core":
-            filtered_scores = [s for s in filtered_scores if s.get("core", 0) > 0.2]
-        elif filter_type == "Accelerator":
-            filtered_scores = [
-                s for s in filtered_scores if s.get("accelerators", 0) > 0.2
-            ]
-        elif filter_type == "GEM":
-            filtered_scores = [s for s in filtered_scores if s.get("gem", 0) > 0.2]
+    index = scoreIndex.ensure_fresh()
+
+    if sort_by and sort_by not in index.sortable_fields:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot sort by '{sort_by}'. Sortable fields: "
+            f"{', '.join(index.sortable_fields)}",
+        )
+
+    mask = index.candidates(sector, sub_sector, search, prefix, filter_type)
+    ordering = index.ordering(sort_by, descending=order == "desc")
 
     # Calculate pagination
-    total = len(filtered_scores)
+    total = len(index.records) if mask is None else int(mask.sum())
     pages = (total + limit - 1) // limit  # Ceiling division
-    offset = (page - 1) * limit
 
-    # Paginate
-    paginated_scores = filtered_scores[offset : offset + limit]
+    if cursor:
+        try:
+            scan_from = index.decode_cursor(cursor)
+        except CursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        scan_from = index.offset_to_scan_position(mask, ordering, (page - 1) * limit)
+
+    paginated_scores, next_position = index.page(mask, ordering, limit, scan_from)
+    next_cursor = (
+        index.encode_cursor(next_position) if next_position is not None else None
+    )
 
     logger.info(
         f"Returning page {page}/{pages} with {len(paginated_scores)} stocks (total: {total})"
@@ -92,7 +96,8 @@ async def get_stock_scores(
         "limit": limit,
         "total": total,
         "pages": pages,
-        "has_more": page < pages,
+        "has_more": next_cursor is not None,
+        "next_cursor": next_cursor,
     }
 
 
@@ -110,24 +115,7 @@ async def get_filter_options():
             }
         }
     """
-    all_scores = get_stock_score()
-
-    # Build hierarchy: Sector -> Set of Sub-sectors
-    sector_map = {}
-
-    for s in all_scores:
-        sec = s.get("sector")
-        sub = s.get("sub_sector")
-
-        if sec and sub:
-            if sec not in sector_map:
-                sector_map[sec] = set()
-            sector_map[sec].add(sub)
-
-    # Convert sets to sorted lists
-    result = {k: sorted(list(v)) for k, v in sector_map.items()}
-
-    return {"sectors": result}
+    return {"sectors": scoreIndex.ensure_fresh().hierarchy}
 
 
 # Get scores for currently invested stocks
@@ -156,8 +144,7 @@ async def get_invested_stock_scores():
     invested_symbols = {s for s in invested_symbols if s not in excluded}
 
     # Get all candidate scores
-    all_scores = get_stock_score()
-    score_map = {s.get("symbol"): s for s in all_scores}
+    score_map = scoreIndex.ensure_fresh().by_symbol
 
     results = []
 
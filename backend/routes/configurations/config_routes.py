@@ -3,6 +3,7 @@ import os
 
 from fastapi import APIRouter
 
+from backend.common import change_events
 from utilities.common.app_config import config
 
 logger = config.setup_logger("api.routes.config")
@@ -27,6 +28,7 @@ async def update_config(request: dict):
         return {"error": f"Config not found at path: {path}"}
     with open(path, "w") as f:
         json.dump(request, f, indent=2)
+    change_events.publish(change_events.PORTFOLIO_CONFIG, "update")
     return {"status": "success", "updated": "portfolio-config.json"}
 
 
@@ -48,6 +50,7 @@ async def update_stock_strategy_config(request: dict):
         return {"error": f"Config not found at path: {path}"}
     with open(path, "w") as f:
         json.dump(request, f, indent=2)
+    change_events.publish(change_events.STRATEGY_CONFIG, "update")
     return {"status": "success", "updated": "stock-score-config.json"}
 
 
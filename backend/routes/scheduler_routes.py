@@ -0,0 +1,38 @@
+from fastapi import APIRouter, HTTPException
+
+from backend.common.scheduler import jobScheduler
+from utilities.common.app_config import config
+from utilities.common.http_client import http_metrics
+
+logger = config.setup_logger("api.routes.scheduler")
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+# Status of every background job, with the health of the APIs they call
+@router.get("")
+async def get_jobs():
+    return {
+        "enabled": config.SCHEDULER_ENABLED,
+        "jobs": jobScheduler.status(),
+        "providers": http_metrics(),
+    }
+
+
+# Status of a single background job
+@router.get("/{job_name}")
+async def get_job(job_name: str):
+    status = jobScheduler.status(job_name)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_name}' not found")
+    return status
+
+
+# Run a background job now instead of waiting for its next slot
+@router.post("/{job_name}/run")
+async def run_job_now(job_name: str):
+    if job_name not in jobScheduler.jobs:
+        raise HTTPException(status_code=404, detail=f"Job '{job_name}' not found")
+    if not jobScheduler.trigger(job_name):
+        raise HTTPException(status_code=409, detail="Scheduler is not running")
+    logger.info(f"Manually triggered job {job_name}")
+    return {"message": f"Job '{job_name}' triggered", "job": job_name}
@@ -1,10 +1,14 @@
+from typing import Optional
+
 from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from backend.configurations.bank_config import BANK_MAPPINGS
 from backend.schemas.import_schema import ImportConfirmRequest
 from backend.services.db_services import get_db
 from backend.services.transaction_import_service import (
+    PREVIEW_MAX_ROWS,
     preview_csv_import,
     confirm_import_and_learn,
 )
@@ -19,18 +23,63 @@ def get_supported_banks():
 
 @router.post("/preview")
 async def preview_transactions(
-        bank_name: str = Form(...), currency: str = Form(...), file: UploadFile = File(...)
+        bank_name: str = Form(...),
+        currency: str = Form(...),
+        file: UploadFile = File(...),
+        offset: int = Form(0, ge=0),
+        limit: Optional[int] = Form(None, ge=1, le=PREVIEW_MAX_ROWS),
+        user_id: Optional[int] = Form(None),
+        db: Session = Depends(get_db),
 ):
     if not file.filename.endswith(".csv"):
         raise HTTPException(
             status_code=400, detail="Invalid file type. Please upload a CSV file."
         )
 
-    content = await file.read()
+    # With a user_id every row is flagged "duplicate" when it was imported before
     try:
-        # Returns List[Dict]
-        result = preview_csv_import(content, bank_name, currency)
-        return result
+        # The upload is parsed straight from its spooled file, off the event loop
+        if limit is None:
+            # Returns List[Dict], as long as the file fits in one response
+            rows = await run_in_threadpool(
+                preview_csv_import,
+                file.file,
+                bank_name,
+                currency,
+                offset,
+                PREVIEW_MAX_ROWS + 1,
+                db=db,
+                user_id=user_id,
+            )
+            if len(rows) > PREVIEW_MAX_ROWS:
+                raise HTTPException(
+                    status_code=413,
+                    detail=(
+                        f"The file has more than {PREVIEW_MAX_ROWS} transactions. "
+                        "Preview it in pages with offset and limit."
+                    ),
+                )
+            return rows
+
+        # One extra row tells whether another page follows
+        rows = await run_in_threadpool(
+            preview_csv_import,
+            file.file,
+            bank_name,
+            currency,
+            offset,
+            limit + 1,
+            db=db,
+            user_id=user_id,
+        )
+        return {
+            "data": rows[:limit],
+            "offset": offset,
+            "limit": limit,
+            "has_more": len(rows) > limit,
+        }
+    except HTTPException:
+        raise
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
@@ -0,0 +1,238 @@
+"""
+Keyword rules that categorize imported bank transactions.
+
+The configured rules live in bank_config.py; keywords learned from user
+corrections live in the learned_rule table and take precedence over them, the
+most recently learned first. Each worker keeps both compiled into
+KeywordMatchers. Learning a keyword bumps a version key in Redis, and every
+worker rebuilds its matchers the next time it checks that key, so a learned
+keyword applies to the next import without a restart.
+"""
+
+import threading
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+from backend.configurations.bank_config import (
+    CATEGORY_RULES,
+    DEFAULT_CATEGORY_ID,
+    INCOME_SOURCE_RULES,
+    DEFAULT_INCOME_SOURCE_ID,
+)
+from backend.models.categorization_rule import LearnedRule
+from backend.services.db_services import session_scope
+from utilities.common.app_config import config
+from utilities.common.base_fetcher import _build_cache_key
+from utilities.common.keyword_matcher import KeywordMatcher
+
+logger = config.setup_logger("backend.services.categorization_rules")
+
+RULES_VERSION_KEY = _build_cache_key("categorization_rules", "VERSION")
+CATEGORY = "category"
+SOURCE = "source"
+MAX_KEYWORD_LENGTH = 255
+
+_learned_table_ready = False
+
+
+def learned_rules_ready(db: Session) -> bool:
+    """Whether the learned_rule table exists; cached once it has been seen."""
+    global _learned_table_ready
+    if not _learned_table_ready:
+        _learned_table_ready = inspect(db.get_bind()).has_table(
+            LearnedRule.__tablename__
+        )
+    return _learned_table_ready
+
+
+def ensure_learned_rules(db: Session):
+    global _learned_table_ready
+    if learned_rules_ready(db):
+        return
+    logger.info("📦 learned_rule table missing, creating it")
+    LearnedRule.__table__.create(bind=db.get_bind(), checkfirst=True)
+    _learned_table_ready = True
+
+
+def publish_rules_version(redis_client) -> str:
+    """Tell every worker to rebuild its matchers."""
+    version = uuid.uuid4().hex
+    redis_client.set(RULES_VERSION_KEY, version)
+    return version
+
+
+def _ordered_rules(
+    learned: List[Tuple[int, str]], configured: Dict[int, List[str]]
+) -> List[Tuple[int, List[str]]]:
+    """Learned (target, keyword) pairs, newest first, ahead of the configured rules."""
+    rules = []
+    for target_id, keyword in learned:
+        if rules and rules[-1][0] == target_id:
+            rules[-1][1].append(keyword)
+        else:
+            rules.append((target_id, [keyword]))
+    return rules + list(configured.items())
+
+
+class RuleEngine:
+    """Compiled category and income source matchers, rebuilt when the rules change."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version: Optional[str] = None
+        self._matchers: Optional[Tuple[KeywordMatcher, KeywordMatcher]] = None
+        self._stale = False
+
+    def ensure_fresh(self, db: Optional[Session] = None) -> "RuleEngine":
+        """
+        Rebuild the matchers if the rules changed since the last build.
+
+        Without Redis the version can't be checked: the matchers already built
+        are kept, and built from the DB when there are none yet.
+        """
+        try:
+            redis_client = config.redis_client()
+            version = redis_client.get(RULES_VERSION_KEY)
+        except Exception as e:
+            logger.warning(
+                f"⚠️ Rules version unavailable, using the compiled rules: {e}"
+            )
+            redis_client = version = None
+
+        if redis_client is None:
+            if self._matchers is None or self._stale:
+                with self._lock:
+                    if self._matchers is None or self._stale:
+                        with session_scope(db) as session:
+                            self._build(session, None)
+            return self
+
+        if version is not None and version == self.version and not self._stale:
+            return self
+
+        with self._lock:
+            try:
+                version = redis_client.get(RULES_VERSION_KEY)
+                if version is None:
+                    version = publish_rules_version(redis_client)
+            except Exception as e:
+                logger.warning(
+                    f"⚠️ Rules version unavailable, rebuilding unversioned: {e}"
+                )
+                version = None
+            if version is not None and version == self.version and not self._stale:
+                return self
+            with session_scope(db) as session:
+                self._build(session, version)
+        return self
+
+    def invalidate(self):
+        """Rebuild on next use, even when the version can't be checked."""
+        self._stale = True
+
+    def _build(self, db: Session, version: str):
+        learned = {CATEGORY: [], SOURCE: []}
+        if learned_rules_ready(db):
+            rows = db.query(
+                LearnedRule.rule_type, LearnedRule.target_id, LearnedRule.keyword
+            ).order_by(LearnedRule.last_updated.desc(), LearnedRule.id.desc())
+            for rule_type, target_id, keyword in rows:
+                learned.setdefault(rule_type, []).append((target_id, keyword))
+
+        matchers = (
+            KeywordMatcher(
+                _ordered_rules(learned[CATEGORY], CATEGORY_RULES),
+                default=DEFAULT_CATEGORY_ID,
+            ),
+            KeywordMatcher(
+                _ordered_rules(learned[SOURCE], INCOME_SOURCE_RULES),
+                default=DEFAULT_INCOME_SOURCE_ID,
+            ),
+        )
+        # Swapped in one assignment, concurrent lookups see the old or new pair
+        self._matchers = matchers
+        self.version = version
+        self._stale = False
+        logger.info(
+            f"🔤 Compiled {matchers[0].keyword_count} category and "
+            f"{matchers[1].keyword_count} income source keywords "
+            f"({len(learned[CATEGORY]) + len(learned[SOURCE])} learned, version {version})"
+        )
+
+    def _current(self) -> Tuple[KeywordMatcher, KeywordMatcher]:
+        if self._matchers is None:
+            self.ensure_fresh()
+        return self._matchers
+
+    def category(self, description: str) -> int:
+        return self._current()[0].match(description)
+
+    def income_source(self, description: str) -> int:
+        return self._current()[1].match(description)
+
+
+def learn_rules(db: Session, updates: List[dict]) -> int:
+    """
+    Store keywords learned from user corrections and publish a new rules version.
+    A keyword learned again for another target moves to that target.
+    updates format: [{"id": 123, "keyword": "new_keyword", "type": "category"|"source"}]
+
+    Returns:
+        Number of keywords stored
+    """
+    latest = {}
+    for update in updates:
+        rule_type = update.get("type")
+        keyword = (update.get("keyword") or "").strip().lower()[:MAX_KEYWORD_LENGTH]
+        if (
+            rule_type not in (CATEGORY, SOURCE)
+            or not keyword
+            or update.get("id") is None
+        ):
+            continue
+        latest[(rule_type, keyword)] = int(update["id"])
+    if not latest:
+        return 0
+
+    ensure_learned_rules(db)
+    now = datetime.utcnow()
+    existing = {
+        (rule.rule_type, rule.keyword): rule
+        for rule in db.query(LearnedRule).filter(
+            LearnedRule.keyword.in_({keyword for _, keyword in latest})
+        )
+    }
+    for (rule_type, keyword), target_id in latest.items():
+        rule = existing.get((rule_type, keyword))
+        if rule:
+            rule.target_id = target_id
+            rule.last_updated = now
+        else:
+            db.add(
+                LearnedRule(
+                    rule_type=rule_type,
+                    keyword=keyword,
+                    target_id=target_id,
+                    created_at=now,
+                    last_updated=now,
+                )
+            )
+    db.commit()
+
+    ruleEngine.invalidate()
+    try:
+        publish_rules_version(config.redis_client())
+    except Exception as e:
+        logger.warning(
+            f"⚠️ Could not publish the rules version, other workers keep the old rules: {e}"
+        )
+    logger.info(f"🧠 Learned {len(latest)} categorization keyword(s)")
+    return len(latest)
+
+
+# Global engine instance, compiled on first use
+ruleEngine = RuleEngine()
@@ -1,6 +1,9 @@
+from contextlib import contextmanager
+from typing import Optional
+
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from backend.config import DATABASE_URL
 
@@ -21,3 +24,20 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+@contextmanager
+def session_scope(db: Optional[Session] = None):
+    """Yield the given session, or open a new one and close it afterwards.
+
+    Used by jobs that can run standalone or inside a caller's session.
+    """
+    if db is not None:
+        yield db
+        return
+
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -1,7 +1,9 @@
 from sqlalchemy.orm import Session
 
+from backend.common import change_events
 from backend.models.spendings.expense import Expense
 from backend.schemas.expense_schema import ExpenseCreate, ExpenseUpdate
+from backend.services import rollup_services
 
 
 def get_all_expenses(db: Session):
@@ -19,24 +21,32 @@ def get_expense(db: Session, expense_id: int):
 def create_expense(db: Session, expense: ExpenseCreate):
     new_expense = Expense(**expense.dict())
     db.add(new_expense)
+    rollup_services.add_to_rollup(db, new_expense)
     db.commit()
     db.refresh(new_expense)
+    change_events.publish(change_events.EXPENSE, "create", new_expense.user_id)
     return new_expense
 
 
 def update_expense(db: Session, expense_id: int, expense: ExpenseUpdate):
     db_expense = db.query(Expense).filter(Expense.expense_id == expense_id).first()
     if db_expense:
+        previous = rollup_services.rollup_entry(db_expense)
         for key, value in expense.dict(exclude_unset=True).items():
             setattr(db_expense, key, value)
+        rollup_services.apply_rollup_entry(db, previous, -1)
+        rollup_services.add_to_rollup(db, db_expense)
         db.commit()
         db.refresh(db_expense)
+        change_events.publish(change_events.EXPENSE, "update", db_expense.user_id)
     return db_expense
 
 
 def delete_expense(db: Session, expense_id: int):
     db_expense = db.query(Expense).filter(Expense.expense_id == expense_id).first()
     if db_expense:
+        rollup_services.remove_from_rollup(db, db_expense)
         db.delete(db_expense)
         db.commit()
+        change_events.publish(change_events.EXPENSE, "delete", db_expense.user_id)
     return db_expense
@@ -0,0 +1,169 @@
+"""
+Daily exchange rates stored in SQL.
+
+Rates are kept per currency against USD and INR, so any pair converts with at
+most two lookups. Aggregate queries convert amounts with an InrAmount: the
+amount times the rate of a small subquery holding one latest-rate row per
+currency, outer-joined once on the row's currency. The conversion then runs
+inside the database in the same pass as the sum.
+"""
+
+import datetime
+from typing import Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, func, inspect, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import case
+
+from backend.models.currency import FxRateDaily
+from utilities.common.app_config import config
+from utilities.common.fx_rates import CURRENCY_CODES, RATE_DECIMALS
+
+logger = config.setup_logger("backend.services.fx_rates")
+
+REPORTING_CURRENCY = "INR"
+
+_fx_table_ready = False
+
+
+def fx_rates_ready(db: Session) -> bool:
+    """Whether the fx_rate_daily table exists; cached once it has been seen."""
+    global _fx_table_ready
+    if not _fx_table_ready:
+        _fx_table_ready = inspect(db.get_bind()).has_table(FxRateDaily.__tablename__)
+    return _fx_table_ready
+
+
+def ensure_fx_rate_table(db: Session):
+    global _fx_table_ready
+    if fx_rates_ready(db):
+        return
+    logger.info("📦 fx_rate_daily table missing, creating it")
+    FxRateDaily.__table__.create(bind=db.get_bind(), checkfirst=True)
+    _fx_table_ready = True
+
+
+def record_daily_rates(
+    db: Session,
+    rate_date: datetime.date,
+    units_per_usd: Dict[str, float],
+    source: str,
+) -> int:
+    """
+    Store one day of rates, replacing any stored earlier that day.
+
+    Args:
+        db: Database session
+        rate_date: Day the rates apply to
+        units_per_usd: Currency code -> units of it per USD, as quoted by the API
+        source: Where the rates came from
+
+    Returns:
+        Number of currencies stored
+    """
+    inr_per_usd = units_per_usd.get(REPORTING_CURRENCY)
+    if not inr_per_usd:
+        logger.warning(f"No {REPORTING_CURRENCY} rate in the quotes, not storing them")
+        return 0
+
+    now = datetime.datetime.utcnow()
+    mappings = [
+        {
+            "rate_date": rate_date,
+            "currency_code": code.upper(),
+            "units_per_usd": float(units),
+            "rate_to_inr": inr_per_usd / float(units),
+            "source": source,
+            "last_updated": now,
+        }
+        for code, units in units_per_usd.items()
+        if len(code) == 3 and units and float(units) > 0
+    ]
+
+    ensure_fx_rate_table(db)
+    db.query(FxRateDaily).filter(FxRateDaily.rate_date == rate_date).delete(
+        synchronize_session=False
+    )
+    db.bulk_insert_mappings(FxRateDaily, mappings)
+    db.commit()
+    logger.info(f"💱 Stored {len(mappings)} exchange rates for {rate_date}")
+    return len(mappings)
+
+
+def currency_code_expression(column, is_currency_id: bool = False):
+    """Currency code of a row, mapping currency_id columns through CURRENCY_CODES."""
+    if not is_currency_id:
+        return column
+    return case(
+        *[
+            (column == currency_id, code)
+            for currency_id, code in CURRENCY_CODES.items()
+        ],
+        else_=None,
+    )
+
+
+def latest_rates_subquery(name: str = "latest_fx"):
+    """
+    One row per currency: its rate to INR on the most recent day it was stored.
+
+    Rates are rounded to RATE_DECIMALS like the in-memory fxRates, so a total
+    does not depend on which of the two supplied a rate.
+    """
+    latest_day = (
+        select(
+            FxRateDaily.currency_code,
+            func.max(FxRateDaily.rate_date).label("rate_date"),
+        )
+        .group_by(FxRateDaily.currency_code)
+        .subquery(f"{name}_day")
+    )
+    return (
+        select(
+            FxRateDaily.currency_code,
+            func.round(FxRateDaily.rate_to_inr, RATE_DECIMALS).label("rate_to_inr"),
+        )
+        .join(
+            latest_day,
+            and_(
+                FxRateDaily.currency_code == latest_day.c.currency_code,
+                FxRateDaily.rate_date == latest_day.c.rate_date,
+            ),
+        )
+        .subquery(name)
+    )
+
+
+class InrAmount:
+    """An amount converted to INR, with the rate joins a query must add for it."""
+
+    def __init__(self, expression, joins: Sequence[Tuple[object, object]] = ()):
+        """
+        Args:
+            expression: SQL expression of the converted amount
+            joins: (rates subquery, onclause) pairs the expression reads from
+        """
+        self.expression = expression
+        self.joins = tuple(joins)
+
+    def join_rates(self, statement, model):
+        """Select from model and outer-join the rate rows of the conversion."""
+        if not self.joins:
+            return statement
+        statement = statement.select_from(model)
+        for rates, onclause in self.joins:
+            statement = statement.outerjoin(rates, onclause)
+        return statement
+
+
+def inr_amount(
+    amount, code_expr, fallback: Optional[object] = None, name: str = "latest_fx"
+):
+    """
+    Convert an amount column at the latest stored rate of the row's currency.
+
+    Currencies missing from the table use fallback (or 1.0).
+    """
+    rates = latest_rates_subquery(name)
+    rate = func.coalesce(rates.c.rate_to_inr, fallback if fallback is not None else 1.0)
+    return InrAmount(amount * rate, [(rates, rates.c.currency_code == code_expr)])
@@ -1,7 +1,9 @@
 from sqlalchemy.orm import Session
 
+from backend.common import change_events
 from backend.models.earnings.income import Income
 from backend.schemas.income_schema import IncomeCreate, IncomeUpdate
+from backend.services import rollup_services
 
 
 def get_all_incomes(db: Session):
@@ -19,24 +21,32 @@ def get_income(db: Session, income_id: int):
 def create_income(db: Session, income_data: IncomeCreate):
     new_income = Income(**income_data.dict())
     db.add(new_income)
+    rollup_services.add_to_rollup(db, new_income)
     db.commit()
     db.refresh(new_income)
+    change_events.publish(change_events.INCOME, "create", new_income.user_id)
     return new_income
 
 
 def update_income(db: Session, income_id: int, income_data: IncomeUpdate):
     income = db.query(Income).filter(Income.income_id == income_id).first()
     if income:
+        previous = rollup_services.rollup_entry(income)
         for key, value in income_data.dict(exclude_unset=True).items():
             setattr(income, key, value)
+        rollup_services.apply_rollup_entry(db, previous, -1)
+        rollup_services.add_to_rollup(db, income)
         db.commit()
         db.refresh(income)
+        change_events.publish(change_events.INCOME, "update", income.user_id)
     return income
 
 
 def delete_income(db: Session, income_id: int):
     income = db.query(Income).filter(Income.income_id == income_id).first()
     if income:
+        rollup_services.remove_from_rollup(db, income)
         db.delete(income)
         db.commit()
+        change_events.publish(change_events.INCOME, "delete", income.user_id)
     return income
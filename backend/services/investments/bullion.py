@@ -3,8 +3,10 @@ from datetime import date
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
+from backend.common import change_events
 from backend.models.investments.bullion import BullionInvestment
 from backend.schemas.investments.bullion_schema import BullionInvestmentCreate
+from backend.services import rollup_services
 
 
 def create_bullion(db: Session, bullion_data: BullionInvestmentCreate):
@@ -45,7 +47,9 @@ def create_bullion(db: Session, bullion_data: BullionInvestmentCreate):
     )
 
     db.add(new_transaction)
+    rollup_services.add_to_rollup(db, new_transaction)
     db.commit()
     db.refresh(new_transaction)
+    change_events.publish(change_events.BULLION, "create", new_transaction.investor)
 
     return new_transaction
@@ -1,12 +1,14 @@
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
+from backend.common import change_events
 from backend.models.investments.bullion import BullionInvestment
 from backend.models.investments.crypto import CryptoInvestment
 from backend.models.investments.mutual_fund import MutualFundInvestment
 from backend.models.investments.real_estate import RealEstateInvestment
 from backend.models.investments.stock import StockInvestment
 from backend.schemas.investments.common import InvestmentUpdate
+from backend.services import rollup_services
 
 
 def get_all_investments(investment_type: str, db: Session):
@@ -142,11 +144,19 @@ def update_investment(
         raise HTTPException(status_code=400, detail="Invalid investment type")
 
     # Apply updates only if the field is provided
+    previous = rollup_services.rollup_entry(investment)
     for key, value in update_data.dict(exclude_unset=True).items():
         setattr(investment, key, value)
+    rollup_services.apply_rollup_entry(db, previous, -1)
+    rollup_services.add_to_rollup(db, investment)
 
     db.commit()
     db.refresh(investment)
+    change_events.publish(
+        change_events.INVESTMENT_ENTITIES[investment_type],
+        "update",
+        investment.investor,
+    )
 
     return investment
 
@@ -217,6 +227,12 @@ def delete_investment(investment_type: str, investment_id: int, db: Session):
 
         revert_crypto_summary.revert(db, investment)
 
+    rollup_services.remove_from_rollup(db, investment)
     db.delete(investment)
     db.commit()
+    change_events.publish(
+        change_events.INVESTMENT_ENTITIES[investment_type],
+        "delete",
+        investment.investor,
+    )
     return investment
@@ -3,8 +3,10 @@ from datetime import date
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
+from backend.common import change_events
 from backend.models.investments.crypto import CryptoInvestment
 from backend.schemas.investments.crypto_schema import CryptoInvestmentCreate
+from backend.services import rollup_services
 
 
 def create_crypto(db: Session, coin_data: CryptoInvestmentCreate):
@@ -45,7 +47,9 @@ def create_crypto(db: Session, coin_data: CryptoInvestmentCreate):
     )
 
     db.add(new_transaction)
+    rollup_services.add_to_rollup(db, new_transaction)
     db.commit()
     db.refresh(new_transaction)
+    change_events.publish(change_events.CRYPTO, "create", new_transaction.investor)
 
     return new_transaction
@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 
+from backend.common import change_events
 from backend.models.investments.stock import Dividends
 from backend.schemas.investments.dividend_schema import DividendCreate, DividendUpdate
 
@@ -21,6 +22,7 @@ def create_dividend(db: Session, dividend_data: DividendCreate):
     db.add(new_dividend)
     db.commit()
     db.refresh(new_dividend)
+    change_events.publish(change_events.DIVIDEND, "create", new_dividend.investor)
     return new_dividend
 
 
@@ -31,6 +33,7 @@ def update_dividend(db: Session, dividend_id: int, dividend_data: DividendUpdate
             setattr(dividend, key, value)
         db.commit()
         db.refresh(dividend)
+        change_events.publish(change_events.DIVIDEND, "update", dividend.investor)
     return dividend
 
 
@@ -43,4 +46,5 @@ def delete_dividend(db: Session, dividend_id: int):
 
         db.delete(dividend)
         db.commit()
+        change_events.publish(change_events.DIVIDEND, "delete", dividend.investor)
     return dividend
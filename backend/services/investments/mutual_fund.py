@@ -3,8 +3,10 @@ from datetime import date
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
+from backend.common import change_events
 from backend.models.investments.mutual_fund import MutualFundInvestment
 from backend.schemas.investments.mutual_fund_schema import MutualFundInvestmentCreate
+from backend.services import rollup_services
 
 
 def create_mutual_fund(db: Session, fund_data: MutualFundInvestmentCreate):
@@ -44,7 +46,9 @@ def create_mutual_fund(db: Session, fund_data: MutualFundInvestmentCreate):
     )
 
     db.add(new_transaction)
+    rollup_services.add_to_rollup(db, new_transaction)
     db.commit()
     db.refresh(new_transaction)
+    change_events.publish(change_events.MUTUAL_FUND, "create", new_transaction.investor)
 
     return new_transaction
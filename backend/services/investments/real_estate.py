@@ -3,8 +3,10 @@ from datetime import date
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
+from backend.common import change_events
 from backend.models.investments.real_estate import RealEstateInvestment
 from backend.schemas.investments.real_estate_schema import RealEstateInvestmentCreate
+from backend.services import rollup_services
 
 
 def create_property(db: Session, property_data: RealEstateInvestmentCreate):
@@ -49,7 +51,9 @@ def create_property(db: Session, property_data: RealEstateInvestmentCreate):
     )
 
     db.add(new_transaction)
+    rollup_services.add_to_rollup(db, new_transaction)
     db.commit()
     db.refresh(new_transaction)
+    change_events.publish(change_events.REAL_ESTATE, "create", new_transaction.investor)
 
     return new_transaction
@@ -3,8 +3,10 @@ from datetime import date
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
+from backend.common import change_events
 from backend.models.investments.stock import StockInvestment
 from backend.schemas.investments.stock_schema import StockInvestmentCreate
+from backend.services import rollup_services
 
 
 def create_stock(db: Session, stock_data: StockInvestmentCreate):
@@ -45,7 +47,9 @@ def create_stock(db: Session, stock_data: StockInvestmentCreate):
     )
 
     db.add(new_transaction)
+    rollup_services.add_to_rollup(db, new_transaction)
     db.commit()
     db.refresh(new_transaction)
+    change_events.publish(change_events.STOCK, "create", new_transaction.investor)
 
     return new_transaction
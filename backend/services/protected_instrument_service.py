@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 
+from backend.common import change_events
 from backend.models.investments.protected_instrument import ProtectedInstrument
 from backend.schemas.protected_instrument_schema import (
     ProtectedInstrumentCreate,
@@ -44,6 +45,9 @@ def create_protected_instrument(db: Session, instrument: ProtectedInstrumentCrea
     db.add(db_instrument)
     db.commit()
     db.refresh(db_instrument)
+    change_events.publish(
+        change_events.PROTECTED_INSTRUMENT, "create", db_instrument.user_id
+    )
     return db_instrument
 
 
@@ -60,6 +64,9 @@ def update_protected_instrument(
 
     db.commit()
     db.refresh(db_instrument)
+    change_events.publish(
+        change_events.PROTECTED_INSTRUMENT, "update", db_instrument.user_id
+    )
     return db_instrument
 
 
@@ -70,4 +77,7 @@ def delete_protected_instrument(db: Session, instrument_id: int):
 
     db.delete(db_instrument)
     db.commit()
+    change_events.publish(
+        change_events.PROTECTED_INSTRUMENT, "delete", db_instrument.user_id
+    )
     return db_instrument
@@ -0,0 +1,316 @@
+"""
+Monthly rollups of income, expense and investment transactions.
+
+Write paths call add_to_rollup / remove_from_rollup inside their own transaction,
+so a rollup row always commits together with the transaction that moved it. The
+dashboard trend and YTD queries read these rows instead of scanning history.
+"""
+
+import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import extract, func, inspect
+from sqlalchemy.orm import Session
+
+from backend.models.earnings.income import Income
+from backend.models.investments.bullion import BullionInvestment
+from backend.models.investments.crypto import CryptoInvestment
+from backend.models.investments.mutual_fund import MutualFundInvestment
+from backend.models.investments.real_estate import RealEstateInvestment
+from backend.models.investments.stock import StockInvestment
+from backend.models.monthly_rollup import MonthlyRollup
+from backend.models.spendings.expense import Expense
+from backend.models.user import User  # noqa: F401 - FK target when creating the table
+from utilities.common.app_config import config
+
+logger = config.setup_logger("backend.services.rollups")
+
+# source -> (Model, amount_field, date_field, user_field, currency_field, is_currency_id)
+ROLLUP_SOURCES = {
+    "income": (Income, "amount", "earned_date", "user_id", "currency", False),
+    "expense": (Expense, "amount", "spent_date", "user_id", "currency", False),
+    "Stocks": (
+        StockInvestment,
+        "total_invested_amount",
+        "investment_date",
+        "investor",
+        "currency_id",
+        True,
+    ),
+    "Bullion": (
+        BullionInvestment,
+        "total_invested_amount",
+        "investment_date",
+        "investor",
+        "currency_id",
+        True,
+    ),
+    "MutualFund": (
+        MutualFundInvestment,
+        "total_invested_amount",
+        "investment_date",
+        "investor",
+        "currency_id",
+        True,
+    ),
+    "Crypto": (
+        CryptoInvestment,
+        "total_invested_amount",
+        "investment_date",
+        "investor",
+        "currency_id",
+        True,
+    ),
+    "RealEstate": (
+        RealEstateInvestment,
+        "total_invested_amount",
+        "investment_date",
+        "investor",
+        "currency_id",
+        True,
+    ),
+}
+
+_SOURCE_BY_MODEL = {spec[0]: source for source, spec in ROLLUP_SOURCES.items()}
+
+_rollup_table_ready = False
+
+
+def month_key(value) -> Optional[str]:
+    """Return the YYYY-MM bucket of a date, datetime or ISO date string."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value[:7]
+    return value.strftime("%Y-%m")
+
+
+def rollup_entry(row) -> Optional[dict]:
+    """
+    Snapshot the fields of an Income, Expense or *Investment row that its rollup
+    depends on. Take it before mutating the row so the old bucket can be debited.
+    """
+    source = _SOURCE_BY_MODEL.get(type(row))
+    if source is None:
+        return None
+
+    _, amount_field, date_field, user_field, currency_field, is_currency_id = (
+        ROLLUP_SOURCES[source]
+    )
+    currency = getattr(row, currency_field)
+    return {
+        "source": source,
+        "user_id": getattr(row, user_field),
+        "month": month_key(getattr(row, date_field)),
+        "currency": None if is_currency_id else currency,
+        "currency_id": currency if is_currency_id else None,
+        "amount": float(getattr(row, amount_field) or 0),
+    }
+
+
+def rollups_ready(db: Session) -> bool:
+    """Whether the rollup table exists; cached once it has been seen."""
+    global _rollup_table_ready
+    if not _rollup_table_ready:
+        _rollup_table_ready = inspect(db.get_bind()).has_table(
+            MonthlyRollup.__tablename__
+        )
+    return _rollup_table_ready
+
+
+def ensure_monthly_rollups(db: Session):
+    """Create and backfill the rollup table the first time it is needed."""
+    global _rollup_table_ready
+    if rollups_ready(db):
+        return
+
+    logger.info("📦 monthly_rollup table missing, creating and backfilling it")
+    MonthlyRollup.__table__.create(bind=db.get_bind(), checkfirst=True)
+    rebuild_monthly_rollups(db)
+    _rollup_table_ready = True
+
+
+def apply_rollup_entry(db: Session, entry: Optional[dict], sign: int = 1):
+    """
+    Add (sign=1) or remove (sign=-1) one transaction from its monthly bucket.
+
+    Does not commit; the caller commits it together with the transaction row.
+    Until the rollup table has been created this is a no-op, the first backfill
+    picks the rows up instead.
+    """
+    if not entry or entry["user_id"] is None or entry["month"] is None:
+        return
+    if not rollups_ready(db):
+        return
+
+    rollup = (
+        db.query(MonthlyRollup)
+        .filter_by(
+            user_id=entry["user_id"],
+            source=entry["source"],
+            month=entry["month"],
+            currency=entry["currency"],
+            currency_id=entry["currency_id"],
+        )
+        .first()
+    )
+
+    if rollup:
+        rollup.total_amount += sign * entry["amount"]
+        rollup.transaction_count += sign
+        rollup.last_updated = datetime.datetime.utcnow()
+        if rollup.transaction_count <= 0:
+            db.delete(rollup)
+    elif sign > 0:
+        db.add(
+            MonthlyRollup(
+                user_id=entry["user_id"],
+                source=entry["source"],
+                month=entry["month"],
+                currency=entry["currency"],
+                currency_id=entry["currency_id"],
+                total_amount=entry["amount"],
+                transaction_count=1,
+                last_updated=datetime.datetime.utcnow(),
+            )
+        )
+    else:
+        logger.warning(
+            f"⚠️ No {entry['source']} rollup for user {entry['user_id']} in "
+            f"{entry['month']} to debit, run scripts/backfill_rollups.py"
+        )
+        return
+
+    # Session autoflush is off; flush so later lookups in the same transaction
+    # see this bucket instead of creating a duplicate
+    db.flush()
+
+
+def apply_rollup_entries(db: Session, entries: Iterable[Optional[dict]], sign: int = 1):
+    """
+    Add or remove many transactions at once, for bulk imports.
+
+    Entries are summed per bucket first, then every affected bucket is loaded in
+    one query and updated in place. Like apply_rollup_entry it does not commit.
+    """
+    if not rollups_ready(db):
+        return
+
+    buckets = {}
+    for entry in entries:
+        if not entry or entry["user_id"] is None or entry["month"] is None:
+            continue
+        key = (
+            entry["user_id"],
+            entry["source"],
+            entry["month"],
+            entry["currency"],
+            entry["currency_id"],
+        )
+        total = buckets.setdefault(key, [0.0, 0])
+        total[0] += entry["amount"]
+        total[1] += 1
+    if not buckets:
+        return
+
+    user_ids, sources, months, _, _ = (set(part) for part in zip(*buckets))
+    existing = {
+        (r.user_id, r.source, r.month, r.currency, r.currency_id): r
+        for r in db.query(MonthlyRollup).filter(
+            MonthlyRollup.user_id.in_(user_ids),
+            MonthlyRollup.source.in_(sources),
+            MonthlyRollup.month.in_(months),
+        )
+    }
+
+    now = datetime.datetime.utcnow()
+    for key, (amount, count) in buckets.items():
+        rollup = existing.get(key)
+        if rollup:
+            rollup.total_amount += sign * amount
+            rollup.transaction_count += sign * count
+            rollup.last_updated = now
+            if rollup.transaction_count <= 0:
+                db.delete(rollup)
+        elif sign > 0:
+            user_id, source, month, currency, currency_id = key
+            db.add(
+                MonthlyRollup(
+                    user_id=user_id,
+                    source=source,
+                    month=month,
+                    currency=currency,
+                    currency_id=currency_id,
+                    total_amount=amount,
+                    transaction_count=count,
+                    last_updated=now,
+                )
+            )
+        else:
+            logger.warning(
+                f"⚠️ No {key[1]} rollup for user {key[0]} in {key[2]} to debit, "
+                f"run scripts/backfill_rollups.py"
+            )
+    db.flush()
+
+
+def add_to_rollup(db: Session, row):
+    apply_rollup_entry(db, rollup_entry(row), 1)
+
+
+def remove_from_rollup(db: Session, row):
+    apply_rollup_entry(db, rollup_entry(row), -1)
+
+
+def rebuild_monthly_rollups(db: Session) -> int:
+    """
+    Recompute every rollup row from the raw transaction tables.
+
+    Returns:
+        Number of rollup rows written
+    """
+    now = datetime.datetime.utcnow()
+    mappings = []
+    for source, spec in ROLLUP_SOURCES.items():
+        Model, amount_field, date_field, user_field, currency_field, is_currency_id = (
+            spec
+        )
+        date_col = getattr(Model, date_field)
+        user_col = getattr(Model, user_field)
+        currency_col = getattr(Model, currency_field)
+        year = extract("year", date_col)
+        month = extract("month", date_col)
+
+        rows = (
+            db.query(
+                user_col.label("user_id"),
+                currency_col.label("currency"),
+                year.label("year"),
+                month.label("month"),
+                func.sum(getattr(Model, amount_field)).label("total"),
+                func.count().label("count"),
+            )
+            .group_by(user_col, currency_col, year, month)
+            .all()
+        )
+
+        for r in rows:
+            mappings.append(
+                {
+                    "user_id": r.user_id,
+                    "source": source,
+                    "month": f"{int(r.year):04d}-{int(r.month):02d}",
+                    "currency": None if is_currency_id else r.currency,
+                    "currency_id": r.currency if is_currency_id else None,
+                    "total_amount": float(r.total or 0),
+                    "transaction_count": int(r.count),
+                    "last_updated": now,
+                }
+            )
+
+    db.query(MonthlyRollup).delete(synchronize_session=False)
+    if mappings:
+        db.bulk_insert_mappings(MonthlyRollup, mappings)
+    db.commit()
+    logger.info(f"✅ Rebuilt {len(mappings)} monthly rollup rows")
+    return len(mappings)
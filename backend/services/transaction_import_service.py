@@ -1,34 +1,48 @@
+import codecs
 import csv
+import hashlib
 import io
+import itertools
 import logging
-from datetime import datetime
+import re
+from collections import Counter
+from datetime import date, datetime
+from typing import BinaryIO, Iterator
 
+from sqlalchemy import func, inspect
 from sqlalchemy.orm import Session
 
 from backend.configurations.bank_config import (
     BANK_MAPPINGS,
-    CATEGORY_RULES,
     DEFAULT_CATEGORY_ID,
-    INCOME_SOURCE_RULES,
     DEFAULT_INCOME_SOURCE_ID,
 )
+from backend.common import change_events
+from backend.models.earnings.income import Income
+from backend.models.import_fingerprint import ImportFingerprint
+from backend.models.spendings.expense import Expense
 from backend.schemas.expense_schema import ExpenseCreate
 from backend.schemas.income_schema import IncomeCreate
-from backend.services.expense_services import create_expense
-from backend.services.income_services import create_income
+from backend.services import rollup_services
+from backend.services.categorization_rules import learn_rules, ruleEngine
 
 logger = logging.getLogger(__name__)
 
+# Bytes read up front to detect the encoding and delimiter of an upload
+SNIFF_BYTES = 64 * 1024
+PREVIEW_PAGE_SIZE = 500
+# Most rows a single preview request returns; larger files are previewed in pages
+PREVIEW_MAX_ROWS = 5000
+# Rows per INSERT statement when confirming an import
+IMPORT_CHUNK_SIZE = 1000
 
-def normalize_headers(decoded_file: str, delimiter: str):
-    """
-    Normalize empty/duplicate headers and return headers + data lines.
-    """
-    lines = decoded_file.splitlines()
-    header_line = lines[0]
+_fingerprint_table_ready = False
 
-    raw_headers = next(csv.reader([header_line], delimiter=delimiter))
 
+def normalize_headers(raw_headers: list[str]) -> list[str]:
+    """
+    Name empty headers __extra_<n> and suffix duplicates with _<count>.
+    """
     headers = []
     seen = {}
     extra_index = 1
@@ -48,9 +62,7 @@ def normalize_headers(decoded_file: str, delimiter: str):
 
         headers.append(name)
 
-    # Return headers + remaining CSV content (WITHOUT header line)
-    remaining_csv = "\n".join(lines[1:])
-    return headers, remaining_csv
+    return headers
 
 
 def parse_date(date_str: str, fmt: str) -> datetime:
@@ -73,11 +85,26 @@ def extract_extra_columns(row: dict) -> str:
     return " ".join(extras)
 
 
-def build_full_description(row: dict, primary_desc_col: str | None) -> str:
+def description_columns(headers) -> list[str]:
+    """
+    The generated __extra_* and Benefeciary* columns, in file order.
+    """
+    return [
+        key
+        for key in headers
+        if isinstance(key, str) and key.startswith(("__extra_", "Benefeciary"))
+    ]
+
+
+def build_full_description(
+        row: dict, primary_desc_col: str | None, extra_cols: list[str] | None = None
+) -> str:
     """
     Builds a single searchable description string from:
     - main description column
     - all __extra_* columns
+
+    extra_cols, from description_columns(), saves finding them again per row.
     """
     parts = []
 
@@ -86,339 +113,474 @@ def build_full_description(row: dict, primary_desc_col: str | None) -> str:
         if main_desc:
             parts.append(main_desc.strip())
 
-    for key, value in row.items():
-        if (
-                (key.startswith("__extra_") | key.startswith("Benefeciary"))
-                and value
-                and value.strip()
-        ):
+    if extra_cols is None:
+        extra_cols = description_columns(row)
+    for key in extra_cols:
+        value = row.get(key)
+        if value and value.strip():
             parts.append(value.strip())
 
     return " | ".join(parts)
 
 
 def determine_category(description: str) -> int:
-    description = description.lower()
-    print(f"\n[DEBUG] Categorizing: '{description}'")
-    for cat_id, keywords in CATEGORY_RULES.items():
-        for keyword in keywords:
-            if keyword.lower() in description:
-                print(f"[DEBUG]   Matched keyword '{keyword}' -> Category ID {cat_id}")
-                return cat_id
-    print(f"[DEBUG]   No match found. Using Default Category ID {DEFAULT_CATEGORY_ID}")
-    return DEFAULT_CATEGORY_ID
+    return ruleEngine.category(description)
 
 
 def determine_income_source(description: str) -> int:
-    description = description.lower()
-    print(f"\n[DEBUG] Determining Income Source: '{description}'")
-    for source_id, keywords in INCOME_SOURCE_RULES.items():
-        for keyword in keywords:
-            if keyword.lower() in description:
-                print(f"[DEBUG]   Matched keyword '{keyword}' -> Source ID {source_id}")
-                return source_id
-    print(
-        f"[DEBUG]   No match found. Using Default Source ID {DEFAULT_INCOME_SOURCE_ID}"
-    )
-    return DEFAULT_INCOME_SOURCE_ID
+    return ruleEngine.income_source(description)
 
 
-def decode_file(file_content: bytes) -> str:
-    """Attempt to decode bytes using common encodings."""
+def detect_encoding(sample: bytes) -> str:
+    """Pick the first common encoding that decodes a sample of the file."""
     encodings = ["utf-8", "windows-1250", "iso-8859-2", "cp1252", "latin1"]
     for enc in encodings:
         try:
-            return file_content.decode(enc)
+            # Not final: the sample may end in the middle of a character
+            codecs.getincrementaldecoder(enc)().decode(sample, final=False)
+            return enc
         except UnicodeDecodeError:
             continue
-    # If all fail, try utf-8 with replacement to at least not crash, though data might be ugly
+    # If all fail, use utf-8 with replacement to at least not crash, though data might be ugly
     logger.warning("All encodings failed. Falling back to utf-8 with replacement.")
-    return file_content.decode("utf-8", errors="replace")
-
-
-def preview_csv_import(
-        file_content: bytes,
-        bank_name: str,
-        currency: str = "INR",
-) -> list[dict]:
-    """
-    Parses CSV and returns a list of potential transactions with proposed categories/sources.
-    Does NOT save to DB.
-    """
-    bank_name = bank_name.lower()
-    if bank_name not in BANK_MAPPINGS:
-        raise ValueError(f"Bank '{bank_name}' not supported.")
+    return "utf-8"
 
-    mapping = BANK_MAPPINGS[bank_name]
 
-    # 1. Decode & Normalize
-    decoded_file = decode_file(file_content)
-    first_line = decoded_file.split("\n")[0]
-    delimiter = (
+def detect_delimiter(first_line: str) -> str:
+    return (
         ";"
         if ";" in first_line and first_line.count(";") > first_line.count(",")
         else ","
     )
-    headers, remaining_csv = normalize_headers(decoded_file, delimiter)
 
-    csv_reader = csv.DictReader(
-        io.StringIO(remaining_csv), fieldnames=headers, delimiter=delimiter
-    )
 
-    preview_data = []
+def _bank_mapping(bank_name: str) -> dict:
+    bank_name = bank_name.lower()
+    if bank_name not in BANK_MAPPINGS:
+        raise ValueError(f"Bank '{bank_name}' not supported.")
+    return BANK_MAPPINGS[bank_name]
 
-    for row in csv_reader:
-        if not any(row.values()):
-            continue
 
-        try:
-            # Parse Date
-            date_col = mapping["date"]
-            date_fmt = mapping.get("date_format")
-            txn_date = parse_date(row.get(date_col, ""), date_fmt)
+def _open_csv(stream: BinaryIO) -> Iterator[dict]:
+    """
+    Read a bank export incrementally as dicts keyed by normalized headers.
+
+    Encoding and delimiter are detected from the first SNIFF_BYTES; the rest of
+    the file is decoded as it is read.
+    """
+    sample = stream.read(SNIFF_BYTES)
+    encoding = detect_encoding(sample)
+    stream.seek(0)
 
-            # Parse Description
-            desc_col = mapping.get("description")
-            full_description = build_full_description(row, desc_col)
+    first_line = sample.decode(encoding, errors="ignore").splitlines()[:1]
+    delimiter = detect_delimiter(first_line[0] if first_line else "")
 
-            # Determine Amount & Type
-            amount = 0.0
+    text = io.TextIOWrapper(stream, encoding=encoding, errors="replace", newline="")
+    try:
+        raw_headers = next(csv.reader(text, delimiter=delimiter), None)
+        if raw_headers is None:
+            return
+        yield from csv.DictReader(
+            text, fieldnames=normalize_headers(raw_headers), delimiter=delimiter
+        )
+    finally:
+        # Hand the stream back to its owner instead of closing it
+        text.detach()
+
+
+def _preview_row(
+        row: dict,
+        mapping: dict,
+        currency: str,
+        extra_cols: list[str] | None = None,
+        dates: dict | None = None,
+) -> dict:
+    # Parse Date; a statement repeats the same few hundred dates, so they are
+    # parsed once per file
+    date_col = mapping["date"]
+    date_fmt = mapping.get("date_format")
+    date_str = row.get(date_col, "")
+    txn_date = dates.get(date_str) if dates is not None else None
+    if txn_date is None:
+        txn_date = parse_date(date_str, date_fmt).strftime("%Y-%m-%d")
+        if dates is not None:
+            dates[date_str] = txn_date
+
+    # Parse Description
+    desc_col = mapping.get("description")
+    full_description = build_full_description(row, desc_col, extra_cols)
+
+    # Determine Amount & Type
+    amount = 0.0
+    is_credit = False
+
+    if "debit" in mapping and "credit" in mapping:
+        debit_str = row.get(mapping["debit"], "").replace(",", "").strip()
+        credit_str = row.get(mapping["credit"], "").replace(",", "").strip()
+        if debit_str:
+            amount = float(debit_str)
             is_credit = False
+        elif credit_str:
+            amount = float(credit_str)
+            is_credit = True
+
+    elif "amount" in mapping and "type" in mapping:
+        amt_str = row.get(mapping["amount"], "").replace(",", "").strip()
+        type_str = row.get(mapping["type"], "").lower()
+        amount = float(amt_str)
+        is_credit = "cr" in type_str
+
+    elif "amount" in mapping:
+        amt_str = (
+            row.get(mapping["amount"], "")
+            .replace(",", "")
+            .replace(" ", "")
+            .replace("\xa0", "")
+        )
+        amount = float(amt_str)
+        if amount >= 0:
+            is_credit = True
+        else:
+            is_credit = False
+            amount = abs(amount)
+
+    # Propose Category/Source
+    category_id = None
+    source_id = None
+
+    if is_credit:
+        source_id = determine_income_source(full_description)
+    else:
+        category_id = determine_category(full_description)
+
+    return {
+        "date": txn_date,
+        "description": full_description,
+        "amount": amount,
+        "currency": currency,
+        "type": "income" if is_credit else "expense",
+        "category_id": category_id,
+        "source_id": source_id,
+    }
+
+
+def iter_preview_rows(
+        stream: BinaryIO,
+        bank_name: str,
+        currency: str = "INR",
+        db: Session | None = None,
+) -> Iterator[dict]:
+    """
+    Stream proposed transactions (with categories/sources) from a bank export.
+    Rows that cannot be parsed are logged and skipped. Does NOT save to DB.
 
-            if "debit" in mapping and "credit" in mapping:
-                debit_str = row.get(mapping["debit"], "").replace(",", "").strip()
-                credit_str = row.get(mapping["credit"], "").replace(",", "").strip()
-                if debit_str:
-                    amount = float(debit_str)
-                    is_credit = False
-                elif credit_str:
-                    amount = float(credit_str)
-                    is_credit = True
-
-            elif "amount" in mapping and "type" in mapping:
-                amt_str = row.get(mapping["amount"], "").replace(",", "").strip()
-                type_str = row.get(mapping["type"], "").lower()
-                amount = float(amt_str)
-                is_credit = "cr" in type_str
-
-            elif "amount" in mapping:
-                amt_str = (
-                    row.get(mapping["amount"], "")
-                    .replace(",", "")
-                    .replace(" ", "")
-                    .replace("\xa0", "")
-                )
-                amount = float(amt_str)
-                if amount >= 0:
-                    is_credit = True
-                else:
-                    is_credit = False
-                    amount = abs(amount)
-
-            # Propose Category/Source
-            category_id = None
-            source_id = None
-
-            if is_credit:
-                source_id = determine_income_source(full_description)
-            else:
-                category_id = determine_category(full_description)
-
-            preview_data.append(
-                {
-                    "date": txn_date.strftime("%Y-%m-%d"),
-                    "description": full_description,
-                    "amount": amount,
-                    "currency": currency,
-                    "type": "income" if is_credit else "expense",
-                    "category_id": category_id,
-                    "source_id": source_id,
-                    # Helper for frontend to know which field to show
-                    "original_row": row,
-                }
-            )
+    Raises:
+        ValueError: If the bank is not supported (raised immediately, not on iteration)
+    """
+    mapping = _bank_mapping(bank_name)
+    # Pick up keywords learned by any worker since the last import
+    ruleEngine.ensure_fresh(db)
+
+    def rows():
+        extra_cols = None
+        dates = {}
+        for row in _open_csv(stream):
+            if not any(row.values()):
+                continue
+            if extra_cols is None:
+                extra_cols = description_columns(row)
+            try:
+                yield _preview_row(row, mapping, currency, extra_cols, dates)
+            except Exception as e:
+                logger.error(f"Error parsing row for preview: {e}")
+
+    return rows()
+
+
+def iter_preview_pages(
+        stream: BinaryIO,
+        bank_name: str,
+        currency: str = "INR",
+        page_size: int = PREVIEW_PAGE_SIZE,
+        db: Session | None = None,
+        user_id: int | None = None,
+) -> Iterator[list[dict]]:
+    """
+    Stream proposed transactions in lists of up to page_size rows.
+    With a db and user_id every page is checked for already imported rows.
+    """
+    rows = iter_preview_rows(stream, bank_name, currency, db)
+    pages = iter(lambda: list(itertools.islice(rows, page_size)), [])
+    if db is None or user_id is None:
+        return pages
+
+    def checked():
+        seen = Counter()
+        for page in pages:
+            yield flag_duplicates(db, user_id, page, seen)
+
+    return checked()
 
-        except Exception as e:
-            logger.error(f"Error parsing row for preview: {e}")
-            continue
 
-    return preview_data
+# ---------------------------------------------------------------
+# Duplicate detection
+# ---------------------------------------------------------------
+def normalize_description(description: str | None) -> str:
+    return re.sub(r"\s+", " ", (description or "").strip().lower())
 
 
-def update_category_rules_file(updates: list[dict]):
+def transaction_fingerprint(
+        txn_type: str,
+        txn_date: str | date,
+        amount: float,
+        currency: str,
+        description: str | None,
+) -> tuple[str, str]:
     """
-    Updates bank_config.py with new rules.
-    updates format: [{"id": 123, "keyword": "new_keyword", "type": "category"|"source"}]
+    Identify a transaction independently of how the statement formatted it.
+
+    Returns:
+        Tuple of (fingerprint, description hash), both sha256 hex digests
     """
-    import os
+    if not isinstance(txn_date, str):
+        txn_date = txn_date.strftime("%Y-%m-%d")
+    description_hash = hashlib.sha256(
+        normalize_description(description).encode()
+    ).hexdigest()
+    key = f"{txn_type}|{txn_date[:10]}|{float(amount):.2f}|{currency.upper()}|{description_hash}"
+    return hashlib.sha256(key.encode()).hexdigest(), description_hash
+
+
+def _row_fingerprint(row: dict) -> str:
+    return transaction_fingerprint(
+        row["type"], row["date"], row["amount"], row["currency"], row["description"]
+    )[0]
+
+
+def fingerprints_ready(db: Session) -> bool:
+    """Whether the fingerprint table exists; cached once it has been seen."""
+    global _fingerprint_table_ready
+    if not _fingerprint_table_ready:
+        _fingerprint_table_ready = inspect(db.get_bind()).has_table(
+            ImportFingerprint.__tablename__
+        )
+    return _fingerprint_table_ready
+
 
-    config_path = "backend/configurations/bank_config.py"
-    if not os.path.exists(config_path):
-        logger.error(f"Config file not found at {config_path}")
+def ensure_fingerprint_table(db: Session):
+    global _fingerprint_table_ready
+    if fingerprints_ready(db):
         return
+    logger.info("import_fingerprint table missing, creating it")
+    ImportFingerprint.__table__.create(bind=db.get_bind(), checkfirst=True)
+    _fingerprint_table_ready = True
 
-    with open(config_path, "r") as f:
-        content = f.read()
 
-    modified = False
+def flag_duplicates(
+        db: Session,
+        user_id: int,
+        rows: list[dict],
+        seen: Counter | None = None,
+) -> list[dict]:
+    """
+    Set "duplicate" on each preview row with one indexed query for the batch.
 
-    for update in updates:
-        rule_type = update.get("type")  # 'category' or 'source'
-        target_id = update.get("id")
-        keyword = update.get("keyword")
+    A statement can hold identical transactions (two coffees on one day), so
+    the n-th occurrence of a fingerprint is a duplicate only when at least n
+    were imported before. seen carries the occurrences of earlier pages of the
+    same file and is updated in place.
+    """
+    seen = Counter() if seen is None else seen
+    fingerprints = [_row_fingerprint(row) for row in rows]
+
+    imported = {}
+    if fingerprints and fingerprints_ready(db):
+        imported = dict(
+            db.query(ImportFingerprint.fingerprint, func.count())
+            .filter(
+                ImportFingerprint.user_id == user_id,
+                ImportFingerprint.fingerprint.in_(set(fingerprints)),
+            )
+            .group_by(ImportFingerprint.fingerprint)
+            .all()
+        )
 
-        if not keyword:
-            continue
+    for row, fingerprint in zip(rows, fingerprints):
+        row["duplicate"] = seen[fingerprint] < imported.get(fingerprint, 0)
+        seen[fingerprint] += 1
+    return rows
 
-        # VERY BASIC string manipulation to avoid complex AST rewriting that strips comments
-        # Looking for pattern:  <id>: [ ... ]
-        # We will attempt to insert the keyword into the list for that ID.
 
-        # Determine variable name
-        var_name = (
-            "CATEGORY_RULES" if rule_type == "category" else "INCOME_SOURCE_RULES"
-        )
+def preview_csv_import(
+        file_content: bytes | BinaryIO,
+        bank_name: str,
+        currency: str = "INR",
+        offset: int = 0,
+        limit: int | None = None,
+        db: Session | None = None,
+        user_id: int | None = None,
+) -> list[dict]:
+    """
+    Parses CSV and returns a list of potential transactions with proposed categories/sources.
+    Does NOT save to DB.
 
-        # We need to find the start of the dict, then the key.
-        # This is a bit brittle but regex can help.
+    Only rows offset to offset + limit are kept, and reading stops after them,
+    so previewing the first page of a large export is cheap. With a db and
+    user_id each row also carries "duplicate", True when it was imported before.
+    """
+    stream = io.BytesIO(file_content) if isinstance(file_content, bytes) else file_content
+    rows = iter_preview_rows(stream, bank_name, currency, db)
+    if db is None or user_id is None:
+        stop = None if limit is None else offset + limit
+        return list(itertools.islice(rows, offset, stop))
 
-        # Regex to find: <id>: [ ... ]
-        # We want to match:     12: [ ..., "existing" ],
-        # And replace with:     12: [ ..., "existing", "new_keyword" ],
+    # Skipped rows still count towards the occurrences of repeated transactions
+    seen = Counter(_row_fingerprint(row) for row in itertools.islice(rows, offset))
+    return flag_duplicates(db, user_id, list(itertools.islice(rows, limit)), seen)
 
-        # Regex explanation:
-        # 1. Match the key (e.g. 12 or 6) followed by : and optional whitespace
-        # 2. Match [
-        # 3. Match content inside (lazy)
-        # 4. Match ]
 
-        # Check if we are inside the correct variable block?
-        # Ideally we only search within the relevant block, but IDs are unique per dict usually
+def _validate_import_row(user_id: int, txn: dict) -> tuple[type, dict, dict | None]:
+    """
+    Build the row to insert for one confirmed transaction.
 
-        start_idx = content.find(f"{var_name} = {{")
-        if start_idx == -1:
-            continue
+    Returns:
+        Tuple of (Income or Expense, column values, rule update to learn or None)
 
-        # Find the end of this dict (approximate, looking for next variable or file end)
-        # Assuming brace matching is hard, let's limit search window?
-        # Or just use the fact that the key indentation is likely 4 spaces.
-
-        # Better approach: Read lines, state machine.
-        lines = content.splitlines()
-        new_lines = []
-        in_target_dict = False
-
-        for line in lines:
-            if line.startswith(f"{var_name} = {{"):
-                in_target_dict = True
-            elif in_target_dict and line.startswith("}"):
-                in_target_dict = False
-
-            if in_target_dict:
-                # Check for key match: "    6: ["
-                stripped = line.strip()
-                if stripped.startswith(f"{target_id}: ["):
-                    # Found the line!
-                    # Check if it's a single line list "12: []," or multi-line.
-                    if "]" in line:
-                        # Single line or end of multi-line on same line?
-                        # e.g. 12: [],  -> insert inside
-                        parts = line.split("]")
-                        # Insert before the last ]
-                        # line = '    12: ["a", "b"],'
-                        # parts[0] = '    12: ["a", "b"'
-                        new_line = f'{parts[0]}, "{keyword}"],{parts[1] if len(parts) > 1 else ""}'
-                        # Clean up potential double commas
-                        new_line = new_line.replace(",,", ",").replace("[,", "[")
-                        new_lines.append(new_line)
-                    else:
-                        # Multi-line array start
-                        new_lines.append(line)
-                        # We can just append the new keyword as the first item in the list on next line
-                        new_lines.append(f'        "{keyword}",')
-
-                    modified = True
-                    continue  # Skip adding the original line
-
-            new_lines.append(line)
-
-        content = "\n".join(new_lines)
-
-    if modified:
-        with open(config_path, "w") as f:
-            f.write(content)
-
-        # TOUCH RESTART FLAG
-        with open(".restart_required", "w") as f:
-            f.write("Restart required due to config update.")
+    Raises:
+        ValueError / KeyError / pydantic.ValidationError for an invalid row
+    """
+    amount = float(txn["amount"])
+    currency = txn.get("currency", "INR")
+    # Parse date if it's string
+    t_date = txn["date"]
+    if isinstance(t_date, str):
+        t_date = datetime.strptime(t_date, "%Y-%m-%d")
+
+    # usage: "learn_keyword": "zomato" (optional field from frontend, set when
+    # the user overrode the proposed category/source)
+    learn = None
+    if txn["type"] == "income":
+        values = IncomeCreate(
+            user_id=user_id,
+            source_id=txn.get("source_id", DEFAULT_INCOME_SOURCE_ID),
+            amount=amount,
+            currency=currency,
+            earned_date=t_date,
+        ).dict()
+        if txn.get("learn_keyword"):
+            learn = {
+                "type": "source",
+                "id": txn["source_id"],
+                "keyword": txn["learn_keyword"],
+            }
+        return Income, values, learn
+
+    values = ExpenseCreate(
+        user_id=user_id,
+        category_id=txn.get("category_id", DEFAULT_CATEGORY_ID),
+        amount=amount,
+        currency=currency,
+        spent_date=t_date,
+    ).dict()
+    if txn.get("learn_keyword"):
+        learn = {
+            "type": "category",
+            "id": txn["category_id"],
+            "keyword": txn["learn_keyword"],
+        }
+    return Expense, values, learn
 
 
 def confirm_import_and_learn(
         db: Session,
         user_id: int,
         transactions: list[dict],
+        chunk_size: int | None = IMPORT_CHUNK_SIZE,
 ):
     """
     Saves confirmed transactions and learns new rules.
     transactions: list of dicts with 'date', 'amount', 'type', 'category_id', 'source_id', 'description'
+
+    Every row is validated first. The valid ones are inserted with bulk inserts
+    of up to chunk_size rows (all at once when None) and committed in a single
+    transaction together with their monthly rollups, so an import either lands
+    completely or not at all. Invalid rows are skipped and reported by index.
+    Each saved row is also recorded in the fingerprint index that the preview
+    checks for duplicates.
     """
-    count = 0
+    rows = {Income: [], Expense: [], ImportFingerprint: []}
     updates_to_learn = []
+    errors = []
+    now = datetime.utcnow()
 
-    for txn in transactions:
-        amount = float(txn["amount"])
-        currency = txn.get("currency", "INR")
-        # Parse date if it's string
-        t_date = txn["date"]
-        if isinstance(t_date, str):
-            t_date = datetime.strptime(t_date, "%Y-%m-%d")
-
-        if txn["type"] == "income":
-            inc = IncomeCreate(
-                user_id=user_id,
-                source_id=txn.get("source_id", DEFAULT_INCOME_SOURCE_ID),
-                amount=amount,
-                currency=currency,
-                earned_date=t_date,
-            )
-            create_income(db, inc)
-
-            # Learn?
-            # We need to know if this was a manual override.
-            # Ideally frontend sends a flag, or we re-check current rule.
-            # simpler heuristic: Check if current rules would predict this.
-            # usage: "learn_keyword": "zomato" (optional field from frontend)
-            if txn.get("learn_keyword"):
-                updates_to_learn.append(
-                    {
-                        "type": "source",
-                        "id": txn["source_id"],
-                        "keyword": txn["learn_keyword"],
-                    }
-                )
+    for index, txn in enumerate(transactions):
+        try:
+            model, values, learn = _validate_import_row(user_id, txn)
+        except Exception as e:
+            errors.append({"index": index, "error": str(e)})
+            continue
+        rows[model].append(values)
+        if learn:
+            updates_to_learn.append(learn)
+
+        txn_type = "income" if model is Income else "expense"
+        txn_date = values["earned_date" if model is Income else "spent_date"]
+        fingerprint, description_hash = transaction_fingerprint(
+            txn_type,
+            txn_date,
+            values["amount"],
+            values["currency"],
+            txn.get("description"),
+        )
+        rows[ImportFingerprint].append(
+            {
+                "user_id": user_id,
+                "fingerprint": fingerprint,
+                "txn_type": txn_type,
+                "txn_date": txn_date,
+                "amount": values["amount"],
+                "currency": values["currency"],
+                "description_hash": description_hash,
+                "created_at": now,
+            }
+        )
 
-        else:
-            exp = ExpenseCreate(
-                user_id=user_id,
-                category_id=txn.get("category_id", DEFAULT_CATEGORY_ID),
-                amount=amount,
-                currency=currency,
-                spent_date=t_date,
-            )
-            create_expense(db, exp)
-
-            if txn.get("learn_keyword"):
-                updates_to_learn.append(
-                    {
-                        "type": "category",
-                        "id": txn["category_id"],
-                        "keyword": txn["learn_keyword"],
-                    }
+    # DDL before the inserts so it never waits on this session's own writes
+    ensure_fingerprint_table(db)
+    step = chunk_size or max(len(transactions), 1)
+    try:
+        for model, mappings in rows.items():
+            for start in range(0, len(mappings), step):
+                db.bulk_insert_mappings(model, mappings[start:start + step])
+            if model is not ImportFingerprint:
+                rollup_services.apply_rollup_entries(
+                    db, (rollup_services.rollup_entry(model(**m)) for m in mappings)
                 )
-
-        count += 1
-
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception(f"Import of {len(transactions)} transactions rolled back")
+        raise
+
+    if rows[Income]:
+        change_events.publish(change_events.INCOME, "create", user_id)
+    if rows[Expense]:
+        change_events.publish(change_events.EXPENSE, "create", user_id)
+
+    learned = 0
     if updates_to_learn:
-        update_category_rules_file(updates_to_learn)
-
-    return {"status": "success", "processed": count, "learned": len(updates_to_learn)}
+        # The import is committed already; a failure here only loses the rules
+        try:
+            learned = learn_rules(db, updates_to_learn)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Could not store learned keywords: {e}")
+
+    count = len(rows[ImportFingerprint])
+    return {
+        "status": "success" if not errors else "partial",
+        "processed": count,
+        "failed": len(errors),
+        "errors": errors,
+        "learned": learned,
+    }
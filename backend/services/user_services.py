@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 
+from backend.common import change_events
 from backend.models.user import User
 from backend.schemas.user_schema import UserCreate, UserUpdate
 
@@ -10,6 +11,7 @@ def create_user(db: Session, user_data: UserCreate):
     db.add(new_user)
     db.commit()
     db.refresh(new_user)
+    change_events.publish(change_events.USER, "create", new_user.user_id)
     return new_user
 
 
@@ -32,6 +34,7 @@ def update_user(db: Session, user_id: int, user_data: UserUpdate):
         setattr(user, key, value)
     db.commit()
     db.refresh(user)
+    change_events.publish(change_events.USER, "update", user.user_id)
     return user
 
 
@@ -42,4 +45,5 @@ def delete_user(db: Session, user_id: int):
         return None
     db.delete(user)
     db.commit()
+    change_events.publish(change_events.USER, "delete", user.user_id)
     return user
@@ -2,6 +2,7 @@ from datetime import date
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from backend.models.earnings.income import Income
+from backend.services import rollup_services
 
 
 def delete_related_income(
@@ -26,5 +27,6 @@ def delete_related_income(
     )
 
     if income_entry:
+        rollup_services.remove_from_rollup(db, income_entry)
         db.delete(income_entry)
         # We generally don't commit here, let the caller commit the whole transaction
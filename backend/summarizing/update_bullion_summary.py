@@ -2,9 +2,12 @@ from datetime import date
 from sqlalchemy.orm import Session
 import datetime
 
+from backend.common import change_events
 from backend.models.earnings.income import Income
 from backend.models.investments.bullion import BullionSummary
 from backend.schemas.investments.bullion_schema import BullionInvestmentCreate
+from backend.services import rollup_services
+from utilities.common.fx_rates import currency_code
 
 
 def update(db: Session, investment: BullionInvestmentCreate):
@@ -17,8 +20,6 @@ def update(db: Session, investment: BullionInvestmentCreate):
         .first()
     )
 
-    currency_map = {1: "INR", 2: "PLN", 3: "USD"}
-
     if bullion:
         if investment.transaction_type == "BUY":
             bullion.total_quantity += investment.quantity_in_grams
@@ -29,7 +30,7 @@ def update(db: Session, investment: BullionInvestmentCreate):
                 bullion.average_price_per_unit * investment.quantity_in_grams
             )
 
-            currency = currency_map.get(investment.currency_id, "INR")
+            currency = currency_code(investment.currency_id)
             # Record earnings from sale
             income = Income(
                 user_id=investment.investor,
@@ -39,6 +40,7 @@ def update(db: Session, investment: BullionInvestmentCreate):
                 earned_date=investment.investment_date or date.today(),  # type: ignore
             )
             db.add(income)
+            rollup_services.add_to_rollup(db, income)
 
         bullion.average_price_per_unit = (
             bullion.total_cost / bullion.total_quantity
@@ -60,3 +62,4 @@ def update(db: Session, investment: BullionInvestmentCreate):
         db.add(new_bullion)
 
     db.commit()
+    change_events.publish(change_events.BULLION, "update", investment.investor)
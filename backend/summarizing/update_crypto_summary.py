@@ -1,36 +1,20 @@
 import datetime
 
-import redis
 from datetime import date
 from sqlalchemy.orm import Session
 
+from backend.common import change_events
 from backend.models.earnings.income import Income
 from backend.models.investments.crypto import CryptoSummary
 from backend.schemas.investments.crypto_schema import CryptoInvestmentCreate
+from backend.services import rollup_services
+from utilities.common.fx_rates import currency_code, fxRates
 
 
 def update(db: Session, investment: CryptoInvestmentCreate):
-    currency_map = {1: "INR", 2: "PLN", 3: "USD"}
-
-    # Initialize Redis
-    redis_client = redis.StrictRedis(
-        host="localhost", port=6379, db=0, decode_responses=True
-    )
-
-    redis_forex_key_usd_inr = redis_client.get("forex::USD:INR")
-    redis_forex_key_pln_inr = redis_client.get("forex::PLN:INR")
-
     # Calculate cost in INR
-    invested_currency = currency_map.get(investment.currency_id, "INR")
-
-    if invested_currency == "INR":
-        conversion_rate = 1.0
-    elif invested_currency == "PLN":
-        conversion_rate = round(float(redis_forex_key_pln_inr), 2)
-    elif invested_currency == "USD":
-        conversion_rate = round(float(redis_forex_key_usd_inr), 2)
-    else:
-        raise Exception(f"Unsupported currency type: {invested_currency}")
+    invested_currency = currency_code(investment.currency_id)
+    conversion_rate = fxRates.rate(invested_currency, "INR")
 
     coin = (
         db.query(CryptoSummary)
@@ -50,7 +34,7 @@ def update(db: Session, investment: CryptoInvestmentCreate):
             coin.total_quantity -= investment.coin_quantity
             coin.total_cost -= coin.average_price_per_unit * investment.coin_quantity
 
-            currency = currency_map.get(investment.currency_id, "INR")
+            currency = currency_code(investment.currency_id)
             # Record earnings from sale
             income = Income(
                 user_id=investment.investor,
@@ -60,6 +44,7 @@ def update(db: Session, investment: CryptoInvestmentCreate):
                 earned_date=investment.investment_date or date.today(),  # type: ignore
             )
             db.add(income)
+            rollup_services.add_to_rollup(db, income)
 
         coin.average_price_per_unit = (
             coin.total_cost / coin.total_quantity if coin.total_quantity > 0 else 0
@@ -80,3 +65,4 @@ def update(db: Session, investment: CryptoInvestmentCreate):
         db.add(new_coin)
 
     db.commit()
+    change_events.publish(change_events.CRYPTO, "update", investment.investor)
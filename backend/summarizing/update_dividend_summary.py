@@ -1,9 +1,12 @@
 from datetime import date
 from sqlalchemy.orm import Session
 
+from backend.common import change_events
 from backend.models.earnings.income import Income
 from backend.models.investments.stock import DividendSummary
 from backend.schemas.investments.dividend_schema import DividendCreate
+from backend.services import rollup_services
+from utilities.common.fx_rates import currency_code
 
 
 def update(db: Session, investment: DividendCreate):
@@ -16,8 +19,6 @@ def update(db: Session, investment: DividendCreate):
         .first()
     )
 
-    currency_map = {1: "INR", 2: "PLN", 3: "USD"}
-
     if dividend:
         dividend.total_amount += investment.amount
     else:
@@ -36,9 +37,11 @@ def update(db: Session, investment: DividendCreate):
         user_id=investment.investor,
         source_id=4,
         amount=investment.amount,
-        currency=currency_map[investment.currency_id],
+        currency=currency_code(investment.currency_id),
         earned_date=investment.received_date or date.today(),  # type: ignore
     )
     db.add(income)
+    rollup_services.add_to_rollup(db, income)
 
     db.commit()
+    change_events.publish(change_events.DIVIDEND, "update", investment.investor)
@@ -3,9 +3,12 @@ from sqlalchemy.orm import Session
 from decimal import Decimal
 import datetime
 
+from backend.common import change_events
 from backend.models.earnings.income import Income
 from backend.models.investments.mutual_fund import MutualFundSummary
 from backend.schemas.investments.mutual_fund_schema import MutualFundInvestmentCreate
+from backend.services import rollup_services
+from utilities.common.fx_rates import currency_code
 
 
 def update(db: Session, investment: MutualFundInvestmentCreate):
@@ -18,8 +21,6 @@ def update(db: Session, investment: MutualFundInvestmentCreate):
     #     3: 10  # Real Estate → Real Estate Profit
     # }
 
-    currency_map = {1: "INR", 2: "PLN", 3: "USD"}
-
     fund = (
         db.query(MutualFundSummary)
         .filter(
@@ -47,7 +48,7 @@ def update(db: Session, investment: MutualFundInvestmentCreate):
                 * Decimal(str(fund.average_price_per_unit))
             )
 
-            currency = currency_map.get(investment.currency_id, "INR")
+            currency = currency_code(investment.currency_id)
             # Record earnings from sale
             income = Income(
                 user_id=investment.investor,
@@ -57,6 +58,7 @@ def update(db: Session, investment: MutualFundInvestmentCreate):
                 earned_date=investment.investment_date or date.today(),  # type: ignore
             )
             db.add(income)
+            rollup_services.add_to_rollup(db, income)
 
         fund.average_price_per_unit = (
             float(fund.total_cost) / float(fund.total_quantity)
@@ -77,3 +79,4 @@ def update(db: Session, investment: MutualFundInvestmentCreate):
         )
         db.add(new_fund)
     db.commit()
+    change_events.publish(change_events.MUTUAL_FUND, "update", investment.investor)
@@ -1,9 +1,12 @@
 from datetime import date
 from sqlalchemy.orm import Session
 
+from backend.common import change_events
 from backend.models.earnings.income import Income
 from backend.models.investments.real_estate import RealEstateSummary
 from backend.schemas.investments.real_estate_schema import RealEstateInvestmentCreate
+from backend.services import rollup_services
+from utilities.common.fx_rates import currency_code
 
 
 def update(db: Session, investment: RealEstateInvestmentCreate):
@@ -19,8 +22,6 @@ def update(db: Session, investment: RealEstateInvestmentCreate):
         .first()
     )
 
-    currency_map = {1: "INR", 2: "PLN", 3: "USD"}
-
     if property_to_update:
         if investment.transaction_type == "BUY":
             property_to_update.total_quantity += investment.area_in_sqyds
@@ -31,7 +32,7 @@ def update(db: Session, investment: RealEstateInvestmentCreate):
                 property_to_update.average_price_per_unit * investment.area_in_sqyds
             )
 
-            currency = currency_map.get(investment.currency_id, "INR")
+            currency = currency_code(investment.currency_id)
             # Record earnings from sale
             income = Income(
                 user_id=investment.investor,
@@ -41,6 +42,7 @@ def update(db: Session, investment: RealEstateInvestmentCreate):
                 earned_date=investment.investment_date or date.today(),  # type: ignore
             )
             db.add(income)
+            rollup_services.add_to_rollup(db, income)
 
         property_to_update.average_price_per_unit = (
             property_to_update.total_cost / property_to_update.total_quantity
@@ -63,3 +65,4 @@ def update(db: Session, investment: RealEstateInvestmentCreate):
         db.add(new_property)
 
     db.commit()
+    change_events.publish(change_events.REAL_ESTATE, "update", investment.investor)
@@ -2,9 +2,12 @@ from datetime import date
 from sqlalchemy.orm import Session
 import datetime
 
+from backend.common import change_events
 from backend.models.earnings.income import Income
 from backend.models.investments.stock import StockSummary
 from backend.schemas.investments.stock_schema import StockInvestmentCreate
+from backend.services import rollup_services
+from utilities.common.fx_rates import currency_code
 
 
 def update(db: Session, investment: StockInvestmentCreate):
@@ -17,8 +20,6 @@ def update(db: Session, investment: StockInvestmentCreate):
         .first()
     )
 
-    currency_map = {1: "INR", 2: "PLN", 3: "USD"}
-
     if stock:
         if investment.transaction_type == "BUY":
             stock.total_quantity += investment.stock_quantity
@@ -27,7 +28,7 @@ def update(db: Session, investment: StockInvestmentCreate):
             stock.total_quantity -= investment.stock_quantity
             stock.total_cost -= stock.average_price_per_unit * investment.stock_quantity
 
-            currency = currency_map.get(investment.currency_id, "INR")
+            currency = currency_code(investment.currency_id)
             # Record earnings from sale
             income = Income(
                 user_id=investment.investor,
@@ -37,6 +38,7 @@ def update(db: Session, investment: StockInvestmentCreate):
                 earned_date=investment.investment_date or date.today(),  # type: ignore
             )
             db.add(income)
+            rollup_services.add_to_rollup(db, income)
 
         stock.average_price_per_unit = (
             stock.total_cost / stock.total_quantity if stock.total_quantity > 0 else 0
@@ -58,3 +60,4 @@ def update(db: Session, investment: StockInvestmentCreate):
         db.add(new_stock)
 
     db.commit()
+    change_events.publish(change_events.STOCK, "update", investment.investor)
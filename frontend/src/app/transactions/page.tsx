@@ -51,6 +51,8 @@ export default function TransactionsPage() {
   });
   const [availableBanks, setAvailableBanks] = useState<string[]>([]);
   const [previewData, setPreviewData] = useState<any[]>([]);
+  // Page of the uploaded statement being reviewed; large files are imported page by page
+  const [previewPage, setPreviewPage] = useState({ offset: 0, hasMore: false });
   const [mutualFundSummary, setMutualFundSummary] = useState<any[]>([]);
 
   // Map endpoints for investment types -> endpoint
@@ -120,6 +122,39 @@ useEffect(() => {
       .catch(err => console.error("Failed to fetch stock summaries", err));
 }, [activeTab]);
 
+// Preview one page of the selected statement; resolves to false when it failed
+async function loadPreviewPage(offset: number) {
+  if (!importForm.user_id || !importForm.bank_name || !importForm.file) {
+    alert("Please fill all fields");
+    return false;
+  }
+
+  const formData = new FormData();
+  formData.append("bank_name", importForm.bank_name);
+  formData.append("currency", importForm.currency);
+  formData.append("file", importForm.file);
+  formData.append("offset", String(offset));
+  formData.append("limit", String(IMPORT_PAGE_SIZE));
+  // Lets the backend flag rows imported from an earlier statement or page
+  formData.append("user_id", importForm.user_id);
+
+  try {
+    const res = await fetch("/api/import/preview", {
+      method: "POST",
+      body: formData
+    });
+    const data = await res.json();
+    if(!res.ok) throw new Error(data.detail || "Preview failed");
+
+    setPreviewData(data.data); // Move to Step 2
+    setPreviewPage({ offset: data.offset, hasMore: data.has_more });
+    return true;
+  } catch (err: any) {
+    alert("Error: " + err.message);
+    return false;
+  }
+}
+
 async function fetchRecent() {
   try {
     let records: any[] = [];
@@ -1262,32 +1297,7 @@ function formatAmount(amount: any, currency?: string) {
                           {/* Preview Button */}
                           <div className="pt-4 flex justify-end">
                               <button 
-                                  onClick={async () => {
-                                      if (!importForm.user_id || !importForm.bank_name || !importForm.file) {
-                                          alert("Please fill all fields");
-                                          return;
-                                      }
-                                      
-                                      const formData = new FormData();
-                                      formData.append("bank_name", importForm.bank_name);
-                                      formData.append("currency", importForm.currency);
-                                      formData.append("file", importForm.file);
-
-                                      try {
-                                          const res = await fetch("/api/import/preview", {
-                                              method: "POST",
-                                              body: formData
-                                          });
-                                          const data = await res.json();
-                                          if(!res.ok) throw new Error(data.detail || "Preview failed");
-                                          
-                                          // console.log("Preview Data:", data);
-                                          setPreviewData(data); // Move to Step 2
-                                          
-                                      } catch (err: any) {
-                                          alert("Error: " + err.message);
-                                      }
-                                  }}
+                                  onClick={() => loadPreviewPage(0)}
                                   className="w-full bg-[var(--color-accent)] hover:bg-[var(--color-accent-hover)] text-black py-3 rounded-xl font-bold transition"
                               >
                                   Preview Transactions
@@ -1316,7 +1326,12 @@ function formatAmount(amount: any, currency?: string) {
                                               <td className={`px-4 py-2 text-right font-mono ${txn.type === 'income' ? 'text-green-500' : 'text-red-500'}`}>
                                                   {txn.amount} {txn.currency}
                                               </td>
-                                              <td className="px-4 py-2">{txn.type}</td>
+                                              <td className="px-4 py-2">
+                                                  {txn.type}
+                                                  {txn.duplicate && (
+                                                      <span className="ml-2 text-xs text-yellow-500" title="Already imported, will be skipped">duplicate</span>
+                                                  )}
+                                              </td>
                                               <td className="px-4 py-2">
                                                   {txn.type === 'income' ? (
                                                       <select 
@@ -1367,6 +1382,11 @@ function formatAmount(amount: any, currency?: string) {
                               >
                                   &larr; Back
                               </button>
+
+                              <span className="text-sm text-[var(--color-text-secondary)]">
+                                  Rows {previewPage.offset + 1}&ndash;{previewPage.offset + previewData.length}
+                                  {previewPage.hasMore ? ", more to follow" : ""}
+                              </span>
                               
                               <button 
                                   onClick={async () => {
@@ -1374,7 +1394,7 @@ function formatAmount(amount: any, currency?: string) {
                                       try {
                                           const payload = {
                                               user_id: Number(importForm.user_id),
-                                              transactions: previewData
+                                              transactions: previewData.filter(txn => !txn.duplicate)
                                           };
                                           
                                           const res = await fetch("/api/import/confirm", {
@@ -1391,9 +1411,13 @@ function formatAmount(amount: any, currency?: string) {
                                               alert(`Learned ${data.learned} new categorization rules.`);
                                           }
                                           
+                                          fetchRecent();
+                                          // Continue with the next page of a large statement
+                                          if (previewPage.hasMore && await loadPreviewPage(previewPage.offset + IMPORT_PAGE_SIZE)) {
+                                              return;
+                                          }
                                           setShowImportModal(false);
                                           setPreviewData([]);
-                                          fetchRecent();
                                       } catch (err: any) {
                                           alert("Error: " + err.message);
                                       } finally {
@@ -1403,7 +1427,7 @@ function formatAmount(amount: any, currency?: string) {
                                   disabled={loading}
                                   className="bg-[var(--color-accent)] hover:bg-[var(--color-accent-hover)] text-black py-2 px-8 rounded-xl font-bold transition disabled:opacity-50"
                               >
-                                  {loading ? "Importing..." : `Confirm & Import (${previewData.length})`}
+                                  {loading ? "Importing..." : `Confirm & Import (${previewData.filter(txn => !txn.duplicate).length})${previewPage.hasMore ? " & Next Page" : ""}`}
                               </button>
                           </div>
                       </div>
@@ -1415,5 +1439,8 @@ function formatAmount(amount: any, currency?: string) {
   );
 }
 
+// Rows per preview request; matches PREVIEW_PAGE_SIZE on the backend
+const IMPORT_PAGE_SIZE = 500;
+
 const inputClass = 'w-full px-4 py-2.5 rounded-xl border border-[var(--color-bg-lighter)] bg-[var(--color-bg)] text-[var(--color-text-primary)] focus:outline-none focus:ring-2 focus:ring-[var(--color-accent)/30] transition-all';
 const selectClass = 'w-full px-4 py-2.5 rounded-xl border border-[var(--color-bg-lighter)] bg-[var(--color-bg)] text-[var(--color-text-primary)] focus:outline-none focus:ring-2 focus:ring-[var(--color-accent)/30] transition-all';
\ No newline at end of file
@@ -0,0 +1,39 @@
+import sys
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from backend.models.investments.analytics import StockFundamentalsLatest
+from backend.services.db_services import session_scope
+from utilities.analytics.fundamentals_store import (
+    backfill_archive,
+    rebuild_latest_snapshot,
+)
+from utilities.common.app_config import config
+
+sys.path.insert(0, "/app")
+
+logger = config.setup_logger("scripts.backfill_fundamentals_archive")
+
+
+def run(db: Optional[Session] = None):
+    """Rebuild the latest fundamentals snapshot and export the history to Parquet."""
+    with session_scope(db) as db:
+        try:
+            StockFundamentalsLatest.__table__.create(
+                bind=db.get_bind(), checkfirst=True
+            )
+            rebuild_latest_snapshot(db)
+            db.commit()
+            backfill_archive(db)
+
+        except Exception as e:
+            logger.error(
+                f"Critical error in backfill_fundamentals_archive script: {e}",
+                exc_info=True,
+            )
+            raise
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,31 @@
+import sys
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from backend.models.monthly_rollup import MonthlyRollup
+from backend.services.db_services import session_scope
+from backend.services.rollup_services import rebuild_monthly_rollups
+from utilities.common.app_config import config
+
+sys.path.insert(0, "/app")
+
+logger = config.setup_logger("scripts.backfill_rollups")
+
+
+def run(db: Optional[Session] = None):
+    """Rebuild the monthly income / expense / investment rollups from scratch."""
+    with session_scope(db) as db:
+        try:
+            MonthlyRollup.__table__.create(bind=db.get_bind(), checkfirst=True)
+            rebuild_monthly_rollups(db)
+
+        except Exception as e:
+            logger.error(
+                f"Critical error in backfill_rollups script: {e}", exc_info=True
+            )
+            raise
+
+
+if __name__ == "__main__":
+    run()
@@ -1,8 +1,9 @@
 import sys
+from typing import Optional
 
 from sqlalchemy.orm import Session
 
-from backend.services.db_services import get_db
+from backend.services.db_services import session_scope
 from utilities.analytics.balancing_screener import BalancingScreener as bS, balancingScreener
 from utilities.analytics.stock_analyzer import get_stock_score
 from utilities.analytics.stock_merger import StockMerger as sM, stockMerger
@@ -12,19 +13,32 @@ from utilities.dashboard.dashboard_calculation_helper import DashboardDataCalcul
 sys.path.insert(0, "/app")
 
 logger = config.setup_logger("scripts.fetch_analytics_for_ui")
-db: Session = next(get_db())
 
-try:
-    # Get Dashboard data
-    test_dashboard = dDC.get_investment_data(
-        dashboardDataCalculator
-    )
 
-    bS.run_cycle(balancingScreener)
+def run(db: Optional[Session] = None):
+    """Rebuild the dashboard, rebalancing plan and stock scores caches.
 
-    sM.merge_stock_lists(stockMerger)
-    sM.merge_with_ticker_data(stockMerger, db)
-    get_stock_score()
+    Returns:
+        The portfolio rebalancing plan
+    """
+    with session_scope(db) as db:
+        try:
+            # Get Dashboard data
+            dDC.get_investment_data(dashboardDataCalculator)
 
-except Exception as e:
-    logger.error(f"Critical error in fetch analytics for UI script: {e}", exc_info=True)
+            plan = bS.run_cycle(balancingScreener)
+
+            sM.merge_stock_lists(stockMerger)
+            sM.merge_with_ticker_data(stockMerger, db)
+            get_stock_score()
+            return plan
+
+        except Exception as e:
+            logger.error(
+                f"Critical error in fetch analytics for UI script: {e}", exc_info=True
+            )
+            raise
+
+
+if __name__ == "__main__":
+    run()
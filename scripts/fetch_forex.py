@@ -1,5 +1,10 @@
 import sys
+from typing import Optional
 
+from sqlalchemy.orm import Session
+
+from scripts.jobs import JobFailed
+from utilities.common.fx_rates import CURRENCIES, forex_cache_key
 from utilities.forex_exchange_rate_fetcher import (
     ForexExchangeRateFetcher as fEx,
     forexFetcher,
@@ -10,11 +15,29 @@ sys.path.insert(0, "/app")
 
 logger = config.setup_logger("scripts.fetch_forex")
 
-try:
-    # Get Forex Data
-    fEx.get_exchange_rates(forexFetcher, "USD", "INR")
-    fEx.get_exchange_rates(forexFetcher, "PLN", "INR")
-    fEx.get_exchange_rates(forexFetcher, "USD", "PLN")
 
-except Exception as e:
-    logger.error(f"Critical error in fetch_forex script: {e}", exc_info=True)
+def run(db: Optional[Session] = None):
+    """Refresh the cached forex exchange rates and today's stored rates."""
+    try:
+        # One request for every currency, instead of one per pair
+        stored = fEx.refresh_rates(forexFetcher, db)
+        if not stored:
+            logger.warning("Bulk forex fetch failed, falling back to single pairs")
+            fEx.get_exchange_rates(forexFetcher, "USD", "INR")
+            fEx.get_exchange_rates(forexFetcher, "PLN", "INR")
+            fEx.get_exchange_rates(forexFetcher, "USD", "PLN")
+
+            # The single-pair fetch falls back to 1.0 on errors; only the cache tells
+            cached = forexFetcher.redis_client.exists(
+                *(forex_cache_key(c, "INR") for c in CURRENCIES if c != "INR")
+            )
+            if not cached:
+                raise JobFailed("fetch_forex: no forex rates could be fetched")
+
+    except Exception as e:
+        logger.error(f"Critical error in fetch_forex script: {e}", exc_info=True)
+        raise
+
+
+if __name__ == "__main__":
+    run()
@@ -1,27 +1,49 @@
+from typing import Optional
+
 from sqlalchemy.orm import Session
 
-from backend.services.db_services import get_db
+from backend.services.db_services import session_scope
 from utilities.fetch_overall_investment_data import get_investments_symbols
 from utilities.mutual_fund_price_fetcher import (
     MutualFundPriceFetcher as mfF,
     mutualFundFetcher,
 )
 from utilities.common.app_config import config
+from scripts.jobs import check_results
 
 logger = config.setup_logger("scripts.fetch_mutual_funds")
-db: Session = next(get_db())
-# Get all investment data and stock prices upfront
-all_investment_data = get_investments_symbols(db)
-mutual_funds_list = all_investment_data["mutual_funds"]
-
-try:
-    mf_data = mfF.get_mutual_fund_rates_bulk(mutualFundFetcher, mutual_funds_list)
-
-    if mf_data and mf_data.get("data"):
-        mfF.update_mutual_fund_investments(mutualFundFetcher, db, mf_data)
-        mfF.update_mutual_fund_summary(mutualFundFetcher, db, mf_data)
-    else:
-        logger.warning("No valid mutual fund data fetched. Skipping updates.")
-
-except Exception as e:
-    logger.error(f"Critical error in fetch_mutual_funds script: {e}", exc_info=True)
+
+
+def run(db: Optional[Session] = None):
+    """Refresh mutual fund NAVs and update investments and summaries."""
+    with session_scope(db) as db:
+        # Get all investment data and stock prices upfront
+        all_investment_data = get_investments_symbols(db)
+        mutual_funds_list = all_investment_data["mutual_funds"]
+        logger.info(f"Mutual Fund list: {mutual_funds_list}")
+
+        try:
+            mf_data = mfF.get_mutual_fund_rates_bulk(
+                mutualFundFetcher, mutual_funds_list
+            )
+
+            # Schemes without a NAV keep their last valuation
+            mf_data = {code: data for code, data in mf_data.items() if data}
+            if mf_data:
+                check_results(
+                    "fetch_mutual_funds",
+                    mfF.update_mutual_fund_investments(mutualFundFetcher, db, mf_data),
+                    mfF.update_mutual_fund_summary(mutualFundFetcher, db, mf_data),
+                )
+            else:
+                logger.warning("No valid mutual fund data fetched. Skipping updates.")
+
+        except Exception as e:
+            logger.error(
+                f"Critical error in fetch_mutual_funds script: {e}", exc_info=True
+            )
+            raise
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,113 @@
+"""
+Registry of the jobs in scripts/.
+
+Every script exposes a `run()` callable and does nothing at import. Jobs are
+looked up by name and their module is only imported when the job is invoked,
+so importing the API (or this registry) never touches the DB, Redis or the
+network.
+
+Usage:
+    python -m scripts.jobs fetch_forex fetch_stocks
+"""
+
+import functools
+import importlib
+import sys
+import time
+from typing import Callable, Dict, List
+
+from utilities.common.app_config import config
+
+logger = config.setup_logger("scripts.jobs")
+
+# job name -> module exposing run()
+JOBS: Dict[str, str] = {
+    "fetch_forex": "scripts.fetch_forex",
+    "fetch_stocks": "scripts.fetch_stocks",
+    "fetch_mutual_funds": "scripts.fetch_mutual_funds",
+    "fetch_crypto": "scripts.fetch_crypto",
+    "fetch_metals": "scripts.fetch_metals",
+    "fetch_analytics_for_ui": "scripts.fetch_analytics_for_ui",
+    "backfill_rollups": "scripts.backfill_rollups",
+    "backfill_fundamentals_archive": "scripts.backfill_fundamentals_archive",
+}
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# job name -> (interval_seconds, jitter_seconds, initial_delay_seconds) for the
+# in-process scheduler
+JOB_SCHEDULES = {
+    "fetch_forex": (DAY, 300, 0),
+    "fetch_stocks": (DAY, 600, 60),
+    "fetch_mutual_funds": (DAY, 600, 60),
+    "fetch_crypto": (DAY, 600, 60),
+    "fetch_metals": (5 * DAY, 1800, 60),
+    "fetch_analytics_for_ui": (HOUR, 120, 300),
+}
+
+# job name -> jobs that must have succeeded recently before it runs. Prices are
+# converted with the cached forex rates, analytics read the refreshed prices.
+JOB_DEPENDENCIES = {
+    "fetch_stocks": ("fetch_forex",),
+    "fetch_mutual_funds": ("fetch_forex",),
+    "fetch_crypto": ("fetch_forex",),
+    "fetch_metals": ("fetch_forex",),
+    "fetch_analytics_for_ui": ("fetch_stocks",),
+}
+
+
+class JobFailed(RuntimeError):
+    """Raised by a job whose run did not complete, so the scheduler records it as failed."""
+
+
+def check_results(job_name: str, *results: dict):
+    """Raise JobFailed if any fetcher update result reports success=False."""
+    errors = [r.get("error") for r in results if r and not r.get("success", True)]
+    if errors:
+        raise JobFailed(f"{job_name}: {'; '.join(str(e) for e in errors)}")
+
+
+def list_jobs() -> List[str]:
+    return list(JOBS)
+
+
+def get_job(name: str) -> Callable:
+    """Import the job's module on demand and return its run() callable."""
+    if name not in JOBS:
+        raise KeyError(f"Unknown job '{name}'. Available: {', '.join(JOBS)}")
+    return importlib.import_module(JOBS[name]).run
+
+
+def run_job(name: str, **kwargs):
+    """Run a registered job and return whatever its run() returns."""
+    job = get_job(name)
+    started = time.monotonic()
+    logger.info(f"▶️ Running job {name}")
+    result = job(**kwargs)
+    logger.info(f"✅ Job {name} finished in {time.monotonic() - started:.1f}s")
+    return result
+
+
+def register_scheduled_jobs(scheduler):
+    """Register every job in JOB_SCHEDULES with a backend.common.scheduler.JobScheduler."""
+    for name, (interval, jitter, initial_delay) in JOB_SCHEDULES.items():
+        scheduler.register(
+            name,
+            functools.partial(run_job, name),
+            interval_seconds=interval,
+            jitter_seconds=jitter,
+            initial_delay_seconds=initial_delay,
+            depends_on=JOB_DEPENDENCIES.get(name, ()),
+        )
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:]
+    if not names:
+        print(
+            f"Usage: python -m scripts.jobs <job> [<job> ...]\nJobs: {', '.join(JOBS)}"
+        )
+        sys.exit(1)
+    for job_name in names:
+        run_job(job_name)
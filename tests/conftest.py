@@ -0,0 +1,4 @@
+import os
+
+# Models bind to DATABASE_URL at import; tests that need the DB bring their own
+os.environ.setdefault("DATABASE_URL", "sqlite://")
@@ -0,0 +1,69 @@
+from contextlib import contextmanager
+from pathlib import Path
+from unittest import mock
+
+from utilities.common import amfi_nav
+
+FIXTURE = Path(__file__).parent / "fixtures" / "NAVAll.txt"
+
+
+def test_parse_nav_lines_skips_headings_header_and_missing_navs():
+    with open(FIXTURE, encoding="utf-8") as f:
+        records = list(amfi_nav.parse_nav_lines(f))
+
+    assert [r["Scheme_Code"] for r in records] == [
+        "119551",
+        "119552",
+        "120437",
+        "119018",
+        "125497",
+    ]
+    first = records[0]
+    assert first["NAV"] == 105.8904
+    assert first["Date"] == "2026-10-17"
+    assert first["Fund_House"] == "Aditya Birla Sun Life Mutual Fund"
+    assert first["Scheme_Type"] == (
+        "Open Ended Schemes(Debt Scheme - Banking and PSU Fund)"
+    )
+    assert first["ISIN_Growth"] == "INF209KA12Z1"
+    assert first["source"] == "amfi"
+
+    by_code = {r["Scheme_Code"]: r for r in records}
+    assert by_code["120437"]["Fund_House"] == "Axis Mutual Fund"
+    assert by_code["120437"]["ISIN_Reinvestment"] is None
+    assert by_code["119018"]["Scheme_Type"] == (
+        "Open Ended Schemes(Equity Scheme - Large Cap Fund)"
+    )
+    # Dates that do not parse are kept as they are
+    assert by_code["125497"]["Date"] == "not-a-date"
+
+
+def test_load_nav_index_from_local_file():
+    index = amfi_nav.load_nav_index(str(FIXTURE))
+
+    assert len(index) == 5
+    assert index["119018"]["NAV"] == 1234.5
+    assert "120438" not in index
+
+
+def test_load_nav_index_stops_once_all_schemes_are_found():
+    read = []
+
+    @contextmanager
+    def counting_source(source):
+        with open(source, encoding="utf-8") as f:
+
+            def lines():
+                for line in f:
+                    read.append(line)
+                    yield line
+
+            yield lines()
+
+    with mock.patch.object(amfi_nav, "open_nav_source", counting_source):
+        index = amfi_nav.load_nav_index(str(FIXTURE), scheme_codes=["119552", 119551])
+
+    assert sorted(index) == ["119551", "119552"]
+    assert read[-1].startswith("119552;")
+    with open(FIXTURE, encoding="utf-8") as f:
+        assert len(read) < len(f.readlines())
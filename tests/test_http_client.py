@@ -0,0 +1,83 @@
+from unittest import mock
+
+import pytest
+import requests
+
+from utilities.common.http_client import CircuitBreaker, CircuitOpenError, HttpClient
+
+
+def _response(status_code: int) -> mock.Mock:
+    return mock.Mock(spec=requests.Response, status_code=status_code, headers={})
+
+
+def _client() -> HttpClient:
+    return HttpClient(
+        "test",
+        max_retries=0,
+        failure_threshold=1,
+        reset_timeout_seconds=0,
+    )
+
+
+def test_circuit_opens_after_failures_and_fails_fast():
+    client = HttpClient(
+        "test", max_retries=0, failure_threshold=2, reset_timeout_seconds=60
+    )
+    with mock.patch.object(
+        client.session,
+        "request",
+        side_effect=requests.exceptions.ConnectionError("down"),
+    ) as send:
+        for _ in range(2):
+            with pytest.raises(requests.exceptions.ConnectionError):
+                client.get("https://example.invalid")
+        with pytest.raises(CircuitOpenError):
+            client.get("https://example.invalid")
+
+    assert send.call_count == 2
+    assert client.breaker.state == CircuitBreaker.OPEN
+
+
+def test_unexpected_error_in_half_open_trial_does_not_stick_the_circuit():
+    client = _client()
+    with mock.patch.object(
+        client.session,
+        "request",
+        side_effect=requests.exceptions.ConnectionError("down"),
+    ):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            client.get("https://example.invalid")
+    assert client.breaker.state == CircuitBreaker.OPEN
+
+    # The half-open trial fails with an error that is not retried
+    with mock.patch.object(
+        client.session,
+        "request",
+        side_effect=requests.exceptions.ChunkedEncodingError("truncated"),
+    ):
+        with pytest.raises(requests.exceptions.ChunkedEncodingError):
+            client.get("https://example.invalid")
+    assert client.breaker.state == CircuitBreaker.OPEN
+
+    # The next trial goes through and closes the circuit again
+    with mock.patch.object(client.session, "request", return_value=_response(200)):
+        assert client.get("https://example.invalid").status_code == 200
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+    metrics = client.metrics()
+    assert metrics["requests"] == 3
+    assert metrics["failures"] == 2
+
+
+def test_retries_transient_status_then_returns_response():
+    client = HttpClient("test", max_retries=2, backoff_base_seconds=0)
+    with mock.patch.object(
+        client.session,
+        "request",
+        side_effect=[_response(503), _response(200)],
+    ) as send:
+        assert client.get("https://example.invalid").status_code == 200
+
+    assert send.call_count == 2
+    assert client.metrics()["retries"] == 1
+    assert client.breaker.state == CircuitBreaker.CLOSED
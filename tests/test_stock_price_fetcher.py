@@ -0,0 +1,65 @@
+from unittest import mock
+
+import pandas as pd
+import pytest
+
+from utilities.common.app_config import config
+from utilities.stock_price_fetcher import StockPriceFetcher
+
+
+@pytest.fixture
+def fetcher():
+    with mock.patch.object(config, "redis_client", return_value=mock.MagicMock()):
+        fetcher = StockPriceFetcher()
+    fetcher.rate_limiter = mock.Mock()
+    # Nothing cached
+    fetcher.get_from_cache = lambda prefix, symbols: {s: None for s in symbols}
+    fetcher.set_cache = mock.Mock()
+    return fetcher
+
+
+def _history(closes: dict) -> pd.DataFrame:
+    """A yf.download(group_by="ticker") frame with the given Close columns."""
+    index = pd.date_range("2026-10-12", periods=3, freq="D")
+    columns = pd.MultiIndex.from_product([list(closes), ["Close"]])
+    return pd.DataFrame(
+        {(ticker, "Close"): values for ticker, values in closes.items()},
+        index=index,
+        columns=columns,
+    )
+
+
+def test_price_only_uses_one_batched_download(fetcher):
+    history = _history(
+        {"TCS.NS": [3900.0, 3950.0, 4000.0], "INFY.NS": [1500.0, None, None]}
+    )
+    with (
+        mock.patch("yfinance.download", return_value=history) as download,
+        mock.patch.object(fetcher, "_fetch_ticker_info") as fetch_info,
+    ):
+        result = fetcher.get_stock_prices_in_bulk(["TCS", "INFY"], price_only=True)
+
+    download.assert_called_once()
+    fetch_info.assert_not_called()
+    assert result["data"]["TCS"]["currentPrice"] == 4000.0
+    assert result["data"]["TCS"]["previousClose"] == 3950.0
+    # A single close is both the current and the previous price
+    assert result["data"]["INFY"]["previousClose"] == 1500.0
+    assert fetcher._current_prices(result) == {"TCS": 4000.0, "INFY": 1500.0}
+    fetcher.set_cache.assert_called_once_with(fetcher.quote_cache_key_prefix, mock.ANY)
+
+
+def test_price_only_falls_back_to_full_fetch_for_unpriced_symbols(fetcher):
+    history = _history({"TCS.NS": [3900.0, 3950.0, 4000.0], "NEW.NS": [None] * 3})
+    info = {"currentPrice": 12.5, "previousClose": 12.0}
+    with (
+        mock.patch("yfinance.download", return_value=history),
+        mock.patch.object(
+            fetcher, "_fetch_ticker_info", return_value=info
+        ) as fetch_info,
+    ):
+        result = fetcher.get_stock_prices_in_bulk(["TCS", "NEW"], price_only=True)
+
+    fetch_info.assert_called_once_with("NEW")
+    assert fetcher._current_prices(result) == {"TCS": 4000.0, "NEW": 12.5}
+    assert result["errors"] == {}
@@ -1,10 +1,13 @@
+import json
 from datetime import datetime, date
 from pathlib import Path
 from typing import Tuple, Dict, Any
 
 from sqlalchemy.orm import Session
 
-from utilities.common.base_fetcher import BaseFetcher
+from backend.common import change_events
+from utilities.common.base_fetcher import BaseFetcher, _build_cache_key
+from utilities.common.lazy_singleton import LazySingleton
 from backend.services.db_services import get_db
 from utilities.common.config_loader_util import load_config, save_config
 from utilities.common.value_extractor_util import (
@@ -24,6 +27,7 @@ class BalancingScreener(BaseFetcher):
         """
         self.db: Session = next(get_db())
         self.cache_key_prefix = "rebalancing_screener"
+        self.plan = "plan"
         self.cache_expiry_in_seconds = 86400
         super().__init__(
             "utilities.analytics.balancing_screener",
@@ -172,6 +176,8 @@ class BalancingScreener(BaseFetcher):
                 cfg["monthly_sip"] = round2(new_val)
                 cfg["last_stepup_applied"] = today.isoformat()
                 save_config(cfg, config_path)
+                # The cached plan was computed with the old SIP amount
+                change_events.publish(change_events.PORTFOLIO_CONFIG, "step_up")
                 return new_val
         return float(cfg["monthly_sip"])
 
@@ -256,17 +262,44 @@ class BalancingScreener(BaseFetcher):
     # Main Runner
     # ---------------------------------------------------------------
     def run_cycle(self, portfolio_data=None):
-        """Run full rebalancing pipeline."""
+        """Run full rebalancing pipeline.
+
+        The plan for the stored portfolio is cached under rebalancing_screener::PLAN
+        and dropped by backend.common.change_events whenever holdings, prices or
+        the portfolio config change. Plans for caller-supplied data are not cached.
+        The SIP step-up is applied first, so a due step-up drops the cached plan
+        before it is read.
+        """
         base_dir = Path(__file__).resolve().parents[2]
         config_path = base_dir / "frontend" / "portfolio-config.json"
+        self.apply_step_up_if_due(str(config_path))
+
+        use_cache = portfolio_data is None
+        if use_cache:
+            cached_plan = self.get_from_cache(self.cache_key_prefix, [self.plan])
+            if cached_plan.get(self.plan):
+                return cached_plan[self.plan]
 
         portfolio_config = load_config(str(config_path))
         portfolio_data = portfolio_data or get_investments_with_sub_allocations(self.db)
 
         total, cats = self.get_total_and_categories(portfolio_config, portfolio_data)
-        self.apply_step_up_if_due(str(config_path))
-        return self.compute_allocation_suggestion(portfolio_config, total, cats)
+        result = self.compute_allocation_suggestion(portfolio_config, total, cats)
+
+        if use_cache:
+            try:
+                self.redis_client.setex(
+                    _build_cache_key(self.cache_key_prefix, self.plan),
+                    self.cache_expiry_in_seconds,
+                    json.dumps(result),
+                )
+            except Exception as e:
+                self.logger.warning(
+                    f"Cache write failed for {self.cache_key_prefix}: {e}"
+                )
+
+        return result
 
 
 # Global instance
-balancingScreener = BalancingScreener()
+balancingScreener = LazySingleton(BalancingScreener)
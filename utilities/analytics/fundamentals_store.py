@@ -0,0 +1,402 @@
+"""
+Point-in-time storage of stock fundamentals.
+
+Two stores sit behind the nightly fundamentals merge:
+
+- stock_fundamentals_latest holds the newest snapshot of every symbol, with
+  extra_metrics flattened once at write time. Scoring reads it with a plain
+  SELECT instead of ranking the whole stocks_valuable_data history and parsing
+  its JSON row by row.
+- An append-only Parquet archive with one partition per snapshot date
+  (<archive>/date=YYYY-MM-DD/fundamentals.parquet) keeps the full history for
+  factor analysis without touching MySQL. Writing it needs pyarrow; without it
+  the archive is skipped and the latest table is still maintained.
+"""
+
+import datetime
+import importlib.util
+import json
+import os
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import pandas as pd
+from sqlalchemy import func, inspect
+from sqlalchemy.orm import Session
+
+from backend.models.investments.analytics import (
+    StockFundamentalsLatest,
+    StocksValuableData,
+)
+from utilities.analytics.stock_analyzer import EXTRA_METRIC_MAP, flatten_json
+from utilities.common.app_config import config
+
+logger = config.setup_logger("utilities.analytics.fundamentals_store")
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+ARCHIVE_DIR = Path(
+    config.FUNDAMENTALS_ARCHIVE_DIR
+    or ROOT_DIR / "backend" / "files" / "stocks" / "fundamentals_history"
+)
+ARCHIVE_FILE = "fundamentals.parquet"
+
+# Columns copied as-is from stocks_valuable_data
+SNAPSHOT_COLUMNS = [
+    "symbol",
+    "sector",
+    "sub_sector",
+    "date",
+    "market_cap",
+    "close_price",
+    "pe_ratio",
+    "pb_ratio",
+    "peg_ratio",
+    "roe",
+    "roce",
+    "debt_to_equity",
+    "promoter_holding",
+    "ebitda_margin",
+    "ev_ebitda",
+    "created_at",
+]
+
+# Columns the analyzer scores on, in the order it expects them
+SCORING_COLUMNS = [
+    "symbol",
+    "sector",
+    "sub_sector",
+    "market_cap",
+    "pe_ratio",
+    "pb_ratio",
+    "peg_ratio",
+    "roe",
+    "roce",
+    "debt_to_equity",
+    "promoter_holding",
+    "ebitda_margin",
+    "ev_ebitda",
+]
+
+_latest_table_ready = False
+
+
+def flatten_metrics(extra_metrics) -> dict:
+    """
+    Flatten a stocks_valuable_data.extra_metrics value to scoring names.
+
+    Nested keys are joined with "_" (liquidity_current_ratio); the ones in
+    EXTRA_METRIC_MAP are renamed (CurrentRatio) and the rest are kept.
+    """
+    try:
+        if isinstance(extra_metrics, str):
+            extra = json.loads(extra_metrics)
+        elif isinstance(extra_metrics, dict):
+            extra = extra_metrics
+        else:
+            extra = {}
+    except Exception as e:
+        logger.error(f"⚠️ Failed to parse extra_metrics: {e}")
+        extra = {}
+
+    extra_flat = flatten_json(extra)
+    metrics = {
+        new_key: extra_flat[old_key]
+        for old_key, new_key in EXTRA_METRIC_MAP.items()
+        if old_key in extra_flat
+    }
+    for key, value in extra_flat.items():
+        if key not in EXTRA_METRIC_MAP:
+            metrics[key] = value
+    return metrics
+
+
+def _as_datetime(value):
+    if isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+        return datetime.datetime.combine(value, datetime.time())
+    return value
+
+
+def _snapshot_mapping(row: dict, now: datetime.datetime) -> dict:
+    mapping = {column: row.get(column) for column in SNAPSHOT_COLUMNS}
+    mapping["date"] = _as_datetime(mapping["date"])
+    mapping["metrics"] = flatten_metrics(row.get("extra_metrics"))
+    mapping["last_updated"] = now
+    return mapping
+
+
+# ---------------------------------------------------------------
+# Latest snapshot table
+# ---------------------------------------------------------------
+def latest_snapshot_ready(db: Session) -> bool:
+    """Whether the latest-snapshot table exists; cached once it has been seen."""
+    global _latest_table_ready
+    if not _latest_table_ready:
+        _latest_table_ready = inspect(db.get_bind()).has_table(
+            StockFundamentalsLatest.__tablename__
+        )
+    return _latest_table_ready
+
+
+def ensure_latest_snapshot(db: Session) -> bool:
+    """Create and backfill the latest-snapshot table the first time it is needed.
+
+    The backfill runs and commits on its own session, so nothing pending in
+    the caller's session is committed with it. Call it before the caller's
+    transaction touches fundamentals, so that transaction sees the new table.
+
+    Returns:
+        True if the table was created by this call
+    """
+    global _latest_table_ready
+    if latest_snapshot_ready(db):
+        return False
+
+    logger.info(
+        f"📦 {StockFundamentalsLatest.__tablename__} table missing, creating and backfilling it"
+    )
+    StockFundamentalsLatest.__table__.create(bind=db.get_bind(), checkfirst=True)
+    with Session(bind=db.get_bind()) as backfill_db:
+        rebuild_latest_snapshot(backfill_db)
+        backfill_db.commit()
+    _latest_table_ready = True
+    return True
+
+
+def rebuild_latest_snapshot(db: Session) -> int:
+    """
+    Recompute the latest snapshot of every symbol from stocks_valuable_data.
+
+    Does not commit.
+
+    Returns:
+        Number of snapshot rows written
+    """
+    ranked = db.query(
+        *(getattr(StocksValuableData, column) for column in SNAPSHOT_COLUMNS),
+        StocksValuableData.extra_metrics,
+        func.row_number()
+        .over(
+            partition_by=StocksValuableData.symbol,
+            order_by=StocksValuableData.created_at.desc(),
+        )
+        .label("rn"),
+    ).subquery()
+    rows = db.query(
+        *(ranked.c[column] for column in SNAPSHOT_COLUMNS), ranked.c.extra_metrics
+    ).filter(ranked.c.rn == 1)
+
+    now = datetime.datetime.now()
+    mappings = [_snapshot_mapping(row._asdict(), now) for row in rows]
+
+    db.query(StockFundamentalsLatest).delete(synchronize_session=False)
+    if mappings:
+        db.bulk_insert_mappings(StockFundamentalsLatest, mappings, render_nulls=True)
+    logger.info(f"✅ Rebuilt {len(mappings)} latest fundamentals snapshot rows")
+    return len(mappings)
+
+
+def record_snapshots(db: Session, rows: List[dict]) -> List[dict]:
+    """
+    Make freshly written stocks_valuable_data rows the latest snapshot of their symbols.
+
+    Upserts the latest-snapshot table in the caller's transaction; it does not
+    commit. The returned mappings go to archive_snapshots once the caller has
+    committed, so the append-only archive never holds rows the DB rolled back.
+
+    Args:
+        db: Database session
+        rows: Dicts with the stocks_valuable_data columns, extra_metrics included
+
+    Returns:
+        The snapshot mappings written
+    """
+    if not rows:
+        return []
+    ensure_latest_snapshot(db)
+
+    now = datetime.datetime.now()
+    mappings = [_snapshot_mapping(row, now) for row in rows]
+    symbols = [m["symbol"] for m in mappings]
+    existing = {
+        symbol
+        for (symbol,) in db.query(StockFundamentalsLatest.symbol).filter(
+            StockFundamentalsLatest.symbol.in_(symbols)
+        )
+    }
+    inserts = [m for m in mappings if m["symbol"] not in existing]
+    updates = [m for m in mappings if m["symbol"] in existing]
+    if inserts:
+        db.bulk_insert_mappings(StockFundamentalsLatest, inserts, render_nulls=True)
+    if updates:
+        db.bulk_update_mappings(StockFundamentalsLatest, updates)
+    return mappings
+
+
+def load_latest_fundamentals(db: Session) -> pd.DataFrame:
+    """
+    Latest fundamentals of every symbol, one row each, ready for scoring.
+
+    Columns are SCORING_COLUMNS followed by the flattened extra metrics; missing
+    values are 0.0.
+    """
+    ensure_latest_snapshot(db)
+    rows = db.query(
+        *(getattr(StockFundamentalsLatest, column) for column in SCORING_COLUMNS),
+        StockFundamentalsLatest.metrics,
+    ).all()
+    if not rows:
+        return pd.DataFrame()
+
+    base = pd.DataFrame([row[:-1] for row in rows], columns=SCORING_COLUMNS)
+    metrics = pd.DataFrame.from_records([row[-1] or {} for row in rows])
+    df = pd.concat([base, metrics[_metric_order(metrics.columns)]], axis=1)
+    return df.fillna(0.0)
+
+
+def _metric_order(columns) -> list:
+    """Mapped metric names first (EXTRA_METRIC_MAP order), then the rest as found."""
+    mapped = list(dict.fromkeys(EXTRA_METRIC_MAP.values()))
+    present = set(columns)
+    return [c for c in mapped if c in present] + [c for c in columns if c not in mapped]
+
+
+# ---------------------------------------------------------------
+# Parquet history archive
+# ---------------------------------------------------------------
+def archive_available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _partition_path(day: datetime.date) -> Path:
+    return ARCHIVE_DIR / f"date={day.isoformat()}" / ARCHIVE_FILE
+
+
+def _archive_frame(mappings: List[dict]) -> pd.DataFrame:
+    base = pd.DataFrame(
+        [{c: m[c] for c in SNAPSHOT_COLUMNS} for m in mappings],
+        columns=SNAPSHOT_COLUMNS,
+    )
+    metrics = pd.DataFrame.from_records([m["metrics"] or {} for m in mappings])
+    metrics = metrics.drop(columns=[c for c in metrics.columns if c in base.columns])
+    return pd.concat([base, metrics.apply(pd.to_numeric, errors="coerce")], axis=1)
+
+
+def archive_snapshots(mappings: List[dict]) -> int:
+    """
+    Write snapshot mappings to the archive, one partition per snapshot date.
+
+    Rows replace the ones of the same symbols already in their date's
+    partition, so re-running a day's merge rewrites that day instead of
+    duplicating it.
+
+    Returns:
+        Number of partitions written
+    """
+    if not mappings:
+        return 0
+    if not archive_available():
+        logger.warning("⚠️ pyarrow is not installed, skipping the fundamentals archive")
+        return 0
+
+    frame = _archive_frame(mappings)
+    days = pd.to_datetime(frame["date"]).dt.date
+    written = 0
+    for day, partition in frame.groupby(days):
+        path = _partition_path(day)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            previous = pd.read_parquet(path, engine="pyarrow")
+            previous = previous[~previous["symbol"].isin(partition["symbol"])]
+            partition = pd.concat([previous, partition], ignore_index=True)
+        tmp_path = path.with_suffix(".tmp")
+        partition.to_parquet(tmp_path, engine="pyarrow", index=False)
+        os.replace(tmp_path, path)
+        written += 1
+    logger.info(
+        f"🗄️ Archived {len(frame)} fundamentals snapshots in {written} partition(s)"
+    )
+    return written
+
+
+def backfill_archive(db: Session, batch_days: int = 30) -> int:
+    """
+    Export the whole stocks_valuable_data history to the archive.
+
+    Returns:
+        Number of partitions written
+    """
+    if not archive_available():
+        logger.warning(
+            "⚠️ pyarrow is not installed, cannot backfill the fundamentals archive"
+        )
+        return 0
+
+    days = sorted(
+        {
+            _as_datetime(day).date()
+            for (day,) in db.query(StocksValuableData.date).distinct()
+            if day is not None
+        }
+    )
+    columns = [getattr(StocksValuableData, c) for c in SNAPSHOT_COLUMNS]
+    written = 0
+    for start in range(0, len(days), batch_days):
+        batch = days[start : start + batch_days]
+        rows = (
+            db.query(*columns, StocksValuableData.extra_metrics)
+            .filter(
+                StocksValuableData.date >= _as_datetime(batch[0]),
+                StocksValuableData.date
+                < _as_datetime(batch[-1] + datetime.timedelta(days=1)),
+            )
+            .all()
+        )
+        now = datetime.datetime.now()
+        written += archive_snapshots(
+            [_snapshot_mapping(row._asdict(), now) for row in rows]
+        )
+    logger.info(f"✅ Backfilled {written} fundamentals archive partition(s)")
+    return written
+
+
+def load_fundamentals_history(
+    start: Optional[datetime.date] = None,
+    end: Optional[datetime.date] = None,
+    symbols: Optional[Iterable[str]] = None,
+    columns: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """
+    Read archived snapshots between start and end (inclusive).
+
+    Only the partitions in range are opened and only the requested columns
+    are read, so scanning years of history stays cheap.
+
+    Args:
+        start: First snapshot date, None for the oldest
+        end: Last snapshot date, None for the newest
+        symbols: Restrict to these symbols
+        columns: Columns to read; symbol and date are always included
+
+    Returns:
+        DataFrame with one row per symbol per snapshot date
+    """
+    if not ARCHIVE_DIR.exists():
+        return pd.DataFrame()
+
+    if columns is not None:
+        columns = list(dict.fromkeys(["symbol", "date", *columns]))
+    filters = [("symbol", "in", list(symbols))] if symbols is not None else None
+
+    frames = []
+    for partition in sorted(ARCHIVE_DIR.glob(f"date=*/{ARCHIVE_FILE}")):
+        day = datetime.date.fromisoformat(partition.parent.name.split("=", 1)[1])
+        if (start and day < start) or (end and day > end):
+            continue
+        frames.append(
+            pd.read_parquet(
+                partition, engine="pyarrow", columns=columns, filters=filters
+            )
+        )
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
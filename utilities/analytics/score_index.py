@@ -0,0 +1,271 @@
+"""
+In-process index over the cached TOP_500_STOCKS scores.
+
+The analytics routes used to fetch and JSON-decode the whole score blob on
+every request and filter it with list comprehensions. The index decodes it
+once per cache version and keeps, per worker:
+
+- sector and sub-sector buckets and the sector -> sub-sector hierarchy
+- a sorted symbol list for prefix lookups and a lower-cased symbol array for
+  substring search
+- orderings of the universe by every strategy score (built up front) and by
+  any other numeric field (built on first use)
+
+Each request costs one small GET of the version key. The index is rebuilt
+when that version changes, i.e. when the scores are recomputed or invalidated.
+"""
+
+import base64
+import bisect
+import json
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utilities.analytics.stock_analyzer import (
+    SCORES_VERSION_KEY,
+    get_stock_score,
+    publish_scores_version,
+    stockAnalysis,
+)
+from utilities.common.app_config import config
+
+logger = config.setup_logger("utilities.analytics.score_index")
+
+# filter_type -> strategy score that must exceed FILTER_THRESHOLD
+FILTER_STRATEGIES = {"Core": "core", "Accelerator": "accelerators", "GEM": "gem"}
+FILTER_THRESHOLD = 0.2
+
+
+class CursorError(ValueError):
+    """Raised for a cursor that is malformed or from an older index version."""
+
+
+class ScoreIndex:
+    """Indexes the cached stock scores for filtering, sorting and paging."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version: Optional[str] = None
+        self.records: List[dict] = []
+        self.by_symbol: Dict[str, dict] = {}
+        self.sectors: Dict[str, np.ndarray] = {}
+        self.sub_sectors: Dict[str, np.ndarray] = {}
+        self.hierarchy: Dict[str, List[str]] = {}
+        self.filter_masks: Dict[str, np.ndarray] = {}
+        self._symbols_lower: np.ndarray = np.array([], dtype=str)
+        self._prefix_keys: List[str] = []
+        self._prefix_positions: List[int] = []
+        self._orderings: Dict[Tuple[str, bool], np.ndarray] = {}
+        self.sortable_fields: List[str] = []
+
+    # ---------------------------------------------------------------
+    # Refresh
+    # ---------------------------------------------------------------
+    def ensure_fresh(self) -> "ScoreIndex":
+        """Rebuild the index if the cached scores changed since the last build."""
+        redis_client = stockAnalysis.redis_client
+        version = redis_client.get(SCORES_VERSION_KEY)
+        if version is not None and version == self.version:
+            return self
+
+        with self._lock:
+            version = redis_client.get(SCORES_VERSION_KEY)
+            if version is not None and version == self.version:
+                return self
+
+            records = get_stock_score()
+            version = redis_client.get(SCORES_VERSION_KEY)
+            if version is None:
+                # Scores cached before versioning existed
+                version = publish_scores_version(
+                    redis_client, stockAnalysis.cache_expiry_in_seconds
+                )
+            self._build(records, version)
+        return self
+
+    def _build(self, records: List[dict], version: str):
+        self.records = records
+        self.by_symbol = {r.get("symbol"): r for r in records}
+
+        sectors: Dict[str, List[int]] = {}
+        sub_sectors: Dict[str, List[int]] = {}
+        hierarchy: Dict[str, set] = {}
+        for position, record in enumerate(records):
+            sector = record.get("sector")
+            sub_sector = record.get("sub_sector")
+            sectors.setdefault(sector, []).append(position)
+            sub_sectors.setdefault(sub_sector, []).append(position)
+            if sector and sub_sector:
+                hierarchy.setdefault(sector, set()).add(sub_sector)
+
+        self.sectors = {k: np.array(v, dtype=np.intp) for k, v in sectors.items()}
+        self.sub_sectors = {
+            k: np.array(v, dtype=np.intp) for k, v in sub_sectors.items()
+        }
+        self.hierarchy = {k: sorted(v) for k, v in hierarchy.items()}
+
+        symbols_lower = [r.get("symbol", "").lower() for r in records]
+        self._symbols_lower = np.array(symbols_lower, dtype=str)
+        prefix = sorted(
+            (symbol, position) for position, symbol in enumerate(symbols_lower)
+        )
+        self._prefix_keys = [symbol for symbol, _ in prefix]
+        self._prefix_positions = [position for _, position in prefix]
+
+        self.filter_masks = {
+            filter_type: self._values(field) > FILTER_THRESHOLD
+            for filter_type, field in FILTER_STRATEGIES.items()
+        }
+
+        numeric_fields = {
+            field
+            for record in records
+            for field, value in record.items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+        }
+        self.sortable_fields = sorted(numeric_fields)
+
+        self._orderings = {}
+        strategies = [
+            field for field in stockAnalysis.load_strategy() if field in numeric_fields
+        ]
+        for field in strategies:
+            self.ordering(field, descending=True)
+
+        self.version = version
+        logger.info(
+            f"📇 Indexed {len(records)} stock scores across {len(self.sectors)} sectors "
+            f"(version {version})"
+        )
+
+    # ---------------------------------------------------------------
+    # Lookups
+    # ---------------------------------------------------------------
+    def _values(self, field: str) -> np.ndarray:
+        values = np.full(len(self.records), np.nan)
+        for position, record in enumerate(self.records):
+            value = record.get(field)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                values[position] = value
+        return values
+
+    def ordering(
+        self, field: Optional[str] = None, descending: bool = True
+    ) -> np.ndarray:
+        """Positions of all records sorted by a numeric field, missing values last."""
+        if field is None:
+            return np.arange(len(self.records), dtype=np.intp)
+
+        key = (field, descending)
+        if key not in self._orderings:
+            values = self._values(field)
+            present = np.flatnonzero(~np.isnan(values))
+            ranked = present[
+                np.argsort(
+                    -values[present] if descending else values[present], kind="stable"
+                )
+            ]
+            missing = np.flatnonzero(np.isnan(values))
+            self._orderings[key] = np.concatenate([ranked, missing]).astype(np.intp)
+        return self._orderings[key]
+
+    def symbols_with_prefix(self, prefix: str) -> List[int]:
+        """Positions of the symbols starting with prefix (case-insensitive)."""
+        prefix = prefix.lower()
+        start = bisect.bisect_left(self._prefix_keys, prefix)
+        end = bisect.bisect_left(self._prefix_keys, prefix + "￿")
+        return self._prefix_positions[start:end]
+
+    def candidates(
+        self,
+        sector: Optional[str] = None,
+        sub_sector: Optional[str] = None,
+        search: Optional[str] = None,
+        prefix: Optional[str] = None,
+        filter_type: Optional[str] = None,
+    ) -> Optional[np.ndarray]:
+        """Boolean mask of the records matching every filter, None when unfiltered."""
+        mask = None
+
+        def narrow(selected: np.ndarray):
+            nonlocal mask
+            mask = selected if mask is None else mask & selected
+
+        def from_positions(positions) -> np.ndarray:
+            selected = np.zeros(len(self.records), dtype=bool)
+            selected[positions] = True
+            return selected
+
+        if prefix:
+            narrow(from_positions(self.symbols_with_prefix(prefix)))
+        if search:
+            narrow(np.char.find(self._symbols_lower, search.lower()) >= 0)
+        if sector:
+            narrow(from_positions(self.sectors.get(sector, [])))
+        if sub_sector:
+            narrow(from_positions(self.sub_sectors.get(sub_sector, [])))
+        if filter_type in self.filter_masks:
+            narrow(self.filter_masks[filter_type])
+        return mask
+
+    # ---------------------------------------------------------------
+    # Paging
+    # ---------------------------------------------------------------
+    def encode_cursor(self, scan_from: int) -> str:
+        payload = json.dumps({"v": self.version, "o": scan_from}).encode()
+        return base64.urlsafe_b64encode(payload).decode()
+
+    def decode_cursor(self, cursor: str) -> int:
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            version, scan_from = payload["v"], int(payload["o"])
+        except (ValueError, KeyError, TypeError) as e:
+            raise CursorError("Invalid cursor") from e
+        if version != self.version:
+            raise CursorError("Cursor expired, the scores were refreshed")
+        return scan_from
+
+    def page(
+        self,
+        mask: Optional[np.ndarray],
+        ordering: np.ndarray,
+        limit: int,
+        scan_from: int = 0,
+    ) -> Tuple[List[dict], Optional[int]]:
+        """
+        Walk the ordering from scan_from and collect up to limit matching records.
+
+        Returns:
+            Tuple of (records, ordering position to resume from or None at the end)
+        """
+        page = []
+        position = scan_from
+        while position < len(ordering) and len(page) < limit:
+            record_position = ordering[position]
+            position += 1
+            if mask is None or mask[record_position]:
+                page.append(self.records[record_position])
+
+        # Resume at the next match so a cursor never points at an empty page
+        while (
+            position < len(ordering)
+            and mask is not None
+            and not mask[ordering[position]]
+        ):
+            position += 1
+        return page, (position if position < len(ordering) else None)
+
+    def offset_to_scan_position(
+        self, mask: Optional[np.ndarray], ordering: np.ndarray, offset: int
+    ) -> int:
+        """Ordering position of the offset-th matching record (for page numbers)."""
+        if mask is None:
+            return offset
+        matching = np.flatnonzero(mask[ordering])
+        return int(matching[offset]) if offset < len(matching) else len(ordering)
+
+
+# Global index instance, built on first use
+scoreIndex = ScoreIndex()
@@ -1,13 +1,21 @@
 import json
 import os
+import uuid
 from pathlib import Path
+from typing import Dict, List, NamedTuple
 
+import numpy as np
 import pandas as pd
 from sqlalchemy.orm import Session
 
-from utilities.common.base_fetcher import BaseFetcher
+from utilities.common.base_fetcher import BaseFetcher, _build_cache_key
+from utilities.common.lazy_singleton import LazySingleton
 from backend.services.db_services import get_db
 
+# Changes every time the scores are recomputed; readers that index the scores
+# in memory compare it to decide when to rebuild
+SCORES_VERSION_KEY = _build_cache_key("stock_scores_v1", "VERSION")
+
 METRIC_NAME_MAP = {
     "market_cap": "MarketCap",
     "pe_ratio": "PE",
@@ -82,60 +90,112 @@ def compute_sector_metrics(df: pd.DataFrame):
     return sector_metrics
 
 
+METRIC_ALIASES = {
+    "pb": ["pb_ratio"],
+    "pe": ["pe_ratio"],
+    "marketcap": ["market_cap"],
+    "peg": ["peg_ratio"],
+}
+
+
+class StrategyMatrix(NamedTuple):
+    """Strategies compiled against the columns of a frame."""
+
+    names: List[str]
+    columns: List[int]  # frame column position of each matrix row
+    weights: np.ndarray  # (len(columns), len(names)) signed weights
+    abs_weights: np.ndarray  # (len(columns), len(names)) absolute weights
+
+
+def compile_strategies(columns, strategies) -> StrategyMatrix:
+    """
+    Resolve every strategy metric to a column once and build the weight matrices.
+
+    A metric matches the first column whose lower-cased name, without
+    underscores, equals the metric name (or one of its aliases). Metrics
+    without a column are left out, as they never contributed to a score.
+    """
+    # Lower-cased name -> position of the last column with that name
+    lowered = {}
+    for position, column in enumerate(columns):
+        lowered[column.lower()] = position
+    cleaned = [(key.replace("_", ""), position) for key, position in lowered.items()]
+
+    names = list(strategies)
+    rows: Dict[int, int] = {}
+    entries = []
+    for strat_index, strat_info in enumerate(strategies.values()):
+        for metric, weight in strat_info.get("metrics", {}).items():
+            metric_l = metric.lower().replace("_", "")
+            position = next(
+                (
+                    position
+                    for key_clean, position in cleaned
+                    if key_clean == metric_l
+                    or key_clean in METRIC_ALIASES.get(metric_l, [])
+                ),
+                None,
+            )
+            if position is not None:
+                row = rows.setdefault(position, len(rows))
+                entries.append((row, strat_index, weight))
+
+    weights = np.zeros((len(rows), len(names)))
+    abs_weights = np.zeros((len(rows), len(names)))
+    for row, strat_index, weight in entries:
+        weights[row, strat_index] += weight
+        abs_weights[row, strat_index] += abs(weight)
+
+    return StrategyMatrix(names, list(rows), weights, abs_weights)
+
+
+def _numeric_matrix(df: pd.DataFrame, positions: List[int]) -> np.ndarray:
+    """Metric values as floats, NaN where a value is missing or not a number."""
+    values = np.full((len(df), len(positions)), np.nan)
+    for i, position in enumerate(positions):
+        column = df.iloc[:, position]
+        if pd.api.types.is_numeric_dtype(column) or pd.api.types.is_bool_dtype(column):
+            values[:, i] = column.to_numpy(dtype=float, na_value=np.nan)
+        else:
+            values[:, i] = [
+                float(v) if isinstance(v, (int, float)) else np.nan for v in column
+            ]
+    return values
+
+
 def calculate_strategy_scores(normalized_df, strategies, original_df=None):
     """
     Calculates overall scores and merges real fundamentals if provided.
+
+    Each strategy score is the weighted mean of its metrics, skipping metrics a
+    stock has no value for. All stocks and strategies are scored with one
+    matrix multiply.
     """
-    results = []
-
-    for _, row in normalized_df.iterrows():
-        stock_data = {
-            k.lower(): v for k, v in row.items()
-        }  # normalize keys to lowercase
-        stock_symbol = row.get("symbol", "")
-        stock_sector = row.get("sector", "")
-        stock_subsector = row.get("sub_sector", "")
-        stock_scores = {}
-
-        for strat_name, strat_info in strategies.items():
-            metrics = strat_info.get("metrics", {})
-            total_score = 0.0
-            total_weight = 0.0
-
-            aliases = {
-                "pb": ["pb_ratio"],
-                "pe": ["pe_ratio"],
-                "marketcap": ["market_cap"],
-                "peg": ["peg_ratio"],
-            }
-
-            for metric, weight in metrics.items():
-                metric_l = metric.lower().replace("_", "")
-                val = None
-                for key in stock_data.keys():
-                    key_clean = key.replace("_", "").lower()
-                    if key_clean == metric_l or key_clean in aliases.get(metric_l, []):
-                        val = stock_data[key]
-                        break
-
-                if isinstance(val, (int, float)) and not pd.isna(val):
-                    total_score += val * weight
-                    total_weight += abs(weight)
-
-            final_score = total_score / total_weight if total_weight != 0 else 0.0
-            stock_scores[strat_name] = final_score
-
-        results.append(
-            {
-                "symbol": stock_symbol,
-                "sector": stock_sector,
-                "sub_sector": stock_subsector,
-                **stock_scores,
-            }
-        )
+    compiled = compile_strategies(list(normalized_df.columns), strategies)
+    values = _numeric_matrix(normalized_df, compiled.columns)
+    present = ~np.isnan(values)
+
+    total_score = np.where(present, values, 0.0) @ compiled.weights
+    total_weight = present.astype(float) @ compiled.abs_weights
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.where(total_weight != 0, total_score / total_weight, 0.0)
+
+    def column_or_blank(name):
+        if name in normalized_df.columns:
+            return normalized_df[name].to_numpy()
+        return [""] * len(normalized_df)
+
+    results = pd.DataFrame(
+        {
+            "symbol": column_or_blank("symbol"),
+            "sector": column_or_blank("sector"),
+            "sub_sector": column_or_blank("sub_sector"),
+        }
+    )
+    for i, strat_name in enumerate(compiled.names):
+        results[strat_name] = scores[:, i]
 
-    # Convert to DataFrame
-    scores_df = pd.DataFrame(results)
+    scores_df = results
 
     # ✅ Merge back real (non-normalized) fundamentals
     if original_df is not None:
@@ -217,81 +277,14 @@ class StockAnalysis(BaseFetcher):
             return json.load(f)["strategy"]
 
     def fetch_data(self):
-        """Fetches valuable stock data, flattens JSON, and returns a clean DataFrame."""
-        from sqlalchemy import text
-
-        query = text("""
-            SELECT *
-            FROM (
-                SELECT
-                    symbol, sector, sub_sector, market_cap, pe_ratio, pb_ratio,
-                    peg_ratio, roe, roce, debt_to_equity, promoter_holding,
-                    ebitda_margin, ev_ebitda, extra_metrics,
-                    created_at,
-                    ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY created_at DESC) AS rn
-                FROM stocks_valuable_data
-            ) t
-            WHERE rn = 1
-        """)
-
-        df = pd.read_sql(query, self.db.bind)
-
-        # Prepare list to hold processed rows
-        rows = []
-
-        for _, r in df.iterrows():
-            row_dict = {
-                "symbol": r["symbol"],
-                "sector": r["sector"],
-                "sub_sector": r["sub_sector"],
-                "market_cap": r["market_cap"],
-                "pe_ratio": r["pe_ratio"],
-                "pb_ratio": r["pb_ratio"],
-                "peg_ratio": r["peg_ratio"],
-                "roe": r["roe"],
-                "roce": r["roce"],
-                "debt_to_equity": r["debt_to_equity"],
-                "promoter_holding": r["promoter_holding"],
-                "ebitda_margin": r["ebitda_margin"],
-                "ev_ebitda": r["ev_ebitda"],
-            }
-
-            # Safely parse the JSON field
-            try:
-                if isinstance(r["extra_metrics"], str):
-                    extra = json.loads(r["extra_metrics"])
-                elif isinstance(r["extra_metrics"], dict):
-                    extra = r["extra_metrics"]
-                else:
-                    extra = {}
-            except Exception as e:
-                self.logger.error(
-                    "⚠️ Failed to parse extra_metrics for {} : {}", r["symbol"], e
-                )
-                extra = {}
-
-            # Flatten nested metrics (e.g. liquidity_current_ratio)
-            extra_flat = flatten_json(extra)
-
-            # Map to clean names
-            for old_key, new_key in EXTRA_METRIC_MAP.items():
-                if old_key in extra_flat:
-                    row_dict[new_key] = extra_flat[old_key]
-
-            # Add all remaining extra fields (unmapped)
-            for k, v in extra_flat.items():
-                if k not in EXTRA_METRIC_MAP:
-                    row_dict[k] = v
-
-            rows.append(row_dict)
-
-        # Convert to DataFrame
-        final_df = pd.DataFrame(rows)
-
-        # Replace NaN or None with 0.0 for numeric processing
-        final_df = final_df.fillna(0.0)
-
-        return final_df
+        """Returns the latest fundamentals of every stock as a clean DataFrame.
+
+        Reads the latest-snapshot table, whose extra metrics are flattened when
+        the fundamentals are written.
+        """
+        from utilities.analytics.fundamentals_store import load_latest_fundamentals
+
+        return load_latest_fundamentals(self.db)
 
     def normalize_within_sector(self, df, sector_metrics, output_file=None):
         """
@@ -300,33 +293,31 @@ class StockAnalysis(BaseFetcher):
         df["sector"] = df["sector"].astype(str).str.strip()
         sector_metrics.index = sector_metrics.index.map(lambda x: str(x).strip())
 
-        norm_rows = []
-
-        for _, row in df.iterrows():
-            sector = row.get("sector")
-            if sector not in sector_metrics.index:
-                continue
-
-            norm_row = row.copy()
-            sector_data = sector_metrics.loc[sector]
-
-            # Iterate over each metric in the MultiIndex columns
-            for col in sector_data.index.levels[0]:
-                if col not in df.columns:
-                    continue
-
-                mean_val = sector_data[(col, "mean")]
-                std_val = sector_data[(col, "std")] or 1.0
-
-                val = row.get(col, 0.0)
-                if pd.notnull(val):
-                    norm_row[col] = (val - mean_val) / std_val
-                else:
-                    norm_row[col] = 0.0
-
-            norm_rows.append(norm_row)
+        # Stocks in sectors without stats are dropped
+        norm_df = df[df["sector"].isin(sector_metrics.index)].copy()
+        metrics = [
+            col
+            for col in sector_metrics.columns.get_level_values(0).unique()
+            if col in norm_df.columns
+        ]
 
-        norm_df = pd.DataFrame(norm_rows)
+        if metrics and not norm_df.empty:
+            # Broadcast the passed sector stats onto each stock's row
+            stats = sector_metrics[~sector_metrics.index.duplicated()]
+            sectors = norm_df["sector"]
+            mean = stats.xs("mean", axis=1, level=1)[metrics].reindex(sectors)
+            # A sector with a single stock or identical values has no spread
+            std = (
+                stats.xs("std", axis=1, level=1)[metrics]
+                .reindex(sectors)
+                .fillna(0.0)
+                .replace(0.0, 1.0)
+            )
+            values = norm_df[metrics]
+            normalized = (values.to_numpy() - mean.to_numpy()) / std.to_numpy()
+            norm_df[metrics] = pd.DataFrame(
+                normalized, index=norm_df.index, columns=metrics
+            ).where(values.notna(), 0.0)
 
         if output_file:
             norm_df.to_json(output_file, orient="records")
@@ -344,7 +335,14 @@ class StockAnalysis(BaseFetcher):
 
 
 # Global configuration instance
-stockAnalysis = StockAnalysis()
+stockAnalysis = LazySingleton(StockAnalysis)
+
+
+def publish_scores_version(redis_client, ttl_seconds: int) -> str:
+    """Mark freshly cached scores with a new version."""
+    version = uuid.uuid4().hex
+    redis_client.setex(SCORES_VERSION_KEY, ttl_seconds, version)
+    return version
 
 
 def get_stock_score():
@@ -380,5 +378,8 @@ def get_stock_score():
     stockAnalysis.redis_client.setex(
         cache_key, stockAnalysis.cache_expiry_in_seconds, serialized
     )
+    publish_scores_version(
+        stockAnalysis.redis_client, stockAnalysis.cache_expiry_in_seconds
+    )
     stockAnalysis.logger.info("Cached Top_500_Stocks scores in Redis")
     return result
@@ -1,16 +1,25 @@
+import hashlib
 import os
 from datetime import datetime
 from pathlib import Path
+from typing import Dict, List, Optional
 
 import numpy as np
 import pandas as pd
 from rapidfuzz import process, fuzz
 from sqlalchemy.orm import Session
 
-from backend.models.investments.analytics import StocksValuableData, StockList
+from backend.common import change_events
+from backend.models.investments.analytics import (
+    StocksValuableData,
+    StockList,
+    StockSymbolAlias,
+)
 from backend.services.db_services import get_db
+from utilities.analytics import fundamentals_store
 from utilities.analytics.sector_mapping import SECTOR_MAP
-from utilities.common.base_fetcher import BaseFetcher
+from utilities.common.base_fetcher import BaseFetcher, _build_cache_key
+from utilities.common.lazy_singleton import LazySingleton
 
 ROOT_DIR = Path(__file__).resolve().parents[2]
 FILE_LOCATION = ROOT_DIR / "backend" / "files" / "stocks"
@@ -20,6 +29,14 @@ OUTPUT_CSV = os.path.join(FILE_LOCATION, "Merged_List_of_500_Stocks.csv")
 TICKER_TAPE_CSV = os.path.join(FILE_LOCATION, "Ticker_Tape_Data.csv")
 FINAL_OUTPUT_CSV = os.path.join(FILE_LOCATION, "Final_Merged_List_of_500_Stocks.csv")
 
+# Minimum rapidfuzz token_sort_ratio for a company name to match a ticker name
+FUZZY_SCORE_CUTOFF = 80
+
+# Redis hash of input CSV file name -> SHA-256 of the content last processed
+INPUT_MANIFEST_KEY = _build_cache_key("stock_merge", "INPUT_MANIFEST")
+
+_alias_table_ready = False
+
 
 def enrich_with_sector(df: pd.DataFrame) -> pd.DataFrame:
     """Map sub-sectors to major sectors."""
@@ -78,71 +95,172 @@ def clean_numeric_value(value):
     return value
 
 
+def clean_numeric_column(series: pd.Series) -> pd.Series:
+    """Column-wise clean_numeric_value: floats, NaN where the value is missing or a placeholder."""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype(float)
+    text = (
+        series.astype("string")
+        .str.strip()
+        .str.replace(",", "", regex=False)
+        .str.replace("%", "", regex=False)
+    )
+    return pd.to_numeric(text, errors="coerce").astype(float)
+
+
+def _numeric_column(df: pd.DataFrame, column: str) -> np.ndarray:
+    """Cleaned values of a CSV column as Python floats, None where missing."""
+    if column not in df.columns:
+        return np.full(len(df), None, dtype=object)
+    values = clean_numeric_column(df[column])
+    return values.astype(object).where(values.notna(), None).to_numpy()
+
+
+# stocks_valuable_data column -> Tickertape CSV column
+VALUABLE_COLUMNS = {
+    "market_cap": "↓market cap",
+    "close_price": "close price",
+    "pe_ratio": "pe ratio",
+    "pb_ratio": "pb ratio",
+    "roe": "return on equity",
+    "roce": "roce",
+    "debt_to_equity": "debt to equity",
+    "promoter_holding": "promoter holding",
+    "ebitda_margin": "ebitda margin",
+    "ev_ebitda": "ev/ebitda ratio",
+}
+
+# extra_metrics group -> metric -> Tickertape CSV column
+EXTRA_METRIC_COLUMNS = {
+    "growth": {
+        "eps_growth_1y": "1y historical eps growth",
+        "eps_growth_5y": "5y historical eps growth",
+        "revenue_growth_1y": "1y historical revenue growth",
+        "revenue_growth_5y": "5y historical revenue growth",
+        "200_days_ema": "200d ema",
+        "200_days_sma": "200d sma",
+        "total_revenue": "total revenue",
+    },
+    "valuation": {
+        "price_to_sales": "price / sales",
+        "price_to_cfo": "price / cfo",
+        "ev_ebitda": "ev/ebitda ratio",
+        "book_value": "book value",
+        "pe_ratio": "pe ratio",
+        "pb_ratio": "pb ratio",
+        "sector_pe": "sector pe",
+        "sector_pb": "sector pb",
+        "sector_dividend_yield": "sector dividend yield",
+        "total_assets": "total assets",
+        "enterprise_value": "enterprise value",
+    },
+    "profitability": {
+        "roi": "return on investment",
+        "net_profit_margin": "net profit margin",
+        "ebitda_margin": "ebitda margin",
+        "earning_power": "earning power",
+        "ebitda": "ebitda",
+        "eps": "earnings per share",
+        "net_income": "net income",
+        "asset_turnover_ratio": "asset turnover ratio",
+        "5y_avg_ebitda_margin": "5y average ebitda margin",
+        "5y_cagr": "5y cagr",
+    },
+    "ownership": {
+        "promoter_holding": "promoter holding",
+        "promoter_holding_change_3m": "promoter holding change\xa0–\xa03m",
+        "dii_holding": "domestic institutional holding",
+        "fii_holding": "foreign institutional holding",
+    },
+    "liquidity": {
+        "quick_ratio": "quick ratio",
+        "current_ratio": "current ratio",
+        "interest_coverage_ratio": "interest coverage ratio",
+        "debt_to_equity": "debt to equity",
+        "total_debt": "total debt",
+        "free_cash_flow": "free cash flow",
+        "financing_cash_flow": "financing cash flow",
+        "cash_flow_margin": "cash flow margin",
+        "operating_cash_flow": "operating cash flow",
+    },
+    "market": {
+        "dividend_yield": "dividend yield",
+        "sharpe_ratio": "sharpe ratio",
+        "1m_return": "1m return",
+        "1d_return": "1d return",
+    },
+}
+
+
 def _build_extra_metrics(row):
     """Build nested JSON metrics structure for DB insertion."""
+    return {
+        group: {
+            metric: clean_numeric_value(row.get(column))
+            for metric, column in fields.items()
+        }
+        for group, fields in EXTRA_METRIC_COLUMNS.items()
+    }
 
-    def val(key):
-        return clean_numeric_value(row.get(key))
 
-    return {
-        "growth": {
-            "eps_growth_1y": val("1y historical eps growth"),
-            "eps_growth_5y": val("5y historical eps growth"),
-            "revenue_growth_1y": val("1y historical revenue growth"),
-            "revenue_growth_5y": val("5y historical revenue growth"),
-            "200_days_ema": val("200d ema"),
-            "200_days_sma": val("200d sma"),
-            "total_revenue": val("total revenue"),
-        },
-        "valuation": {
-            "price_to_sales": val("price / sales"),
-            "price_to_cfo": val("price / cfo"),
-            "ev_ebitda": val("ev/ebitda ratio"),
-            "book_value": val("book value"),
-            "pe_ratio": val("pe ratio"),
-            "pb_ratio": val("pb ratio"),
-            "sector_pe": val("sector pe"),
-            "sector_pb": val("sector pb"),
-            "sector_dividend_yield": val("sector dividend yield"),
-            "total_assets": val("total assets"),
-            "enterprise_value": val("enterprise value"),
-        },
-        "profitability": {
-            "roi": val("return on investment"),
-            "net_profit_margin": val("net profit margin"),
-            "ebitda_margin": val("ebitda margin"),
-            "earning_power": val("earning power"),
-            "ebitda": val("ebitda"),
-            "eps": val("earnings per share"),
-            "net_income": val("net income"),
-            "asset_turnover_ratio": val("asset turnover ratio"),
-            "5y_avg_ebitda_margin": val("5y average ebitda margin"),
-            "5y_cagr": val("5y cagr"),
-        },
-        "ownership": {
-            "promoter_holding": val("promoter holding"),
-            "promoter_holding_change_3m": val("promoter holding change\xa0–\xa03m"),
-            "dii_holding": val("domestic institutional holding"),
-            "fii_holding": val("foreign institutional holding"),
-        },
-        "liquidity": {
-            "quick_ratio": val("quick ratio"),
-            "current_ratio": val("current ratio"),
-            "interest_coverage_ratio": val("interest coverage ratio"),
-            "debt_to_equity": val("debt to equity"),
-            "total_debt": val("total debt"),
-            "free_cash_flow": val("free cash flow"),
-            "financing_cash_flow": val("financing cash flow"),
-            "cash_flow_margin": val("cash flow margin"),
-            "operating_cash_flow": val("operating cash flow"),
-        },
-        "market": {
-            "dividend_yield": val("dividend yield"),
-            "sharpe_ratio": val("sharpe ratio"),
-            "1m_return": val("1m return"),
-            "1d_return": val("1d return"),
-        },
+def _build_extra_metrics_frame(df: pd.DataFrame) -> list:
+    """_build_extra_metrics for every row of df, cleaning each column once."""
+    columns = {
+        column: _numeric_column(df, column)
+        for fields in EXTRA_METRIC_COLUMNS.values()
+        for column in fields.values()
     }
+    return [
+        {
+            group: {metric: columns[column][i] for metric, column in fields.items()}
+            for group, fields in EXTRA_METRIC_COLUMNS.items()
+        }
+        for i in range(len(df))
+    ]
+
+
+def file_digest(file_path, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _ensure_alias_table(db: Session):
+    global _alias_table_ready
+    if not _alias_table_ready:
+        StockSymbolAlias.__table__.create(bind=db.get_bind(), checkfirst=True)
+        _alias_table_ready = True
+
+
+def _load_aliases(db: Session) -> Dict[str, StockSymbolAlias]:
+    """Saved fuzzy matches keyed by symbol."""
+    _ensure_alias_table(db)
+    return {alias.symbol: alias for alias in db.query(StockSymbolAlias)}
+
+
+def _save_aliases(db: Session, aliases: List[dict]):
+    """Insert or refresh fuzzy matches; committed with the merged stock rows."""
+    if not aliases:
+        return
+    _ensure_alias_table(db)
+    now = datetime.now()
+    existing = {
+        symbol
+        for (symbol,) in db.query(StockSymbolAlias.symbol).filter(
+            StockSymbolAlias.symbol.in_([a["symbol"] for a in aliases])
+        )
+    }
+    rows = [{**alias, "last_updated": now} for alias in aliases]
+    inserts = [row for row in rows if row["symbol"] not in existing]
+    updates = [row for row in rows if row["symbol"] in existing]
+    if inserts:
+        db.bulk_insert_mappings(StockSymbolAlias, inserts)
+    if updates:
+        db.bulk_update_mappings(StockSymbolAlias, updates)
+    db.flush()
 
 
 class StockMerger(BaseFetcher):
@@ -159,17 +277,37 @@ class StockMerger(BaseFetcher):
         self.logger.debug("Stock merger initialized")
         self.db: Session = next(get_db())
 
-    def is_recently_modified(self, file_path, hours=48):
-        """Check if a file was modified in the last XX hours."""
-        if not os.path.exists(file_path):
-            self.logger.info("❌ Missing CSV Files.")
-            return False
+    def _changed_inputs(self, *file_paths, force: bool = False) -> Optional[Dict[str, str]]:
+        """Content digests of the input files if any of them changed since it was last processed.
 
-        mod_time = os.path.getmtime(file_path)
-        self.logger.info("✅ Last modified: %s", datetime.fromtimestamp(mod_time))
-        return (
-                datetime.now() - datetime.fromtimestamp(mod_time)
-        ).total_seconds() < hours * 3600
+        Args:
+            file_paths: Input CSV files
+            force: Return the digests even if nothing changed
+
+        Returns:
+            {file name: digest} to record once the inputs are processed, or None
+            when a file is missing or none of them changed
+        """
+        digests = {}
+        for file_path in file_paths:
+            if not os.path.exists(file_path):
+                self.logger.info(f"❌ Missing CSV File: {file_path}")
+                return None
+            digests[os.path.basename(file_path)] = file_digest(file_path)
+
+        recorded = self.redis_client.hmget(INPUT_MANIFEST_KEY, list(digests))
+        changed = [
+            name for name, old in zip(digests, recorded) if old != digests[name]
+        ]
+        if not changed and not force:
+            return None
+        if changed:
+            self.logger.info(f"✅ Changed inputs: {', '.join(changed)}")
+        return digests
+
+    def _record_inputs(self, digests: Dict[str, str]):
+        """Mark input digests as processed."""
+        self.redis_client.hset(INPUT_MANIFEST_KEY, mapping=digests)
 
     def _load_and_normalize_data(self):
         """Load and normalize stock data from CSV files.
@@ -204,19 +342,23 @@ class StockMerger(BaseFetcher):
 
         return merged_list, ticker_data
 
-    def _merge_dataframes(self, merged_list, ticker_data):
+    def _merge_dataframes(self, merged_list, ticker_data, db: Optional[Session] = None):
         """Merge stock list with ticker data.
 
-        Performs fuzzy matching on company names to merge stock symbols with
-        their corresponding ticker tape data.
+        Matches company names exactly on the normalized name first. Symbols that
+        stay unmatched reuse their saved alias, and the rest are fuzzy matched
+        against every ticker name in one batched rapidfuzz cdist call; new
+        fuzzy matches are saved as aliases for the next run.
 
         Args:
             merged_list: DataFrame with stock symbols and company names
             ticker_data: DataFrame with ticker tape fundamental data
+            db: Database session holding the alias table (defaults to the merger's)
 
         Returns:
             Merged DataFrame with stock data and fundamentals
         """
+        db = db or self.db
         final_df = pd.merge(
             merged_list,
             ticker_data,
@@ -225,26 +367,70 @@ class StockMerger(BaseFetcher):
             suffixes=("", "_ticker"),
         )
 
-        unmatched_mask = final_df["name"].isna()
-        if unmatched_mask.sum() > 0:
-            self.logger.info(f"🔍 Fuzzy matching {unmatched_mask.sum()} unmatched...")
+        unmatched = final_df.index[final_df["name"].isna()]
+        if len(unmatched) > 0:
+            self.logger.info(f"🔍 Fuzzy matching {len(unmatched)} unmatched...")
             ticker_names = ticker_data["normalized_name"].tolist()
-            for idx in final_df[unmatched_mask].index:
-                query = final_df.loc[idx, "normalized_name"]
+            # First ticker row of every name, the row a name match resolves to
+            name_to_row = {}
+            for position, name in enumerate(ticker_names):
+                name_to_row.setdefault(name, position)
+
+            aliases = _load_aliases(db)
+            matched_index, matched_rows, to_search = [], [], []
+            for idx in unmatched:
+                query = final_df.at[idx, "normalized_name"]
                 if not query:
                     continue
-                match = process.extractOne(
-                    query, ticker_names, scorer=fuzz.token_sort_ratio, score_cutoff=80
+                alias = aliases.get(final_df.at[idx, "symbol"])
+                if alias and alias.company_name == query and alias.ticker_name in name_to_row:
+                    matched_index.append(idx)
+                    matched_rows.append(name_to_row[alias.ticker_name])
+                else:
+                    to_search.append(idx)
+
+            new_aliases = []
+            if to_search and ticker_names:
+                queries = final_df.loc[to_search, "normalized_name"].tolist()
+                scores = process.cdist(
+                    queries,
+                    ticker_names,
+                    scorer=fuzz.token_sort_ratio,
+                    score_cutoff=FUZZY_SCORE_CUTOFF,
+                    workers=-1,
                 )
-                if match:
-                    best_name, score, _ = match
-                    ticker_row = ticker_data[
-                        ticker_data["normalized_name"] == best_name
-                        ].iloc[0]
-                    for col in ticker_data.columns:
-                        if col != "normalized_name" and col in final_df.columns:
-                            final_df.loc[idx, col] = ticker_row[col]
-                    self.logger.info(f" ✓ {query} → {best_name} (score {score})")
+                best = scores.argmax(axis=1)
+                best_scores = scores[np.arange(len(best)), best]
+                for idx, query, position, score in zip(to_search, queries, best, best_scores):
+                    if score < FUZZY_SCORE_CUTOFF:
+                        continue
+                    best_name = ticker_names[position]
+                    matched_index.append(idx)
+                    matched_rows.append(name_to_row[best_name])
+                    new_aliases.append(
+                        {
+                            "symbol": final_df.at[idx, "symbol"],
+                            "company_name": query,
+                            "ticker_name": best_name,
+                            "score": float(score),
+                        }
+                    )
+                    self.logger.info(f" ✓ {query} → {best_name} (score {score:.1f})")
+
+            if matched_index:
+                columns = [
+                    col
+                    for col in ticker_data.columns
+                    if col != "normalized_name" and col in final_df.columns
+                ]
+                final_df.loc[matched_index, columns] = (
+                    ticker_data.iloc[matched_rows][columns].to_numpy()
+                )
+                self.logger.info(
+                    f"🔗 Matched {len(matched_index)} names "
+                    f"({len(matched_index) - len(new_aliases)} from saved aliases)"
+                )
+            _save_aliases(db, new_aliases)
 
         final_df.drop(columns=["normalized_name"], errors="ignore", inplace=True)
         return final_df
@@ -277,133 +463,157 @@ class StockMerger(BaseFetcher):
     def _insert_into_database(self, final_df, db: Session):
         """Insert merged stock data into database.
 
-        Inserts or updates stock valuable data in the database, including
-        fundamental metrics and extra metrics.
+        Upserts stock_list and today's stocks_valuable_data rows, including
+        fundamental metrics and extra metrics. Existing rows are prefetched in
+        two queries, values are cleaned column-wise and the writes go out as
+        bulk INSERT / UPDATE statements in a single transaction.
 
         Args:
             final_df: Merged DataFrame with stock data to insert
             db: Database session
         """
         final_df = final_df.replace({np.nan: None, "nan": None, "NaN": None})
-        stocks_added = stocks_updated = valuable_added = 0
         errors = []
 
-        for idx, row in final_df.iterrows():
-            try:
-                symbol = row.get("symbol")
-                company_name = row.get("name of company")
-                name = row.get("name")
-                if not symbol or pd.isna(symbol):
-                    errors.append(
-                        f"Row {idx}: Missing symbol (Name: {row.get('name of company', 'Unknown')})"
-                    )
-                    continue
-
-                if not name or pd.isna(name):
-                    self.logger.warning(
-                        f"Row {idx}: Symbol {symbol} has no ticker data match, skipping valuable data"
-                    )
+        symbols = final_df.get("symbol", pd.Series(None, index=final_df.index))
+        missing = symbols.isna() | (symbols.astype(str).str.strip() == "")
+        company_names = final_df.get(
+            "name of company", pd.Series("Unknown", index=final_df.index)
+        )
+        for idx in final_df.index[missing]:
+            errors.append(f"Row {idx}: Missing symbol (Name: {company_names[idx]})")
+
+        if (symbols == "NIFTY 500").any():
+            self.logger.info("Skipping index entry: NIFTY 500")
+        rows = final_df[~missing & (symbols != "NIFTY 500")]
+        # A symbol listed twice keeps its last row
+        rows = rows.drop_duplicates(subset="symbol", keep="last").reset_index(drop=True)
+        records = rows.to_dict("records")
+
+        now = datetime.now()
+        today = datetime.combine(now.date(), datetime.min.time())
+        symbol_list = rows["symbol"].tolist()
+        existing_stocks = {}
+        for stock in db.query(
+            StockList.id, StockList.symbol, StockList.name, StockList.sector, StockList.sub_sector
+        ).filter(StockList.symbol.in_(symbol_list)):
+            existing_stocks.setdefault(stock.symbol, stock)
+        existing_valuable = {}
+        for valuable in db.query(
+            StocksValuableData.id,
+            StocksValuableData.symbol,
+            StocksValuableData.sector,
+            StocksValuableData.sub_sector,
+            StocksValuableData.created_at,
+        ).filter(
+            StocksValuableData.symbol.in_(symbol_list), StocksValuableData.date == today
+        ):
+            existing_valuable.setdefault(valuable.symbol, valuable)
+
+        numeric = {
+            field: _numeric_column(rows, column)
+            for field, column in VALUABLE_COLUMNS.items()
+        }
+        pe = np.array(numeric["pe_ratio"], dtype=float)
+        eps_growth = np.array(
+            _numeric_column(rows, "1y historical eps growth"), dtype=float
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            peg = np.where(eps_growth > 0, pe / eps_growth, np.nan)
+        numeric["peg_ratio"] = [None if np.isnan(v) else float(v) for v in peg]
+        extra_metrics = _build_extra_metrics_frame(rows)
+
+        stock_inserts, stock_updates = [], []
+        valuable_inserts, valuable_updates, snapshots = [], [], []
+        for i, row in enumerate(records):
+            symbol = row["symbol"]
+            company_name = row.get("name of company")
+            sector = row.get("sector")
+            sub_sector = row.get("sub-sector")
+
+            stock = existing_stocks.get(symbol)
+            if stock is None:
+                stock_inserts.append(
+                    {
+                        "symbol": symbol,
+                        "name": company_name,
+                        "sector": sector or "Unknown",
+                        "sub_sector": sub_sector or "Unknown",
+                        "is_active": True,
+                        "last_updated": now,
+                    }
+                )
+            else:
+                update = {
+                    "id": stock.id,
+                    "sector": sector or stock.sector,
+                    "sub_sector": sub_sector or stock.sub_sector,
+                    "last_updated": now,
+                }
+                if company_name and (not stock.name or stock.name == "Unknown"):
+                    update["name"] = company_name
+                stock_updates.append(update)
+
+            if not row.get("name"):
+                self.logger.warning(
+                    f"Row {i}: Symbol {symbol} has no ticker data match, skipping valuable data"
+                )
+                continue
 
-                if symbol == "NIFTY 500":
-                    self.logger.info(f"Skipping index entry: {symbol}")
-                    continue
+            values = {field: column[i] for field, column in numeric.items()}
+            values.update(
+                extra_metrics=extra_metrics[i], updated_flag=True, last_updated=now
+            )
+            existing = existing_valuable.get(symbol)
+            if existing is None:
+                values.update(
+                    symbol=symbol,
+                    sector=sector or "Unknown",
+                    sub_sector=sub_sector or "Unknown",
+                    date=today,
+                    created_at=now,
+                )
+                valuable_inserts.append(values)
+                snapshots.append(values)
+            else:
+                valuable_updates.append({"id": existing.id, **values})
+                snapshots.append(
+                    {
+                        **values,
+                        "symbol": symbol,
+                        "sector": existing.sector,
+                        "sub_sector": existing.sub_sector,
+                        "date": today,
+                        "created_at": existing.created_at,
+                    }
+                )
 
-                stock = db.query(StockList).filter_by(symbol=symbol).first()
-                if not stock:
-                    stock = StockList(
-                        symbol=symbol,
-                        name=company_name,
-                        sector=row.get("sector") or "Unknown",
-                        sub_sector=row.get("sub-sector") or "Unknown",
-                        is_active=True,
-                        last_updated=datetime.now(),
-                    )
-                    db.add(stock)
-                    stocks_added += 1
-                else:
-                    if company_name and (not stock.name or stock.name == "Unknown"):
-                        stock.name = company_name
-                    stock.sector = row.get("sector") or stock.sector
-                    stock.sub_sector = row.get("sub-sector") or stock.sub_sector
-                    stock.last_updated = datetime.now()
-                    stocks_updated += 1
-
-                if name:
-                    today = datetime.now().date()
-                    existing = (
-                        db.query(StocksValuableData)
-                        .filter_by(symbol=symbol, date=today)
-                        .first()
-                    )
-                    metrics = _build_extra_metrics(row)
-                    eps_growth = clean_numeric_value(
-                        row.get("1y historical eps growth")
-                    )
-                    pe = clean_numeric_value(row.get("pe ratio"))
-                    peg = (pe / eps_growth) if eps_growth and eps_growth > 0 else None
-
-                    if existing:
-                        existing.market_cap = clean_numeric_value(
-                            row.get("↓market cap")
-                        )
-                        existing.close_price = clean_numeric_value(
-                            row.get("close price")
-                        )
-                        existing.pe_ratio = pe
-                        existing.pb_ratio = clean_numeric_value(row.get("pb ratio"))
-                        existing.peg_ratio = peg
-                        existing.roe = clean_numeric_value(row.get("return on equity"))
-                        existing.roce = clean_numeric_value(row.get("roce"))
-                        existing.debt_to_equity = clean_numeric_value(
-                            row.get("debt to equity")
-                        )
-                        existing.promoter_holding = clean_numeric_value(
-                            row.get("promoter holding")
-                        )
-                        existing.ebitda_margin = clean_numeric_value(
-                            row.get("ebitda margin")
-                        )
-                        existing.ev_ebitda = clean_numeric_value(
-                            row.get("ev/ebitda ratio")
-                        )
-                        existing.extra_metrics = metrics
-                        existing.updated_flag = True
-                        existing.last_updated = datetime.now()
-                    else:
-                        valuable = StocksValuableData(
-                            symbol=symbol,
-                            sector=row.get("sector") or "Unknown",
-                            sub_sector=row.get("sub-sector") or "Unknown",
-                            date=today,
-                            market_cap=clean_numeric_value(row.get("↓market cap")),
-                            close_price=clean_numeric_value(row.get("close price")),
-                            pe_ratio=pe,
-                            pb_ratio=clean_numeric_value(row.get("pb ratio")),
-                            peg_ratio=peg,
-                            roe=clean_numeric_value(row.get("return on equity")),
-                            roce=clean_numeric_value(row.get("roce")),
-                            debt_to_equity=clean_numeric_value(
-                                row.get("debt to equity")
-                            ),
-                            promoter_holding=clean_numeric_value(
-                                row.get("promoter holding")
-                            ),
-                            ebitda_margin=clean_numeric_value(row.get("ebitda margin")),
-                            ev_ebitda=clean_numeric_value(row.get("ev/ebitda ratio")),
-                            extra_metrics=metrics,
-                            updated_flag=True,
-                            created_at=datetime.now(),
-                            last_updated=datetime.now(),
-                        )
-                        db.add(valuable)
-                        valuable_added += 1
-
-            except Exception as e:
-                errors.append(f"Row {idx} ({symbol}): {str(e)}")
+        # stock_list first, stocks_valuable_data references its symbols.
+        # render_nulls keeps rows with different missing values in one executemany
+        if stock_inserts:
+            db.bulk_insert_mappings(StockList, stock_inserts)
+        if stock_updates:
+            db.bulk_update_mappings(StockList, stock_updates)
+        if valuable_inserts:
+            db.bulk_insert_mappings(
+                StocksValuableData, valuable_inserts, render_nulls=True
+            )
+        if valuable_updates:
+            db.bulk_update_mappings(StocksValuableData, valuable_updates)
+        snapshot_mappings = fundamentals_store.record_snapshots(db, snapshots)
 
         db.commit()
+        try:
+            fundamentals_store.archive_snapshots(snapshot_mappings)
+        except Exception as e:
+            # The archive is a copy; never fail the DB write because of it
+            self.logger.error(
+                f"❌ Failed to archive fundamentals snapshots: {e}", exc_info=True
+            )
+        change_events.publish(change_events.STOCK_FUNDAMENTALS, "refresh")
         self.logger.info(
-            f"\n✅ DB update done | Added: {stocks_added}, Updated: {stocks_updated}, Valuable: {valuable_added}"
+            f"\n✅ DB update done | Added: {len(stock_inserts)}, Updated: {len(stock_updates)}, "
+            f"Valuable: {len(valuable_inserts)} added, {len(valuable_updates)} updated"
         )
         if errors:
             self.logger.error(f"⚠️ Errors: {len(errors)} (showing 10)")
@@ -412,11 +622,11 @@ class StockMerger(BaseFetcher):
 
     def merge_stock_lists(self):
         """Merge All_stocks_list and 500_stocks_list to create final 500 stock symbol-name mapping."""
-        # Check modification timestamps
-        if not (
-                self.is_recently_modified(ALL_STOCKS_CSV)
-                or self.is_recently_modified(NIFTY_500_CSV)
-        ):
+        # Re-run when the content of an input changed, or the output is gone
+        digests = self._changed_inputs(
+            ALL_STOCKS_CSV, NIFTY_500_CSV, force=not os.path.exists(OUTPUT_CSV)
+        )
+        if digests is None:
             self.logger.info(
                 "⚙️  No changes in top 500 stock list or base stocks list. Skipping merge."
             )
@@ -445,31 +655,32 @@ class StockMerger(BaseFetcher):
         self.logger.info(f"✅ Merged {len(merged)} records. Saving output...")
         merged.to_csv(OUTPUT_CSV, index=False)
         self.logger.info(f"📁 Saved: {OUTPUT_CSV}")
+        self._record_inputs(digests)
 
     def merge_with_ticker_data(self, db: Session):
         """Merge merged stock list with Tickertape data and push to DB."""
 
-        # Check modification timestamps
-        if not (
-                self.is_recently_modified(TICKER_TAPE_CSV)
-                or self.is_recently_modified(OUTPUT_CSV)
-        ):
+        digests = self._changed_inputs(TICKER_TAPE_CSV, OUTPUT_CSV)
+        if digests is None:
             self.logger.info(
                 "⚙️  No changes in Ticker & Top 500 stocks CSVs. Skipping merge."
             )
             return None
 
         merged_list, ticker_data = self._load_and_normalize_data()
+        # Create the snapshot table on first run, before this session reads or writes
+        fundamentals_store.ensure_latest_snapshot(db)
 
         self.logger.info("🔄 Merging and enriching data...")
-        final_df = self._merge_dataframes(merged_list, ticker_data)
+        final_df = self._merge_dataframes(merged_list, ticker_data, db)
         self._save_and_log_merge(final_df)
 
         self.logger.info("\n💾 Starting database insertion...")
         self._insert_into_database(final_df, db)
+        self._record_inputs(digests)
 
         return final_df
 
 
 # Global configuration instance
-stockMerger = StockMerger()
+stockMerger = LazySingleton(StockMerger)
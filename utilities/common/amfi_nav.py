@@ -0,0 +1,141 @@
+"""
+Streaming parser for AMFI's daily all-schemes NAV file (NAVAll.txt).
+
+AMFI publishes the NAV of every mutual fund scheme in one semicolon-separated
+text file, grouped under scheme type and fund house heading lines:
+
+    Scheme Code;ISIN Div Payout/ ISIN Growth;ISIN Div Reinvestment;Scheme Name;Net Asset Value;Date
+
+    Open Ended Schemes(Debt Scheme - Banking and PSU Fund)
+
+    Aditya Birla Sun Life Mutual Fund
+
+    119551;INF209KA12Z1;INF209KA13Z9;Aditya Birla Sun Life Banking & PSU Debt Fund - DIRECT - IDCW;105.8904;17-Oct-2026
+
+The file is read line by line from a local path or a URL, so one download
+prices every scheme without holding the file in memory.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, Optional
+
+from utilities.common.app_config import config
+from utilities.common.http_client import http_client
+
+logger = config.setup_logger("utilities.common.amfi_nav")
+
+NAV_FIELD_COUNT = 6
+NAV_DATE_FORMAT = "%d-%b-%Y"
+
+
+def parse_nav_lines(lines: Iterable[str]) -> Iterator[dict]:
+    """
+    Yield one record per scheme line of a NAVAll.txt stream.
+
+    Schemes without a numeric NAV (e.g. "N.A.") are skipped.
+
+    Args:
+        lines: Text lines of the file
+
+    Yields:
+        Dict with Scheme_Code, Fund_Name, NAV, Date, Fund_House, Scheme_Type
+        and the ISINs
+    """
+    scheme_type = None
+    fund_house = None
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+
+        fields = line.split(";")
+        if len(fields) < NAV_FIELD_COUNT:
+            # Heading line: a scheme type "...Schemes(...)" or a fund house
+            if "Schemes" in line and "(" in line:
+                scheme_type = line
+            else:
+                fund_house = line
+            continue
+
+        scheme_code = fields[0].strip()
+        if not scheme_code.isdigit():
+            # The column header line
+            continue
+
+        try:
+            nav = float(fields[4])
+        except ValueError:
+            continue
+
+        try:
+            nav_date = (
+                datetime.strptime(fields[5].strip(), NAV_DATE_FORMAT).date().isoformat()
+            )
+        except ValueError:
+            nav_date = fields[5].strip() or None
+
+        yield {
+            "Scheme_Code": scheme_code,
+            "Fund_Name": fields[3].strip(),
+            "NAV": nav,
+            "Date": nav_date,
+            "Fund_House": fund_house,
+            "Scheme_Type": scheme_type,
+            "ISIN_Growth": fields[1].strip() or None,
+            "ISIN_Reinvestment": fields[2].strip() or None,
+            "source": "amfi",
+        }
+
+
+@contextmanager
+def open_nav_source(source: str) -> Iterator[Iterable[str]]:
+    """Open a NAVAll.txt file from a local path or an http(s) URL as lines of text."""
+    if source.startswith(("http://", "https://")):
+        response = http_client("amfi").get(source, stream=True)
+        try:
+            response.raise_for_status()
+            response.encoding = response.encoding or "utf-8"
+            yield response.iter_lines(decode_unicode=True)
+        finally:
+            response.close()
+    else:
+        with open(source, encoding="utf-8-sig", errors="replace") as f:
+            yield f
+
+
+def load_nav_index(
+    source: str, scheme_codes: Optional[Iterable[str]] = None
+) -> Dict[str, dict]:
+    """
+    Build a scheme_code -> NAV record index from a NAVAll.txt file.
+
+    Args:
+        source: Local path or URL of the file
+        scheme_codes: Only index these schemes, and stop reading once all of
+            them were found. Indexes every scheme when None
+
+    Returns:
+        Dict mapping scheme codes to their parse_nav_lines() record
+    """
+    wanted = (
+        {str(code).strip() for code in scheme_codes}
+        if scheme_codes is not None
+        else None
+    )
+    index: Dict[str, dict] = {}
+
+    with open_nav_source(source) as lines:
+        for record in parse_nav_lines(lines):
+            code = record["Scheme_Code"]
+            if wanted is not None:
+                if code not in wanted:
+                    continue
+                index[code] = record
+                if len(index) == len(wanted):
+                    break
+            else:
+                index[code] = record
+
+    logger.info(f"📄 Indexed NAVs of {len(index)} scheme(s) from {source}")
+    return index
@@ -47,6 +47,41 @@ class AppConfig:
         self.N8N_WEBHOOK_URL = os.getenv("N8N_WEBHOOK_URL")
         self.SERVICE_NAME = os.getenv("SERVICE_NAME", "Financer")
 
+        # Market data fetch limits (Yahoo Finance)
+        self.YF_MAX_WORKERS = int(os.getenv("YF_MAX_WORKERS", "8"))
+        self.YF_REQUESTS_PER_SECOND = float(os.getenv("YF_REQUESTS_PER_SECOND", "2"))
+        self.YF_MAX_RETRIES = int(os.getenv("YF_MAX_RETRIES", "3"))
+
+        # Mutual fund NAVs: AMFI's all-schemes NAV file (local path or URL, empty to
+        # disable), then rate limited per-scheme RapidAPI requests for the rest
+        self.AMFI_NAV_SOURCE = os.getenv(
+            "AMFI_NAV_SOURCE", "https://www.amfiindia.com/spages/NAVAll.txt"
+        )
+        self.MF_MAX_WORKERS = int(os.getenv("MF_MAX_WORKERS", "4"))
+        self.MF_REQUESTS_PER_SECOND = float(os.getenv("MF_REQUESTS_PER_SECOND", "1"))
+
+        # Shared HTTP client for the other market data and integration APIs
+        self.HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+        self.HTTP_BACKOFF_SECONDS = float(os.getenv("HTTP_BACKOFF_SECONDS", "0.5"))
+        self.HTTP_TIMEOUT_BUDGET_SECONDS = float(
+            os.getenv("HTTP_TIMEOUT_BUDGET_SECONDS", "60")
+        )
+        self.HTTP_CIRCUIT_FAILURES = int(os.getenv("HTTP_CIRCUIT_FAILURES", "5"))
+        self.HTTP_CIRCUIT_RESET_SECONDS = float(
+            os.getenv("HTTP_CIRCUIT_RESET_SECONDS", "60")
+        )
+
+        # Parquet archive of stock fundamentals snapshots (defaults to backend/files/stocks)
+        self.FUNDAMENTALS_ARCHIVE_DIR = os.getenv("FUNDAMENTALS_ARCHIVE_DIR")
+
+        # Background job scheduler
+        self.SCHEDULER_ENABLED = (
+            os.getenv("SCHEDULER_ENABLED", "true").lower() == "true"
+        )
+        self.SCHEDULER_MAX_CONCURRENCY = int(
+            os.getenv("SCHEDULER_MAX_CONCURRENCY", "2")
+        )
+
         # Standardized log formats
         # File format: More detailed with function names
         self.FILE_FORMAT = "%(asctime)s | %(levelname)-8s | %(name)-35s | %(funcName)-25s | %(message)s"
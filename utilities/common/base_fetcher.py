@@ -4,6 +4,7 @@ from datetime import datetime, timezone
 from typing import Optional, Dict, List
 
 from utilities.common.app_config import config
+from utilities.common.fx_rates import CURRENCY_CODES, fxRates
 
 
 def _build_cache_key(prefix: str, symbol: str) -> str:
@@ -19,6 +20,9 @@ class BaseFetcher:
         self.redis_client = config.redis_client()
         self.cache_prefix = cache_prefix
         self.cache_expiry = cache_expiry_seconds
+        # Cumulative {prefix: {"hits", "misses"}} for aggregated cache logging
+        self.cache_stats: Dict[str, Dict[str, int]] = {}
+        self.scan_batch_size = 500
 
         # Load config data from environment
         self.rapid_api_bullion_host = os.getenv("RAPID_API_BULLION_HOST")
@@ -31,72 +35,19 @@ class BaseFetcher:
         self.open_exchange_url = os.getenv("EXCHANGE_API_URL")
         self.open_exchange_api_key = os.getenv("EXCHANGE_RATE_API_KEY")
 
-        # Lazy-load forex rates from Redis (don't fetch in __init__)
-        # These will be None initially and loaded on-demand
-        self._redis_forex_key_usd_inr = None
-        self._redis_forex_key_usd_pln = None
-        self._redis_forex_key_pln_inr = None
-
         self.currency = {
             1: "₹",  # INR
             2: "zł",  # PLN
             3: "$",  # USD
         }
 
-        self.currency_map = {1: "INR", 2: "PLN", 3: "USD"}
-
-    @property
-    def redis_forex_key_usd_inr(self):
-        """Lazy-load USD-INR forex rate from Redis"""
-        if self._redis_forex_key_usd_inr is None:
-            self._redis_forex_key_usd_inr = self.redis_client.get("forex::USD-INR")
-        return self._redis_forex_key_usd_inr
-
-    @property
-    def redis_forex_key_usd_pln(self):
-        """Lazy-load USD-PLN forex rate from Redis"""
-        if self._redis_forex_key_usd_pln is None:
-            self._redis_forex_key_usd_pln = self.redis_client.get("forex::USD-PLN")
-        return self._redis_forex_key_usd_pln
-
-    @property
-    def redis_forex_key_pln_inr(self):
-        """Lazy-load PLN-INR forex rate from Redis"""
-        if self._redis_forex_key_pln_inr is None:
-            self._redis_forex_key_pln_inr = self.redis_client.get("forex::PLN-INR")
-        return self._redis_forex_key_pln_inr
+        self.currency_map = dict(CURRENCY_CODES)
 
     def get_conversion_rate_from_usd(self, currency_code: str) -> float:
-        try:
-            if currency_code == "INR":
-                return round(float(json.loads(self.redis_forex_key_usd_inr)["rate"]), 2)
-            elif currency_code == "PLN":
-                return round(float(json.loads(self.redis_forex_key_usd_pln)["rate"]), 2)
-            elif currency_code == "USD":
-                return 1.0
-            else:
-                raise ValueError(f"Unsupported currency type: {currency_code}")
-        except (TypeError, ValueError):
-            self.logger.warning(
-                f"Missing forex rate for {currency_code}, defaulting to 1.0"
-            )
-            return 1.0
+        return fxRates.rate("USD", currency_code)
 
     def get_conversion_rate_against_inr(self, currency_code: str) -> float:
-        try:
-            if currency_code == "INR":
-                return 1.0
-            elif currency_code == "PLN":
-                return round(float(json.loads(self.redis_forex_key_pln_inr)["rate"]), 2)
-            elif currency_code == "USD":
-                return round(float(json.loads(self.redis_forex_key_usd_inr)["rate"]), 2)
-            else:
-                raise ValueError(f"Unsupported currency type: {currency_code}")
-        except (TypeError, ValueError):
-            self.logger.warning(
-                f"Missing forex rate for {currency_code}, defaulting to 1.0"
-            )
-            return 1.0
+        return fxRates.rate(currency_code, "INR")
 
     def set_cache(
         self, prefix: str, data: Dict[str, dict], expiry: Optional[int] = None
@@ -104,21 +55,28 @@ class BaseFetcher:
         """
         Cache cryptocurrency or asset data individually by symbol.
 
+        All SETEX commands go out in one pipelined round trip.
+
         Args:
             prefix: cache prefix (e.g., 'cryptocurrency', 'bullion', 'Stock')
             data: dict of {symbol: {price, name, ...}}
             expiry: optional expiry seconds
         """
+        if not data:
+            return
+
+        ttl = expiry or self.cache_expiry
+        cached_at = datetime.now(timezone.utc).isoformat()
         try:
+            pipe = self.redis_client.pipeline(transaction=False)
             for symbol, value in data.items():
-                cache_key = _build_cache_key(prefix, symbol)
-                payload = {**value, "cached_at": datetime.now(timezone.utc).isoformat()}
-                self.redis_client.setex(
-                    cache_key, expiry or self.cache_expiry, json.dumps(payload)
-                )
-                self.logger.info(
-                    f"✅ Cached data for {symbol} under key [{cache_key}] (expiry: {expiry or self.cache_expiry}s)"
-                )
+                payload = {**value, "cached_at": cached_at}
+                pipe.setex(_build_cache_key(prefix, symbol), ttl, json.dumps(payload))
+            pipe.execute()
+            self.logger.info(
+                f"✅ Cached {len(data)} item(s) under prefix [{prefix}] (expiry: {ttl}s)"
+            )
+            self.logger.debug(f"Cached symbols for {prefix}: {list(data)}")
         except Exception as e:
             self.logger.warning(f"⚠️ Cache write failed for prefix={prefix}: {e}")
 
@@ -126,7 +84,7 @@ class BaseFetcher:
         self, prefix: str, symbols: List[str]
     ) -> Dict[str, Optional[dict]]:
         """
-        Retrieve cached data for multiple symbols.
+        Retrieve cached data for multiple symbols with a single MGET.
 
         Args:
             prefix: cache prefix (e.g., 'cryptocurrency', 'bullion')
@@ -135,24 +93,48 @@ class BaseFetcher:
         Returns:
             Dict with symbol as key and cached data as value (None if not cached)
         """
+        symbols = list(symbols)
+        if not symbols:
+            return {}
+
+        try:
+            values = self.redis_client.mget(
+                [_build_cache_key(prefix, symbol) for symbol in symbols]
+            )
+        except Exception as e:
+            self.logger.warning(f"Cache read failed for prefix={prefix}: {e}")
+            return {symbol: None for symbol in symbols}
+
         results = {}
-        for symbol in symbols:
-            try:
-                cache_key = _build_cache_key(prefix, symbol)
-                cached_data = self.redis_client.get(cache_key)
-                if cached_data:
+        for symbol, cached_data in zip(symbols, values):
+            results[symbol] = None
+            if cached_data:
+                try:
                     results[symbol] = json.loads(cached_data)
-                    self.logger.info(f"Cache Hit:: Retrieved {symbol} from {cache_key}")
-                else:
-                    results[symbol] = None
-            except Exception as e:
-                self.logger.warning(f"Cache read failed for {symbol}: {e}")
-                results[symbol] = None
+                except ValueError as e:
+                    self.logger.warning(f"Cache entry for {symbol} is not JSON: {e}")
+
+        hits = sum(1 for value in results.values() if value is not None)
+        self._record_cache_lookup(prefix, hits, len(results) - hits)
         return results
 
+    def _record_cache_lookup(self, prefix: str, hits: int, misses: int):
+        """Aggregate hit/miss counts instead of logging every key."""
+        stats = self.cache_stats.setdefault(prefix, {"hits": 0, "misses": 0})
+        stats["hits"] += hits
+        stats["misses"] += misses
+        self.logger.debug(
+            f"Cache lookup [{prefix}]: {hits} hit(s), {misses} miss(es) "
+            f"(totals: {stats['hits']} hits, {stats['misses']} misses)"
+        )
+
+    def get_cache_stats(self) -> Dict[str, dict]:
+        """Cumulative cache hits and misses per prefix for this fetcher."""
+        return {prefix: dict(stats) for prefix, stats in self.cache_stats.items()}
+
     def get_cache_info(self, prefix: str, symbols: List[str]) -> Dict[str, dict]:
         """
-        Get TTL info for each symbol cache key.
+        Get TTL info for each symbol cache key, pipelined into one round trip.
 
         Args:
             prefix: cache prefix
@@ -161,51 +143,74 @@ class BaseFetcher:
         Returns:
             Dict of {symbol: {status, ttl_seconds, cache_key}}
         """
+        symbols = list(symbols)
+        if not symbols:
+            return {}
+
+        keys = [_build_cache_key(prefix, symbol) for symbol in symbols]
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for cache_key in keys:
+                pipe.ttl(cache_key)
+            ttls = pipe.execute()
+        except Exception as e:
+            self.logger.error(f"Failed to get cache info for prefix {prefix}: {e}")
+            return {
+                symbol: {"status": "error", "cache_key": None, "error": str(e)}
+                for symbol in symbols
+            }
+
         info = {}
-        for symbol in symbols:
-            try:
-                cache_key = _build_cache_key(prefix, symbol)
-                ttl = self.redis_client.ttl(cache_key)
-                if ttl == -2:
-                    info[symbol] = {"status": "not_cached", "cache_key": cache_key}
-                elif ttl == -1:
-                    info[symbol] = {
-                        "status": "cached",
-                        "ttl": "no_expiry",
-                        "cache_key": cache_key,
-                    }
-                else:
-                    info[symbol] = {
-                        "status": "cached",
-                        "ttl_seconds": ttl,
-                        "cache_key": cache_key,
-                    }
-            except Exception as e:
-                self.logger.error(f"Failed to get cache info for {symbol}: {e}")
-                info[symbol] = {"status": "error", "cache_key": None, "error": str(e)}
+        for symbol, cache_key, ttl in zip(symbols, keys, ttls):
+            if ttl == -2:
+                info[symbol] = {"status": "not_cached", "cache_key": cache_key}
+            elif ttl == -1:
+                info[symbol] = {
+                    "status": "cached",
+                    "ttl": "no_expiry",
+                    "cache_key": cache_key,
+                }
+            else:
+                info[symbol] = {
+                    "status": "cached",
+                    "ttl_seconds": ttl,
+                    "cache_key": cache_key,
+                }
         return info
 
     def clear_cache(self, prefix: str, symbols: Optional[List[str]] = None):
         """
         Clear cache for specific symbols or entire prefix group.
 
+        A prefix clear walks the keyspace with SCAN and unlinks keys in batches,
+        so it never blocks Redis the way KEYS does.
+
         Args:
             prefix: cache prefix (e.g., 'cryptocurrency', 'Stock')
             symbols: optional list of symbols to clear. If None, clears all with that prefix.
         """
         try:
             if symbols:
-                for symbol in symbols:
-                    cache_key = _build_cache_key(prefix, symbol)
-                    self.redis_client.delete(cache_key)
-                    self.logger.info(f"🧹 Cleared cache for {cache_key}")
+                keys = [_build_cache_key(prefix, symbol) for symbol in symbols]
+                self.redis_client.unlink(*keys)
+                self.logger.info(f"🧹 Cleared cache for {len(keys)} key(s) in {prefix}")
             else:
                 pattern = f"{prefix}::*"
-                keys = self.redis_client.keys(pattern)
-                if keys:
-                    self.redis_client.delete(*keys)
+                cleared = 0
+                batch = []
+                for key in self.redis_client.scan_iter(
+                    match=pattern, count=self.scan_batch_size
+                ):
+                    batch.append(key)
+                    if len(batch) >= self.scan_batch_size:
+                        cleared += self.redis_client.unlink(*batch)
+                        batch = []
+                if batch:
+                    cleared += self.redis_client.unlink(*batch)
+
+                if cleared:
                     self.logger.info(
-                        f"🧹 Cleared all {len(keys)} cache keys for prefix {prefix}"
+                        f"🧹 Cleared all {cleared} cache keys for prefix {prefix}"
                     )
                 else:
                     self.logger.info(f"No cache keys found for prefix {prefix}")
@@ -1,6 +1,11 @@
 from datetime import date
 from decimal import Decimal, ROUND_HALF_UP
 
+import numpy as np
+
+from utilities.common import xirr_engine
+
+
 class FinancialCalculator:
     @staticmethod
     def calculate_roi(current_value: float, initial_investment: float) -> float:
@@ -10,23 +15,78 @@ class FinancialCalculator:
         return ((current_value - initial_investment) / initial_investment) * 100
 
     @staticmethod
-    def calculate_xirr(current_value: float, initial_investment: float, investment_date: date, current_date: date) -> float:
+    def calculate_xirr(
+        current_value: float,
+        initial_investment: float,
+        investment_date: date,
+        current_date: date,
+    ) -> float:
         """
-        Calculates a simplified XIRR (Annualized Return).
+        Calculates the XIRR of a single lot bought on investment_date and valued on current_date.
+
+        Lots held for less than a year report their absolute return.
         """
         if initial_investment == 0:
             return 0.0
-            
-        days_invested = (current_date - investment_date).days
-        years = days_invested / 365.0
 
         if current_value <= 0:
             return -100.0 if initial_investment > 0 else 0.0
 
-        if years < 1:
-            return ((current_value - initial_investment) / initial_investment) * 100
-            
-        return (((current_value / initial_investment) ** (1 / years)) - 1) * 100
+        rate = xirr_engine.xirr(
+            [(investment_date, -initial_investment), (current_date, current_value)]
+        )
+        return rate if rate is not None else 0.0
+
+    @staticmethod
+    def calculate_roi_array(
+        current_value: np.ndarray, initial_investment: np.ndarray
+    ) -> np.ndarray:
+        """Vectorized calculate_roi over arrays of values."""
+        current_value = np.asarray(current_value, dtype=float)
+        initial_investment = np.asarray(initial_investment, dtype=float)
+        safe_initial = np.where(initial_investment == 0, 1.0, initial_investment)
+        roi = (current_value - initial_investment) / safe_initial * 100
+        return np.where(initial_investment == 0, 0.0, roi)
+
+    @staticmethod
+    def calculate_xirr_array(
+        current_value: np.ndarray,
+        initial_investment: np.ndarray,
+        days_invested: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Vectorized calculate_xirr over arrays of values and holding periods in days.
+
+        A single lot has one outflow and one inflow, so its XIRR has a closed
+        form and needs no solver.
+        """
+        current_value = np.asarray(current_value, dtype=float)
+        initial_investment = np.asarray(initial_investment, dtype=float)
+        years = np.asarray(days_invested, dtype=float) / 365.0
+
+        safe_initial = np.where(initial_investment == 0, 1.0, initial_investment)
+        simple = (current_value - initial_investment) / safe_initial * 100
+        with np.errstate(divide="ignore", invalid="ignore"):
+            annualized = (
+                np.power(
+                    current_value / safe_initial, 1 / np.where(years < 1, 1.0, years)
+                )
+                - 1
+            ) * 100
+
+        return np.select(
+            [
+                initial_investment == 0,
+                current_value <= 0,
+                years < 1,
+            ],
+            [
+                0.0,
+                np.where(initial_investment > 0, -100.0, 0.0),
+                simple,
+            ],
+            default=annualized,
+        )
 
     @staticmethod
     def round2(x) -> float:
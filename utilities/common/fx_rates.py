@@ -0,0 +1,199 @@
+"""
+In-process foreign exchange rates shared by every fetcher and summarizer.
+
+ForexExchangeRateFetcher caches one JSON payload per pair under forex::<FROM>-<TO>.
+FxRates reads all pairs in one MGET and keeps a currency x currency matrix:
+quoted pairs as cached (rounded to 2 decimals, as conversions always were),
+their inverses, and pairs derived through a third currency. The matrix is
+read-only and replaced as a whole on refresh, so callers can hold on to a
+snapshot.
+
+Caching new rates bumps a version key in Redis. Every worker checks that key
+at most every VERSION_CHECK_SECONDS and reloads the matrix when it changed, so
+a forex refresh reaches all workers within seconds.
+"""
+
+import json
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+import numpy as np
+
+from utilities.common.app_config import config
+
+logger = config.setup_logger("utilities.common.fx_rates")
+
+FOREX_PREFIX = "forex"
+FX_VERSION_KEY = f"{FOREX_PREFIX}::VERSION"
+CURRENCIES = ("INR", "PLN", "USD")
+# currency_id -> currency code, as used by the investment tables
+CURRENCY_CODES = {1: "INR", 2: "PLN", 3: "USD"}
+VERSION_CHECK_SECONDS = 5
+RATE_DECIMALS = 2
+
+
+def forex_cache_key(from_currency: str, to_currency: str) -> str:
+    return f"{FOREX_PREFIX}::{from_currency.upper()}-{to_currency.upper()}"
+
+
+def publish_rates_version(redis_client) -> str:
+    """Tell every worker to reload its rates."""
+    version = uuid.uuid4().hex
+    redis_client.set(FX_VERSION_KEY, version)
+    return version
+
+
+class FxRates:
+    """Currency conversion matrix loaded from the cached forex pairs."""
+
+    def __init__(
+        self,
+        currencies: Iterable[str] = CURRENCIES,
+        check_interval: float = VERSION_CHECK_SECONDS,
+    ):
+        self._lock = threading.Lock()
+        self.currencies = tuple(c.upper() for c in currencies)
+        self.index = {code: i for i, code in enumerate(self.currencies)}
+        self.check_interval = check_interval
+        self.version: Optional[str] = None
+        self.checked_at = 0.0
+        self.matrix = self._identity()
+        self._loaded = False
+        # Missing pairs already reported for the current version
+        self._warned: Set[Tuple[str, str]] = set()
+
+    def _identity(self) -> np.ndarray:
+        n = len(self.currencies)
+        matrix = np.full((n, n), np.nan)
+        np.fill_diagonal(matrix, 1.0)
+        return matrix
+
+    # ---------------------------------------------------------------
+    # Refresh
+    # ---------------------------------------------------------------
+    def ensure_fresh(self, force: bool = False) -> "FxRates":
+        """Reload the rates if their version in Redis changed since the last load."""
+        if not force and time.monotonic() - self.checked_at < self.check_interval:
+            return self
+
+        with self._lock:
+            if not force and time.monotonic() - self.checked_at < self.check_interval:
+                return self
+            self.checked_at = time.monotonic()
+            try:
+                redis_client = config.redis_client()
+                version = redis_client.get(FX_VERSION_KEY)
+                if (
+                    version is not None
+                    and version == self.version
+                    and self._loaded
+                    and not force
+                ):
+                    return self
+                if version is None:
+                    # Rates cached before versioning existed
+                    version = publish_rates_version(redis_client)
+                self._load(redis_client, version)
+            except Exception as e:
+                # Keep serving the last rates; retry after the next interval
+                logger.warning(f"⚠️ Could not load forex rates: {e}")
+        return self
+
+    def invalidate(self):
+        """Make every worker reload, e.g. right after new rates were cached."""
+        try:
+            publish_rates_version(config.redis_client())
+        except Exception as e:
+            logger.warning(f"⚠️ Could not publish the forex rates version: {e}")
+        self.checked_at = 0.0
+
+    def _load(self, redis_client, version: str):
+        pairs = [(a, b) for a in self.currencies for b in self.currencies if a != b]
+        values = redis_client.mget([forex_cache_key(a, b) for a, b in pairs])
+
+        matrix = self._identity()
+        for (a, b), raw in zip(pairs, values):
+            if not raw:
+                continue
+            try:
+                rate = round(float(json.loads(raw)["rate"]), RATE_DECIMALS)
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning(f"Invalid cached forex rate for {a}-{b}: {e}")
+                continue
+            if rate > 0:
+                matrix[self.index[a], self.index[b]] = rate
+
+        # Quoted pairs win over the inverse of the opposite quote
+        with np.errstate(divide="ignore"):
+            matrix = np.where(np.isnan(matrix), 1.0 / matrix.T, matrix)
+        # Derive the remaining pairs through a third currency
+        for k in range(len(self.currencies)):
+            via = np.outer(matrix[:, k], matrix[k, :])
+            matrix = np.where(np.isnan(matrix), via, matrix)
+
+        matrix.setflags(write=False)
+        self.matrix, self.version = matrix, version
+        self._warned = set()
+        self._loaded = True
+        logger.info(
+            f"💱 Loaded forex rates for {', '.join(self.currencies)} (version {version[:12]})"
+        )
+
+    # ---------------------------------------------------------------
+    # Conversions
+    # ---------------------------------------------------------------
+    def rate(self, from_currency: str, to_currency: str = "INR") -> float:
+        """Rate converting one unit of from_currency, 1.0 when it is unknown."""
+        matrix = self.ensure_fresh().matrix
+        i = self.index.get((from_currency or "").upper())
+        j = self.index.get((to_currency or "").upper())
+        if i is None or j is None or np.isnan(matrix[i, j]):
+            pair = (from_currency, to_currency)
+            if pair not in self._warned:
+                self._warned.add(pair)
+                logger.warning(
+                    f"Missing forex rate for {from_currency}-{to_currency}, defaulting to 1.0"
+                )
+            return 1.0
+        return float(matrix[i, j])
+
+    def rates_to(self, to_currency: str = "INR") -> Dict[str, float]:
+        """Rate of every known currency into to_currency."""
+        return {code: self.rate(code, to_currency) for code in self.currencies}
+
+    def convert(self, amounts, from_currencies, to_currency: str = "INR") -> np.ndarray:
+        """
+        Convert an array of amounts, each in its own currency, in one step.
+
+        Args:
+            amounts: Amounts to convert
+            from_currencies: Currency code of each amount
+            to_currency: Target currency code
+
+        Returns:
+            Array of converted amounts; unknown currencies convert at 1.0
+        """
+        matrix = self.ensure_fresh().matrix
+        amounts = np.asarray(amounts, dtype=float)
+        j = self.index.get(to_currency.upper())
+        if j is None:
+            return amounts.copy()
+
+        column = np.append(np.nan_to_num(matrix[:, j], nan=1.0), 1.0)
+        unknown = len(self.currencies)
+        positions = np.fromiter(
+            (self.index.get((code or "").upper(), unknown) for code in from_currencies),
+            dtype=np.intp,
+            count=len(amounts),
+        )
+        return amounts * column[positions]
+
+
+def currency_code(currency_id: int, default: str = "INR") -> str:
+    return CURRENCY_CODES.get(currency_id, default)
+
+
+# Global rates instance, loaded on first use
+fxRates = FxRates()
@@ -0,0 +1,308 @@
+"""
+Shared HTTP client for the market data fetchers and integrations.
+
+Every upstream provider gets one HttpClient, shared by all callers in the
+process:
+
+- a requests.Session with a keep-alive connection pool, so repeated calls
+  reuse TCP/TLS connections instead of opening one per request
+- retries of connection errors, timeouts and 429/5xx responses with jittered
+  exponential backoff, bounded by a total time budget per call
+- a circuit breaker that opens after consecutive failures and fails calls
+  fast with CircuitOpenError until a trial request succeeds again
+- request metrics (counts, retries, failures, latency)
+
+CircuitOpenError is a requests ConnectionError, so the existing
+`except requests.exceptions.RequestException` handlers cover it.
+"""
+
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utilities.common.app_config import config
+
+logger = config.setup_logger("utilities.common.http_client")
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised without calling the provider while its circuit is open."""
+
+
+class CircuitBreaker:
+    """Opens after failure_threshold consecutive failures, probes again after reset_timeout."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if (
+                self.state == self.OPEN
+                and time.monotonic() - self.opened_at >= self.reset_timeout
+            ):
+                # Let a single trial request through
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> bool:
+        """Count a failure; returns True when this failure opened the circuit."""
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self.failures >= self.failure_threshold
+            ):
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+
+class HttpClient:
+    """Pooled, retrying, circuit-broken HTTP client for one provider."""
+
+    def __init__(
+        self,
+        provider: str,
+        timeout: float = 15,
+        max_retries: Optional[int] = None,
+        backoff_base_seconds: Optional[float] = None,
+        max_backoff_seconds: float = 30,
+        timeout_budget_seconds: Optional[float] = None,
+        failure_threshold: Optional[int] = None,
+        reset_timeout_seconds: Optional[float] = None,
+        pool_maxsize: int = 10,
+        retry_non_idempotent: bool = False,
+    ):
+        """
+        Args:
+            provider: Name used for logs, metrics and the circuit breaker
+            timeout: Default per-attempt timeout in seconds
+            max_retries: Retries after the first attempt (HTTP_MAX_RETRIES)
+            backoff_base_seconds: First backoff delay, doubled per retry (HTTP_BACKOFF_SECONDS)
+            max_backoff_seconds: Cap on a single backoff delay
+            timeout_budget_seconds: Total time one call may take across all
+                attempts and backoffs (HTTP_TIMEOUT_BUDGET_SECONDS)
+            failure_threshold: Consecutive failed calls that open the circuit
+                (HTTP_CIRCUIT_FAILURES)
+            reset_timeout_seconds: Time the circuit stays open before a trial
+                request (HTTP_CIRCUIT_RESET_SECONDS)
+            pool_maxsize: Keep-alive connections kept per host
+            retry_non_idempotent: Also retry POST/PATCH requests
+        """
+        self.provider = provider
+        self.timeout = timeout
+        self.max_retries = (
+            config.HTTP_MAX_RETRIES if max_retries is None else max_retries
+        )
+        self.backoff_base_seconds = (
+            config.HTTP_BACKOFF_SECONDS
+            if backoff_base_seconds is None
+            else backoff_base_seconds
+        )
+        self.max_backoff_seconds = max_backoff_seconds
+        self.timeout_budget_seconds = (
+            config.HTTP_TIMEOUT_BUDGET_SECONDS
+            if timeout_budget_seconds is None
+            else timeout_budget_seconds
+        )
+        self.retry_non_idempotent = retry_non_idempotent
+        self.breaker = CircuitBreaker(
+            config.HTTP_CIRCUIT_FAILURES
+            if failure_threshold is None
+            else failure_threshold,
+            config.HTTP_CIRCUIT_RESET_SECONDS
+            if reset_timeout_seconds is None
+            else reset_timeout_seconds,
+        )
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            "requests": 0,
+            "attempts": 0,
+            "retries": 0,
+            "failures": 0,
+            "short_circuited": 0,
+            "total_latency_seconds": 0.0,
+        }
+
+    # ---------------------------------------------------------------
+    # Requests
+    # ---------------------------------------------------------------
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request, retrying transient failures within the time budget.
+
+        Returns the final response whatever its status; callers still call
+        raise_for_status() as before.
+
+        Raises:
+            CircuitOpenError: If the provider's circuit is open
+            requests.exceptions.RequestException: If every attempt failed
+        """
+        if not self.breaker.allow():
+            self._count(short_circuited=1)
+            raise CircuitOpenError(
+                f"{self.provider} circuit open after repeated failures, not calling {url}"
+            )
+
+        method = method.upper()
+        retries = self.max_retries
+        if method not in IDEMPOTENT_METHODS and not self.retry_non_idempotent:
+            retries = 0
+        timeout = kwargs.pop("timeout", self.timeout)
+        started = time.monotonic()
+        deadline = started + self.timeout_budget_seconds
+
+        attempt = 0
+        success = False
+        # Every exit, including unexpected exceptions, reports to the breaker;
+        # otherwise a half-open trial that raised would leave it stuck open
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                error: Optional[Exception] = None
+                response: Optional[requests.Response] = None
+                self._count(attempts=1)
+                try:
+                    response = self.session.request(
+                        method, url, timeout=max(0.1, min(timeout, remaining)), **kwargs
+                    )
+                except (
+                    requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout,
+                ) as e:
+                    error = e
+
+                transient = error is not None or response.status_code in RETRY_STATUSES
+                if not transient:
+                    success = True
+                    return response
+
+                delay = self._backoff(attempt, response)
+                if attempt >= retries or time.monotonic() + delay >= deadline:
+                    if error is not None:
+                        raise error
+                    return response
+
+                attempt += 1
+                self._count(retries=1)
+                logger.info(
+                    f"🔁 {self.provider} {method} attempt {attempt} failed "
+                    f"({error or response.status_code}), retrying in {delay:.1f}s"
+                )
+                if response is not None:
+                    response.close()
+                time.sleep(delay)
+        finally:
+            self._finish(started, success=success)
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response]) -> float:
+        delay = self.backoff_base_seconds * (2**attempt)
+        delay += random.uniform(0, delay)
+        retry_after = (
+            response.headers.get("Retry-After") if response is not None else None
+        )
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+        return min(delay, self.max_backoff_seconds)
+
+    def _finish(self, started: float, success: bool):
+        self._count(requests=1, total_latency_seconds=time.monotonic() - started)
+        if success:
+            self.breaker.record_success()
+            return
+        self._count(failures=1)
+        if self.breaker.record_failure():
+            logger.warning(
+                f"⚡ {self.provider} circuit opened after {self.breaker.failures} "
+                f"failure(s), failing fast for {self.breaker.reset_timeout:.0f}s"
+            )
+
+    # ---------------------------------------------------------------
+    # Metrics
+    # ---------------------------------------------------------------
+    def _count(self, **increments):
+        with self._metrics_lock:
+            for key, value in increments.items():
+                self._metrics[key] += value
+
+    def metrics(self) -> dict:
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+        metrics["avg_latency_seconds"] = (
+            round(metrics["total_latency_seconds"] / metrics["requests"], 3)
+            if metrics["requests"]
+            else None
+        )
+        metrics["total_latency_seconds"] = round(metrics["total_latency_seconds"], 3)
+        metrics["circuit"] = self.breaker.state
+        return metrics
+
+
+# provider -> settings that differ from the defaults
+PROVIDER_SETTINGS: Dict[str, dict] = {
+    "open_exchange": {"timeout": 15},
+    "coinmarketcap": {"timeout": 15},
+    "rapidapi_mf": {"timeout": 30},
+    "amfi": {"timeout": 60},
+    "rapidapi_bullion": {"timeout": 30},
+    # POSTs, not retried; the heartbeat is resent every 10s anyway
+    "raiden": {"timeout": 5},
+    "n8n": {"timeout": 5},
+}
+
+_clients: Dict[str, HttpClient] = {}
+_clients_lock = threading.Lock()
+
+
+def http_client(provider: str) -> HttpClient:
+    """The process-wide client of a provider, created on first use."""
+    client = _clients.get(provider)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(provider)
+            if client is None:
+                client = HttpClient(provider, **PROVIDER_SETTINGS.get(provider, {}))
+                _clients[provider] = client
+    return client
+
+
+def http_metrics() -> Dict[str, dict]:
+    """Request metrics and circuit state of every provider used so far."""
+    return {provider: client.metrics() for provider, client in list(_clients.items())}
@@ -0,0 +1,91 @@
+"""
+Precompiled keyword matcher for rule-based categorization.
+
+Rules map an id to keywords; a text belongs to the first rule (in rule order)
+with a keyword that occurs anywhere in it, case-insensitively. That is what a
+loop of `keyword in text` checks over every rule computes, but the loop costs
+one scan of the text per keyword.
+
+The matcher compiles all keywords into one regex shaped like a trie, wrapped
+in a lookahead so every position of the text reports the longest keyword
+starting there, overlapping matches included. Any shorter keyword starting at
+the same position is a prefix of that one, so each keyword carries the best
+rule among its prefixes and one pass over the text finds the winning rule.
+"""
+
+import re
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple, Union
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [
+            re.escape(char) + build(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # A keyword ends here, the longer ones continuing from it are optional
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Finds the first rule whose keywords occur in a text."""
+
+    def __init__(
+        self,
+        rules: Union[Dict[Hashable, List[str]], Iterable[Tuple[Hashable, List[str]]]],
+        default: Optional[Hashable] = None,
+    ):
+        """
+        Args:
+            rules: Rule id -> keywords, in priority order. (id, keywords) pairs
+                work too, for rule sets listing an id more than once
+            default: Returned by match() when no keyword occurs
+        """
+        self.default = default
+        # keyword -> (priority, rule id) of the first rule listing it
+        owners: Dict[str, Tuple[int, Hashable]] = {}
+        pairs = rules.items() if isinstance(rules, dict) else rules
+        for priority, (rule_id, keywords) in enumerate(pairs):
+            for keyword in keywords or []:
+                keyword = str(keyword).lower()
+                if keyword:
+                    owners.setdefault(keyword, (priority, rule_id))
+        self.keyword_count = len(owners)
+
+        # Best rule among each keyword and the keywords that are its prefixes
+        self._best: Dict[str, Tuple[int, Hashable]] = {}
+        for keyword in sorted(owners):
+            best = owners[keyword]
+            for end in range(1, len(keyword)):
+                prefix_owner = owners.get(keyword[:end])
+                if prefix_owner and prefix_owner[0] < best[0]:
+                    best = prefix_owner
+            self._best[keyword] = best
+
+        self._pattern = re.compile(f"(?=({_trie_pattern(owners)}))") if owners else None
+
+    def match(self, text: str):
+        """Rule id of the first rule with a keyword in text, else the default."""
+        if self._pattern is None or not text:
+            return self.default
+        best = None
+        for found in self._pattern.finditer(text.lower()):
+            candidate = self._best[found.group(1)]
+            if best is None or candidate[0] < best[0]:
+                best = candidate
+                if best[0] == 0:
+                    break
+        return best[1] if best else self.default
@@ -0,0 +1,49 @@
+import threading
+from typing import Callable
+
+
+class LazySingleton:
+    """Module-level instance that is only constructed on first use.
+
+    Fetchers open Redis connections and DB sessions in __init__, so creating
+    them at import time made every `import` hit the network. Wrapping the
+    global in a LazySingleton keeps the existing call style working:
+
+        stockFetcher = LazySingleton(StockPriceFetcher)
+        StockPriceFetcher.get_stock_prices_in_bulk(stockFetcher, symbols)
+
+    Attribute reads and writes are forwarded to the real instance, which is
+    built once, thread-safely, the first time any attribute is touched.
+    """
+
+    def __init__(self, factory: Callable):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_instance", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def get_instance(self):
+        """Return the wrapped instance, constructing it if needed."""
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                if self._instance is None:
+                    object.__setattr__(self, "_instance", self._factory())
+                instance = self._instance
+        return instance
+
+    @property
+    def is_initialized(self) -> bool:
+        return self._instance is not None
+
+    def __getattr__(self, name):
+        return getattr(self.get_instance(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self.get_instance(), name, value)
+
+    def __delattr__(self, name):
+        delattr(self.get_instance(), name)
+
+    def __repr__(self):
+        state = "initialized" if self.is_initialized else "not initialized"
+        return f"<LazySingleton {getattr(self._factory, '__name__', self._factory)} ({state})>"
@@ -0,0 +1,41 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by all workers hitting one upstream API.
+
+    Tokens refill continuously at `rate` per second up to `capacity`; every
+    request takes one token and blocks until one is available. Total throughput
+    is therefore bounded by the rate, whatever the number of worker threads.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size
+        """
+        self.rate = float(rate)
+        self.capacity = max(1, int(capacity))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0):
+        """Block until `tokens` are available, then take them."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
@@ -0,0 +1,225 @@
+"""
+Set-based revaluation of investment and summary tables.
+
+Each call loads every affected row in one query, computes current value, ROI
+and XIRR for all of them at once with NumPy, and writes the results back with
+a single bulk UPDATE per table. A full portfolio revaluation is therefore a
+handful of statements no matter how many holdings there are.
+"""
+
+from datetime import datetime, UTC
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from utilities.common.app_config import config
+from utilities.common.financial_utils import FinancialCalculator
+from utilities.common.xirr_engine import CashFlowBook
+
+logger = config.setup_logger("utilities.common.valuation_engine")
+
+
+def _key_expression(column, case_insensitive: bool):
+    return func.upper(column) if case_insensitive else column
+
+
+def _days_since(dates, today) -> np.ndarray:
+    """Whole days between each investment date and today."""
+    invested_on = np.array(
+        [d.date() if isinstance(d, datetime) else d for d in dates],
+        dtype="datetime64[D]",
+    )
+    return (np.datetime64(today, "D") - invested_on).astype(float)
+
+
+def revalue_investments(
+    db: Session,
+    model,
+    key_column: str,
+    quantity_column: str,
+    price_column: str,
+    prices: Dict[str, float],
+    extra_value: Optional[Dict[str, float]] = None,
+    currency_rate: Optional[Callable[[int], float]] = None,
+    filters: tuple = (),
+    case_insensitive: bool = False,
+) -> int:
+    """Revalue every investment row whose key has a price.
+
+    Args:
+        db: Database session
+        model: Investment model (StockInvestment, MutualFundInvestment, ...)
+        key_column: Column matched against the keys of `prices` (e.g. "stock_symbol")
+        quantity_column: Column holding the quantity held (e.g. "stock_quantity")
+        price_column: Column receiving the current unit price (e.g. "current_price_per_stock")
+        prices: Mapping of key to current unit price
+        extra_value: Optional mapping of key to an amount added to each row's value (dividends)
+        currency_rate: Optional callable(currency_id) -> rate applied to the price of each row
+        filters: Extra SQLAlchemy filter clauses (e.g. transaction_type == "BUY")
+        case_insensitive: Match keys in upper case
+
+    Returns:
+        Number of investment rows updated
+    """
+    if not prices:
+        return 0
+    extra_value = extra_value or {}
+    key_expr = _key_expression(getattr(model, key_column), case_insensitive)
+
+    rows = (
+        db.query(
+            model.id,
+            key_expr.label("key"),
+            getattr(model, quantity_column),
+            model.total_invested_amount,
+            model.investment_date,
+            model.currency_id,
+        )
+        .filter(key_expr.in_(list(prices)), *filters)
+        .all()
+    )
+    if not rows:
+        return 0
+
+    ids, keys, quantities, invested, dates, currency_ids = zip(*rows)
+    unit_price = np.array([float(prices[key]) for key in keys])
+    if currency_rate is not None:
+        rates = {cid: currency_rate(cid) for cid in set(currency_ids)}
+        unit_price = unit_price * np.array([rates[cid] for cid in currency_ids])
+
+    invested = np.array(invested, dtype=float)
+    current_value = unit_price * np.array(quantities, dtype=float) + np.array(
+        [float(extra_value.get(key, 0)) for key in keys]
+    )
+    roi = FinancialCalculator.calculate_roi_array(current_value, invested)
+    xirr = FinancialCalculator.calculate_xirr_array(
+        current_value, invested, _days_since(dates, datetime.now(UTC).date())
+    )
+
+    db.bulk_update_mappings(
+        model,
+        [
+            {
+                "id": row_id,
+                price_column: float(unit_price[i]),
+                "current_total_value": float(current_value[i]),
+                "return_on_investment": float(roi[i]),
+                "xirr": float(xirr[i]),
+            }
+            for i, row_id in enumerate(ids)
+        ],
+    )
+    logger.info(f"Revalued {len(ids)} {model.__tablename__} row(s)")
+    return len(ids)
+
+
+def revalue_summaries(
+    db: Session,
+    summary_model,
+    investment_model,
+    key_column: str,
+    prices: Dict[str, float],
+    extra_value: Optional[Dict[str, float]] = None,
+    extra_flows: Iterable[Tuple[int, str, datetime, float]] = (),
+    case_insensitive: bool = False,
+) -> int:
+    """Revalue summary rows and solve the XIRR of each from its cash flows.
+
+    The flows of a summary are every BUY (money in) and SELL (money out) of the
+    same investor and key, any extra_flows, and the current value today. All
+    summaries are solved in one batch.
+
+    Args:
+        db: Database session
+        summary_model: Summary model (StockSummary, MutualFundSummary, ...)
+        investment_model: Investment model the summary aggregates
+        key_column: Column shared by both models (e.g. "stock_symbol")
+        prices: Mapping of key to current unit price
+        extra_value: Optional mapping of key to an amount added to each summary's value (dividends)
+        extra_flows: Optional (investor, key, date, amount) flows already paid out (dividends);
+            they are taken out of the terminal value so they are not counted twice
+        case_insensitive: Match keys in upper case
+
+    Returns:
+        Number of summaries updated
+    """
+    if not prices:
+        return 0
+    extra_value = extra_value or {}
+    keys_list = list(prices)
+    summary_key = _key_expression(getattr(summary_model, key_column), case_insensitive)
+    investment_key = _key_expression(
+        getattr(investment_model, key_column), case_insensitive
+    )
+
+    rows = (
+        db.query(
+            summary_model.id,
+            summary_model.investor_id,
+            summary_key.label("key"),
+            summary_model.total_quantity,
+            summary_model.total_cost,
+        )
+        .filter(summary_key.in_(keys_list))
+        .all()
+    )
+    if not rows:
+        return 0
+
+    ids, investors, keys, quantities, total_cost = zip(*rows)
+    unit_price = np.array([float(prices[key]) for key in keys])
+    holding_value = np.round(unit_price * np.array(quantities, dtype=float), 2)
+    current_value = holding_value + np.array(
+        [float(extra_value.get(key, 0)) for key in keys]
+    )
+    roi = FinancialCalculator.calculate_roi_array(
+        current_value, np.array(total_cost, dtype=float)
+    )
+
+    today = datetime.now(UTC).date()
+    book = CashFlowBook()
+    flows = db.query(
+        investment_model.investor,
+        investment_key.label("key"),
+        investment_model.transaction_type,
+        investment_model.investment_date,
+        investment_model.total_invested_amount,
+        investment_model.total_amount_after_sale,
+    ).filter(investment_key.in_(keys_list))
+    for investor, key, transaction_type, invested_on, invested, proceeds in flows:
+        if transaction_type == "SELL":
+            book.add((investor, key), invested_on, proceeds)
+        else:
+            book.add((investor, key), invested_on, -invested)
+
+    paid_out = {}
+    for investor, key, paid_on, amount in extra_flows:
+        if case_insensitive:
+            key = key.upper()
+        book.add((investor, key), paid_on, amount)
+        paid_out[(investor, key)] = paid_out.get((investor, key), 0.0) + amount
+
+    for i, (investor, key) in enumerate(zip(investors, keys)):
+        terminal = current_value[i] - paid_out.get((investor, key), 0.0)
+        book.add((investor, key), today, float(terminal))
+    xirr = book.xirr()
+
+    now = datetime.now(UTC)
+    db.bulk_update_mappings(
+        summary_model,
+        [
+            {
+                "id": row_id,
+                "current_price_per_unit": float(unit_price[i]),
+                "current_value": float(current_value[i]),
+                "roi": float(roi[i]),
+                "xirr": xirr.get((investors[i], keys[i])) or 0.0,
+                "last_updated": now,
+            }
+            for i, row_id in enumerate(ids)
+        ],
+    )
+    logger.info(f"Revalued {len(ids)} {summary_model.__tablename__} row(s)")
+    return len(ids)
@@ -0,0 +1,200 @@
+"""
+XIRR over dated cash flows.
+
+Flows are negative when money goes into a holding (buys) and positive when it
+comes out (sells, dividends, the current value on the valuation date). All
+holdings are solved together: the flows of every holding sit in flat NumPy
+arrays tagged with a group index, and each Newton-Raphson step updates every
+rate at once. Holdings where Newton does not converge fall back to bisection
+over a bracket, also vectorized.
+"""
+
+from datetime import date, datetime
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+DAYS_PER_YEAR = 365.0
+MIN_RATE = -0.999999  # -100% is the lowest rate a holding can return
+MAX_RATE = 1e6
+
+
+def _as_day(value) -> np.datetime64:
+    if isinstance(value, datetime):
+        value = value.date()
+    return np.datetime64(value, "D")
+
+
+def _npv(rates, group_index, amounts, years, n_groups):
+    """NPV of every group and its derivative with respect to the rate."""
+    log_growth = np.log1p(rates)[group_index]
+    discounted = amounts * np.exp(-years * log_growth)
+    npv = np.bincount(group_index, weights=discounted, minlength=n_groups)
+    derivative = np.bincount(
+        group_index,
+        weights=-years * discounted * np.exp(-log_growth),
+        minlength=n_groups,
+    )
+    return npv, derivative
+
+
+def solve_xirr(
+    group_index: np.ndarray,
+    amounts: np.ndarray,
+    years: np.ndarray,
+    n_groups: int,
+    guess: float = 0.1,
+    tol: float = 1e-9,
+    max_iter: int = 30,
+) -> np.ndarray:
+    """Solve the annual rate of every group of cash flows at once.
+
+    Args:
+        group_index: Group of each flow, in range(n_groups)
+        amounts: Signed amount of each flow
+        years: Time of each flow in years since the first flow of its group
+        n_groups: Number of groups
+        guess: Starting rate for Newton-Raphson
+        tol: Convergence tolerance on the rate
+        max_iter: Newton-Raphson iterations before falling back to bisection
+
+    Returns:
+        Array of rates as fractions (0.12 is 12%), NaN where there is no
+        solution (e.g. a group without both inflows and outflows)
+    """
+    group_index = np.asarray(group_index, dtype=np.intp)
+    amounts = np.asarray(amounts, dtype=float)
+    years = np.asarray(years, dtype=float)
+
+    has_outflow = np.bincount(group_index, weights=amounts < 0, minlength=n_groups) > 0
+    has_inflow = np.bincount(group_index, weights=amounts > 0, minlength=n_groups) > 0
+    solvable = has_outflow & has_inflow
+    scale = np.bincount(group_index, weights=np.abs(amounts), minlength=n_groups)
+
+    rates = np.full(n_groups, guess)
+    converged = ~solvable
+    with np.errstate(all="ignore"):
+        for _ in range(max_iter):
+            # Only the flows of groups still iterating take part in the step
+            active = ~converged[group_index]
+            npv, derivative = _npv(
+                rates, group_index[active], amounts[active], years[active], n_groups
+            )
+            step = np.where(converged | (derivative == 0), 0.0, npv / derivative)
+            rates = np.clip(rates - step, MIN_RATE, MAX_RATE)
+            converged |= np.abs(step) < tol
+            if converged.all():
+                break
+
+        npv, _ = _npv(rates, group_index, amounts, years, n_groups)
+        accurate = np.isfinite(rates) & (np.abs(npv) <= 1e-6 * np.maximum(scale, 1.0))
+    retry = solvable & ~accurate
+    if retry.any():
+        flows = retry[group_index]
+        rates[retry] = _bisect(
+            group_index[flows], amounts[flows], years[flows], n_groups, retry, tol
+        )
+
+    return np.where(solvable, rates, np.nan)
+
+
+def _bisect(group_index, amounts, years, n_groups, mask, tol, max_iter=200):
+    """Bracketed fallback for the groups in mask, NaN where no sign change exists."""
+    low = np.full(n_groups, MIN_RATE)
+    high = np.full(n_groups, 1.0)
+    with np.errstate(all="ignore"):
+        npv_low, _ = _npv(low, group_index, amounts, years, n_groups)
+        npv_high, _ = _npv(high, group_index, amounts, years, n_groups)
+
+        # Widen the bracket until the NPV changes sign
+        while True:
+            widen = mask & (np.sign(npv_low) == np.sign(npv_high)) & (high < MAX_RATE)
+            if not widen.any():
+                break
+            high = np.where(widen, high * 10, high)
+            npv_high, _ = _npv(high, group_index, amounts, years, n_groups)
+
+        bracketed = mask & (np.sign(npv_low) != np.sign(npv_high))
+        for _ in range(max_iter):
+            mid = (low + high) / 2
+            npv_mid, _ = _npv(mid, group_index, amounts, years, n_groups)
+            same_side = np.sign(npv_mid) == np.sign(npv_low)
+            low = np.where(same_side, mid, low)
+            npv_low = np.where(same_side, npv_mid, npv_low)
+            high = np.where(same_side, high, mid)
+            if np.all((high - low)[bracketed] < tol):
+                break
+
+    return np.where(bracketed, (low + high) / 2, np.nan)[mask]
+
+
+class CashFlowBook:
+    """Collects dated cash flows per holding and solves all their XIRRs in one batch."""
+
+    def __init__(self):
+        self._groups: Dict[Hashable, int] = {}
+        self._group_index: List[int] = []
+        self._dates: List[np.datetime64] = []
+        self._amounts: List[float] = []
+
+    def add(self, key: Hashable, when, amount: float):
+        """Record a flow: negative for money put in, positive for money taken out."""
+        if not amount:
+            return
+        group = self._groups.setdefault(key, len(self._groups))
+        self._group_index.append(group)
+        self._dates.append(_as_day(when))
+        self._amounts.append(float(amount))
+
+    def xirr(self) -> Dict[Hashable, Optional[float]]:
+        """XIRR of every holding, in percent.
+
+        Holdings whose first flow is less than a year before their last one
+        report their absolute return instead of an annualized figure, the same
+        convention as FinancialCalculator.calculate_xirr.
+
+        Returns:
+            Mapping of key to XIRR percentage, None where it cannot be solved
+        """
+        n_groups = len(self._groups)
+        if not n_groups:
+            return {}
+
+        group_index = np.array(self._group_index, dtype=np.intp)
+        amounts = np.array(self._amounts)
+        days = np.array(self._dates, dtype="datetime64[D]").astype(np.int64)
+
+        first_day = np.full(n_groups, np.iinfo(np.int64).max)
+        last_day = np.full(n_groups, np.iinfo(np.int64).min)
+        np.minimum.at(first_day, group_index, days)
+        np.maximum.at(last_day, group_index, days)
+        years = (days - first_day[group_index]) / DAYS_PER_YEAR
+
+        rates = solve_xirr(group_index, amounts, years, n_groups) * 100
+
+        invested = np.bincount(
+            group_index,
+            weights=np.where(amounts < 0, -amounts, 0.0),
+            minlength=n_groups,
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            absolute = (
+                np.bincount(group_index, weights=amounts, minlength=n_groups)
+                / invested
+                * 100
+            )
+        short = (last_day - first_day) < DAYS_PER_YEAR
+        rates = np.where(short & (invested > 0), absolute, rates)
+
+        return {
+            key: (float(rates[group]) if np.isfinite(rates[group]) else None)
+            for key, group in self._groups.items()
+        }
+
+
+def xirr(cash_flows: Iterable[Tuple[date, float]]) -> Optional[float]:
+    """XIRR in percent of a single series of (date, amount) cash flows."""
+    book = CashFlowBook()
+    for when, amount in cash_flows:
+        book.add(0, when, amount)
+    return book.xirr().get(0)
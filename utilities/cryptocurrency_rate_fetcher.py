@@ -1,15 +1,22 @@
 import json
 import os
-from datetime import datetime, timezone, UTC
-from typing import Dict
+import re
+from datetime import datetime, timezone
+from typing import Dict, List
 
 import requests
 from sqlalchemy.orm import Session
 
 from utilities.common.base_fetcher import BaseFetcher
-from utilities.common.financial_utils import FinancialCalculator
+from utilities.common.http_client import http_client
+from utilities.common.lazy_singleton import LazySingleton
+from utilities.common import valuation_engine
+from backend.common import change_events
 from backend.models.investments.crypto import CryptoInvestment, CryptoSummary
 
+# Symbols per quotes request; the API takes a comma-separated list
+COINMARKETCAP_BATCH_SIZE = 100
+
 
 class CryptoCurrencyRateFetcher(BaseFetcher):
     """Utility class to fetch cryptocurrency rates"""
@@ -27,14 +34,101 @@ class CryptoCurrencyRateFetcher(BaseFetcher):
             cache_expiry_seconds=86400,
         )
 
+        # Pooled, retrying client shared by every quotes request
+        self.session = http_client("coinmarketcap")
+
         self.logger.debug("Cryptocurrency fetcher initialized")
 
+    def _request_quotes(self, batch: List[str]) -> dict:
+        """One quotes call for a comma-separated batch of symbols."""
+        resp = self.session.get(
+            os.getenv("COIN_MARKET_URL"),
+            headers={
+                "X-CMC_PRO_API_KEY": os.getenv("COIN_MARKET_CAP_API_KEY"),
+                "Accept": "application/json",
+            },
+            params={
+                "symbol": ",".join(batch),
+                "convert": "USD",
+                "skip_invalid": "true",
+            },
+            timeout=15,
+        )
+        resp.raise_for_status()
+        return resp.json().get("data") or {}
+
+    @staticmethod
+    def _invalid_symbols(response, batch: List[str]) -> List[str]:
+        """Symbols named in an 'Invalid value for "symbol": "A,B"' error, if any."""
+        try:
+            message = response.json()["status"]["error_message"]
+        except (ValueError, KeyError, TypeError):
+            return []
+        match = re.search(r'"symbol":\s*"([^"]+)"', message or "")
+        if not match:
+            return []
+        named = {sym.strip().upper() for sym in match.group(1).split(",")}
+        invalid = [sym for sym in batch if sym.upper() in named]
+        # Only trust the message when it leaves something valid to retry
+        return invalid if 0 < len(invalid) < len(batch) else []
+
+    def _fetch_batch(self, batch: List[str], fetched: dict, errors: dict):
+        """Fetch a batch, splitting it when the API rejects it because of one bad symbol."""
+        try:
+            self.logger.info(f"Fetching {len(batch)} symbol(s) from CoinMarketCap API")
+            data = self._request_quotes(batch)
+        except requests.exceptions.HTTPError as e:
+            status = e.response.status_code if e.response is not None else None
+            if status == 400 and len(batch) > 1:
+                invalid = self._invalid_symbols(e.response, batch)
+                if invalid:
+                    for symbol in invalid:
+                        self.logger.warning(f"CoinMarketCap rejected symbol {symbol}")
+                        errors[symbol] = "invalid_symbol"
+                        fetched[symbol] = None
+                    self._fetch_batch(
+                        [sym for sym in batch if sym not in invalid], fetched, errors
+                    )
+                    return
+                middle = len(batch) // 2
+                self._fetch_batch(batch[:middle], fetched, errors)
+                self._fetch_batch(batch[middle:], fetched, errors)
+                return
+            self.logger.error(f"Request error for {batch}: {e}")
+            failure = f"request_error: {str(e)}"
+        except requests.exceptions.Timeout:
+            self.logger.error(f"Timeout when fetching {batch}")
+            failure = "timeout"
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"Request error for {batch}: {e}")
+            failure = f"request_error: {str(e)}"
+        except (ValueError, json.JSONDecodeError, AttributeError) as e:
+            self.logger.error(f"Parsing error for {batch}: {e}")
+            failure = f"parsing_error: {str(e)}"
+        except Exception as e:
+            self.logger.error(f"Unexpected error for {batch}: {e}")
+            failure = f"unexpected_error: {str(e)}"
+        else:
+            for symbol in batch:
+                coin = data.get(symbol) or data.get(symbol.upper())
+                if not coin:
+                    self.logger.warning(f"API returned no data for {symbol}")
+                    errors[symbol] = "no_data_in_api_response"
+                fetched[symbol] = coin or None
+            return
+
+        for symbol in batch:
+            errors[symbol] = failure
+            fetched[symbol] = None
+
     def fetch_coin_data(self, symbols: list):
         """Fetch coin data from CoinMarketCap API with caching support.
 
-        Attempts to retrieve data from cache first. For cache misses, fetches
-        from CoinMarketCap API and caches the results. Handles errors gracefully
-        and returns both successful data and error information.
+        Attempts to retrieve data from cache first. Cache misses are requested
+        in batches of up to COINMARKETCAP_BATCH_SIZE symbols per call over a
+        pooled session, and all fetched coins are cached in one pipelined write.
+        A batch the API rejects is split until the failing symbol is isolated,
+        so one bad symbol does not fail the others.
 
         Args:
             symbols: List of cryptocurrency symbols to fetch (e.g., ['BTC', 'ETH'])
@@ -53,67 +147,21 @@ class CryptoCurrencyRateFetcher(BaseFetcher):
             self.logger.info("Cache hit for all symbols — using cached data only")
             return {"data": cached_map, "errors": {}}
 
-        url = os.getenv("COIN_MARKET_URL")
-        api_key = os.getenv("COIN_MARKET_CAP_API_KEY")
-        headers = {"X-CMC_PRO_API_KEY": api_key, "Accept": "application/json"}
-
-        try:
-            for symbol in missing_symbols:
-                try:
-                    self.logger.info(f"Fetching {symbol} from CoinMarketCap API")
-                    resp = requests.get(
-                        url,
-                        headers=headers,
-                        params={"symbol": symbol, "convert": "USD"},
-                        timeout=15,
-                    )
-                    resp.raise_for_status()
-                    data = resp.json()
-
-                    if "data" not in data or symbol not in data["data"]:
-                        msg = "no_data_in_api_response"
-                        self.logger.warning(f"API returned no data for {symbol}")
-                        errors[symbol] = msg
-                        fetched[symbol] = None
-                        continue
-
-                    fetched[symbol] = data["data"][symbol]
-
-                except requests.exceptions.Timeout:
-                    self.logger.error(f"Timeout when fetching {symbol}")
-                    errors[symbol] = "timeout"
-                    fetched[symbol] = None
-                except requests.exceptions.RequestException as e:
-                    self.logger.error(f"Request error for {symbol}: {e}")
-                    errors[symbol] = f"request_error: {str(e)}"
-                    fetched[symbol] = None
-                except (ValueError, json.JSONDecodeError) as e:
-                    self.logger.error(f"Parsing error for {symbol}: {e}")
-                    errors[symbol] = f"parsing_error: {str(e)}"
-                    fetched[symbol] = None
-                except Exception as e:
-                    self.logger.error(f"Unexpected error for {symbol}: {e}")
-                    errors[symbol] = f"unexpected_error: {str(e)}"
-                    fetched[symbol] = None
-
-            # Cache only successful fetches (non-None)
-            to_cache = {s: v for s, v in fetched.items() if v is not None}
-            if to_cache:
-                try:
-                    self.logger.info(
-                        f"Caching {len(to_cache)} new items: {list(to_cache.keys())}"
-                    )
-                    self.set_cache(self.cache_key_prefix, to_cache)
-                except Exception as e:
-                    self.logger.warning(f"Failed to write fetched items to cache: {e}")
+        for start in range(0, len(missing_symbols), COINMARKETCAP_BATCH_SIZE):
+            self._fetch_batch(
+                missing_symbols[start : start + COINMARKETCAP_BATCH_SIZE],
+                fetched,
+                errors,
+            )
 
-        except Exception as e:
-            self.logger.error(
-                f"Unexpected outer error while fetching missing symbols: {e}"
+        # Cache only successful fetches (non-None)
+        to_cache = {s: v for s, v in fetched.items() if v is not None}
+        if to_cache:
+            # set_cache logs and swallows Redis write errors itself
+            self.logger.info(
+                f"Caching {len(to_cache)} new items: {list(to_cache.keys())}"
             )
-            for sym in missing_symbols:
-                errors.setdefault(sym, f"unexpected_error: {str(e)}")
-                fetched.setdefault(sym, None)
+            self.set_cache(self.cache_key_prefix, to_cache)
 
         final_map = {}
         for sym in symbols:
@@ -181,78 +229,31 @@ class CryptoCurrencyRateFetcher(BaseFetcher):
         Returns:
             Dictionary with update results
         """
-        today = datetime.now(UTC)
-
         try:
-            updated_count = 0
-            errors = []
             self.logger.info(f"Received updates for cryptocurrency data: {crypto_data}")
 
-            # Get all crypto investments that need updating
-            crypto_investments = (
-                db.query(CryptoInvestment)
-                .filter(
-                    CryptoInvestment.coin_symbol.in_(list(crypto_data["data"].keys()))
-                )
-                .all()
+            # USD prices converted to the currency each investment was made in
+            updated_count = valuation_engine.revalue_investments(
+                db,
+                CryptoInvestment,
+                key_column="coin_symbol",
+                quantity_column="coin_quantity",
+                price_column="current_price_per_coin",
+                prices={
+                    symbol: data["price"]
+                    for symbol, data in crypto_data["data"].items()
+                },
+                currency_rate=lambda currency_id: self.get_conversion_rate_from_usd(
+                    self.currency_map.get(currency_id, "INR")
+                ),
+                case_insensitive=True,
             )
 
-            for investment in crypto_investments:
-                currency_symbol = self.currency.get(3)
-                try:
-                    symbol = investment.coin_symbol.upper()
-                    self.logger.info(f"Updating cryptocurrency data for {symbol}")
-                    if symbol in crypto_data["data"]:
-                        current_price = crypto_data["data"][symbol]["price"]
-                        self.logger.info(
-                            f"Current price for {symbol}: {currency_symbol}{current_price}"
-                        )
-
-                        invested_currency = self.currency_map.get(
-                            investment.currency_id, "INR"
-                        )
-                        conversion_rate = self.get_conversion_rate_from_usd(
-                            invested_currency
-                        )
-
-                        current_value = (
-                            current_price * investment.coin_quantity
-                        ) * conversion_rate
-                        initial_investment = investment.total_invested_amount
-                        roi_value = FinancialCalculator.calculate_roi(
-                            current_value, initial_investment
-                        )
-
-                        # updating the crypto investment table with current values and roi
-                        investment.current_price_per_coin = (
-                            current_price * conversion_rate
-                        )
-                        investment.current_total_value = current_value
-                        investment.return_on_investment = roi_value
-
-                        # Calculate XIRR using shared utility
-                        investment.xirr = FinancialCalculator.calculate_xirr(
-                            current_value,
-                            initial_investment,
-                            investment.investment_date,
-                            today.date(),
-                        )
-
-                        updated_count += 1
-                        self.logger.info(
-                            f"Updated {symbol} investment: {currency_symbol}{current_price}"
-                        )
-
-                except Exception as e:
-                    error_msg = f"Error updating investment {investment.id}: {e}"
-                    self.logger.error(error_msg)
-                    errors.append(error_msg)
-
             # Commit all changes
             db.commit()
             self.logger.info(f"Updated {updated_count} crypto investments")
 
-            return {"success": True, "updated_count": updated_count, "errors": errors}
+            return {"success": True, "updated_count": updated_count, "errors": []}
 
         except Exception as e:
             db.rollback()
@@ -273,80 +274,25 @@ class CryptoCurrencyRateFetcher(BaseFetcher):
         """
 
         try:
-            updated_count = 0
-            errors = []
-
-            # Get all crypto investments that need updating
-            crypto_summaries = db.query(CryptoSummary).all()
-            investments = db.query(CryptoInvestment).filter().all()
-
-            currency_symbol = self.currency.get(1)
-            for summary in crypto_summaries:
-                try:
-                    symbol = summary.coin_symbol.upper()
-                    self.logger.info(
-                        f"Updating cryptocurrency summary data for {symbol}"
-                    )
-                    conversion_rate = round(
-                        float(json.loads(self.redis_forex_key_usd_inr)["rate"]), 2
-                    )
-
-                    if symbol in crypto_data["data"]:
-                        current_price_inr = (
-                            crypto_data["data"][symbol]["price"] * conversion_rate
-                        )
-                        self.logger.info(
-                            f"Current price for {symbol} in INR: {currency_symbol}{current_price_inr}"
-                        )
-
-                        current_value = round(
-                            (current_price_inr * summary.total_quantity), 2
-                        )
-
-                        initial_investment = summary.total_cost
-                        roi_value = FinancialCalculator.calculate_roi(
-                            current_value, initial_investment
-                        )
-
-                        # Weighted average XIRR calculation from CryptoInvestment
-                        relevant_investments = [
-                            inv for inv in investments if inv.coin_symbol == symbol
-                        ]
-
-                        if relevant_investments:
-                            total_weighted_xirr = sum(
-                                (investment.total_invested_amount / initial_investment)
-                                * investment.xirr
-                                for investment in relevant_investments
-                            )
-                            self.logger.info(
-                                f"Total weighted xirr calculated is: {round(total_weighted_xirr, 2)}%"
-                            )
-                        else:
-                            total_weighted_xirr = 0.0
-
-                        # Update Summary table
-                        summary.current_price_per_unit = current_price_inr
-                        summary.current_value = current_value
-                        summary.roi = roi_value
-                        summary.xirr = total_weighted_xirr
-                        summary.last_updated = datetime.utcnow()
-
-                        updated_count += 1
-                        self.logger.info(
-                            f"Updated {symbol} investment summary with price: {currency_symbol}{current_price_inr}"
-                        )
-
-                except Exception as e:
-                    error_msg = f"Error updating investment summary {summary.id}: {e}"
-                    self.logger.error(error_msg)
-                    errors.append(error_msg)
+            conversion_rate = self.get_conversion_rate_against_inr("USD")
+            updated_count = valuation_engine.revalue_summaries(
+                db,
+                CryptoSummary,
+                CryptoInvestment,
+                key_column="coin_symbol",
+                prices={
+                    symbol: data["price"] * conversion_rate
+                    for symbol, data in crypto_data["data"].items()
+                },
+                case_insensitive=True,
+            )
 
             # Commit all changes
             db.commit()
             self.logger.info(f"Updated {updated_count} crypto investment summary")
+            change_events.publish(change_events.VALUATION, "refresh")
 
-            return {"success": True, "updated_count": updated_count, "errors": errors}
+            return {"success": True, "updated_count": updated_count, "errors": []}
 
         except Exception as e:
             db.rollback()
@@ -356,4 +302,4 @@ class CryptoCurrencyRateFetcher(BaseFetcher):
 
 
 # Global configuration instance
-CryptoFetcher = CryptoCurrencyRateFetcher()
+CryptoFetcher = LazySingleton(CryptoCurrencyRateFetcher)
@@ -1,9 +1,9 @@
 import json
 from collections import defaultdict
 from datetime import datetime, date
-from typing import Union, Any
+from typing import Union, Any, Dict, List, Tuple
 
-from sqlalchemy import func
+from sqlalchemy import and_, func, literal, or_, select, union_all
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 from sqlalchemy.sql.expression import case
@@ -14,10 +14,24 @@ from backend.models.investments.crypto import CryptoInvestment
 from backend.models.investments.mutual_fund import MutualFundInvestment
 from backend.models.investments.real_estate import RealEstateInvestment
 from backend.models.investments.stock import StockInvestment
+from backend.models.monthly_rollup import MonthlyRollup
 from backend.models.spendings.expense import Expense, ExpenseCategory
 from backend.services.db_services import get_db
+from backend.services.fx_rate_services import (
+    InrAmount,
+    currency_code_expression,
+    fx_rates_ready,
+    inr_amount,
+)
+from backend.services.rollup_services import ensure_monthly_rollups, month_key
 from utilities.common.base_fetcher import BaseFetcher, _build_cache_key
-from utilities.fetch_overall_investment_data import get_portfolio_summary
+from utilities.common.fx_rates import CURRENCY_CODES, fxRates
+from utilities.common.lazy_singleton import LazySingleton
+from utilities.fetch_overall_investment_data import (
+    PORTFOLIO,
+    get_portfolio_summary,
+    get_portfolio_xirr,
+)
 
 
 def _db_dialect_name(db: Session) -> str:
@@ -34,20 +48,29 @@ def _db_dialect_name(db: Session) -> str:
 def _resolve_converted_column(Model, converted_amount: Union[str, Any]):
     """
     Accept either:
-      - a SQL expression (e.g. case(...) returned by get_converted_amount)
+      - an InrAmount or SQL expression (e.g. returned by get_converted_amount)
       - or a string attribute name present on Model (e.g. 'converted_amount')
     Return a SQLAlchemy column/expression to use in queries.
     """
     if isinstance(converted_amount, str):
         return getattr(Model, converted_amount)
+    if isinstance(converted_amount, InrAmount):
+        return converted_amount.expression
     return converted_amount
 
 
+def _join_rates(statement, Model, converted_amount):
+    """Add the rate joins an InrAmount needs to a query over Model."""
+    if isinstance(converted_amount, InrAmount):
+        return converted_amount.join_rates(statement, Model)
+    return statement
+
+
 def get_ytd_sum(db, model, converted_amount, date_field, year_start, today):
     """Get year-to-date sum with currency conversion."""
     col = _resolve_converted_column(model, converted_amount)
     total = (
-        db.query(func.sum(col))
+        _join_rates(db.query(func.sum(col)), model, converted_amount)
         .filter(
             getattr(model, date_field) >= year_start,
             getattr(model, date_field) <= today,
@@ -63,7 +86,7 @@ def get_last_year_sum(
     """Get last year same period sum with currency conversion."""
     col = _resolve_converted_column(model, converted_amount)
     total = (
-        db.query(func.sum(col))
+        _join_rates(db.query(func.sum(col)), model, converted_amount)
         .filter(
             getattr(model, date_field) >= last_year_start,
             getattr(model, date_field) <= last_year_today,
@@ -95,6 +118,19 @@ def _first_day_n_months_ago(ref_date: date, n: int) -> date:
     return date(year, month, 1)
 
 
+def _month_expr(db: Session, date_col):
+    """Return a dialect-specific expression formatting date_col as YYYY-MM."""
+    dialect = _db_dialect_name(db)
+
+    # Choose DB-specific month extractor / formatter
+    if dialect in ("postgresql", "postgres"):
+        return func.to_char(date_col, "YYYY-MM")
+    elif dialect in ("mysql", "mariadb"):
+        return func.date_format(date_col, "%Y-%m")
+    # sqlite and fallback
+    return func.strftime("%Y-%m", date_col)
+
+
 def get_monthly_totals(
         db: Session, Model, converted_amount: Union[str, Any], date_field: str
 ):
@@ -104,21 +140,14 @@ def get_monthly_totals(
     date_field: str (earned_date / spent_date / investment_date)
     """
     col = _resolve_converted_column(Model, converted_amount)
-    date_col = getattr(Model, date_field)
-
-    dialect = _db_dialect_name(db)
-
-    # Choose DB-specific month extractor / formatter
-    if dialect in ("postgresql", "postgres"):
-        month_expr = func.to_char(date_col, "YYYY-MM")
-    elif dialect in ("mysql", "mariadb"):
-        month_expr = func.date_format(date_col, "%Y-%m")
-    else:
-        # sqlite and fallback
-        month_expr = func.strftime("%Y-%m", date_col)
+    month_expr = _month_expr(db, getattr(Model, date_field))
 
     rows = (
-        db.query(month_expr.label("month"), func.sum(col).label("total"))
+        _join_rates(
+            db.query(month_expr.label("month"), func.sum(col).label("total")),
+            Model,
+            converted_amount,
+        )
         .group_by("month")
         .order_by("month")
         .all()
@@ -127,6 +156,162 @@ def get_monthly_totals(
     return [{"month": r.month, "total": float(r.total or 0)} for r in rows]
 
 
+def get_windowed_totals(
+        db: Session,
+        sources: List[Tuple[str, Any, Union[str, Any], str]],
+        windows: Dict[str, Tuple[date, date]],
+        bounded: bool = False,
+) -> Dict[str, dict]:
+    """
+    Compute monthly totals and date-window sums for several models in one query.
+
+    Each source is scanned once, grouped by YYYY-MM, with one conditional SUM per
+    window; the per-source selects are combined with UNION ALL so the whole
+    aggregation is a single round trip.
+
+    Args:
+        db: SQLAlchemy session
+        sources: list of (label, Model, converted_amount, date_field)
+        windows: dict of {window_name: (start_date, end_date)}, both inclusive
+        bounded: only read rows inside one of the windows (monthly totals then
+            cover just those rows)
+
+    Returns:
+        Dict of {label: {"windows": {window_name: total}, "monthly": [{month, total}]}}
+    """
+    selects = []
+    for label, Model, converted_amount, date_field in sources:
+        col = _resolve_converted_column(Model, converted_amount)
+        date_col = getattr(Model, date_field)
+        month_expr = _month_expr(db, date_col)
+        window_cols = [
+            func.sum(
+                case((and_(date_col >= start, date_col <= end), col), else_=0)
+            ).label(name)
+            for name, (start, end) in windows.items()
+        ]
+        statement = select(
+            literal(label).label("source"),
+            month_expr.label("month"),
+            func.sum(col).label("total"),
+            *window_cols,
+        )
+        statement = _join_rates(statement, Model, converted_amount)
+        if bounded:
+            statement = statement.where(
+                or_(
+                    *[
+                        and_(date_col >= start, date_col <= end)
+                        for start, end in windows.values()
+                    ]
+                )
+            )
+        selects.append(statement.group_by(month_expr))
+
+    results = {
+        label: {"windows": dict.fromkeys(windows, 0.0), "monthly": []}
+        for label, *_ in sources
+    }
+    if not selects:
+        return results
+
+    statement = selects[0] if len(selects) == 1 else union_all(*selects)
+    for row in db.execute(statement).mappings():
+        entry = results[row["source"]]
+        entry["monthly"].append(
+            {"month": row["month"], "total": float(row["total"] or 0)}
+        )
+        for name in windows:
+            entry["windows"][name] += float(row[name] or 0)
+
+    for entry in results.values():
+        entry["monthly"].sort(key=lambda m: m["month"])
+
+    return results
+
+
+def get_rollup_windowed_totals(
+        db: Session,
+        sources: List[Tuple[str, Any, Union[str, Any], str]],
+        rollup_converted_amount,
+        windows: Dict[str, Tuple[date, date]],
+) -> Dict[str, dict]:
+    """
+    Same result as get_windowed_totals, read from the monthly_rollup table.
+
+    Whole months come from the rollup rows; only the partial month at the end of
+    each window is summed from the raw transactions, bounded to those days.
+
+    Args:
+        db: SQLAlchemy session
+        sources: list of (label, Model, converted_amount, date_field); the labels
+            are the rollup sources
+        rollup_converted_amount: INR conversion expression over MonthlyRollup
+        windows: dict of {window_name: (start_date, end_date)}, both inclusive;
+            every window must start on the first day of a month
+
+    Returns:
+        Dict of {label: {"windows": {window_name: total}, "monthly": [{month, total}]}}
+    """
+    labels = [label for label, *_ in sources]
+    results = {
+        label: {"windows": dict.fromkeys(windows, 0.0), "monthly": []}
+        for label in labels
+    }
+
+    # Split each window into whole rollup months [start, end month) and the
+    # partial end month, which is read from the raw rows
+    month_ranges = {}
+    tail_windows = {}
+    tail_names = {}
+    for name, (start, end) in windows.items():
+        if start.day != 1:
+            raise ValueError(f"Window {name} must start on the first of a month")
+        if start > end:
+            continue
+        month_ranges[name] = (month_key(start), month_key(end))
+        tail = (date(end.year, end.month, 1), end)
+        if tail not in tail_names:
+            tail_names[tail] = f"tail_{len(tail_names)}"
+            tail_windows[tail_names[tail]] = tail
+
+    rows = (
+        _join_rates(
+            db.query(
+                MonthlyRollup.source,
+                MonthlyRollup.month,
+                func.sum(
+                    _resolve_converted_column(MonthlyRollup, rollup_converted_amount)
+                ).label("total"),
+            ),
+            MonthlyRollup,
+            rollup_converted_amount,
+        )
+        .filter(MonthlyRollup.source.in_(labels))
+        .group_by(MonthlyRollup.source, MonthlyRollup.month)
+        .order_by(MonthlyRollup.month)
+        .all()
+    )
+    for row in rows:
+        total = float(row.total or 0)
+        entry = results[row.source]
+        entry["monthly"].append({"month": row.month, "total": total})
+        for name, (first_month, end_month) in month_ranges.items():
+            if first_month <= row.month < end_month:
+                entry["windows"][name] += total
+
+    if tail_windows:
+        tails = get_windowed_totals(db, sources, tail_windows, bounded=True)
+        for name, (start, end) in windows.items():
+            if name not in month_ranges:
+                continue
+            tail_name = tail_names[(date(end.year, end.month, 1), end)]
+            for label in labels:
+                results[label]["windows"][name] += tails[label]["windows"][tail_name]
+
+    return results
+
+
 def get_spending_by_category(db: Session, ExpenseModel, converted_amount):
     """
     Returns total expense grouped by category NAME instead of category_id.
@@ -135,7 +320,11 @@ def get_spending_by_category(db: Session, ExpenseModel, converted_amount):
     col = _resolve_converted_column(ExpenseModel, converted_amount)
 
     rows = (
-        db.query(ExpenseCategory.name.label("category"), func.sum(col).label("total"))
+        _join_rates(
+            db.query(ExpenseCategory.name.label("category"), func.sum(col).label("total")),
+            ExpenseModel,
+            converted_amount,
+        )
         .join(
             ExpenseCategory,
             ExpenseModel.category_id == ExpenseCategory.expense_category_id,
@@ -153,7 +342,11 @@ class DashboardDataCalculator(BaseFetcher):
         self.db: Session = next(get_db())
         self.cache_key_prefix = "dashboard"
         self.summary = "summary"
-        self.cache_expiry_in_seconds = 86400
+        self.flows = "flows"
+        self.holdings = "holdings"
+        # Sections are invalidated by backend.common.change_events on every write,
+        # so the TTL is only a safety net.
+        self.cache_expiry_in_seconds = 86400 * 7
 
         super().__init__(
             "utilities.dashboard.calculator",
@@ -163,94 +356,97 @@ class DashboardDataCalculator(BaseFetcher):
         self.logger.debug("Dashboard calculator initialized")
 
     def get_converted_amount(
-            self, model, amount_field, currency_field, is_currency_id=False
+            self, model, amount_field, currency_field, is_currency_id=False, name="latest_fx"
     ):
-        """Helper to create currency conversion case statement.
+        """Helper to create the INR conversion of an amount column.
 
-        Creates a SQL CASE statement to convert amounts to INR based on currency.
+        Rates come from the latest fx_rate_daily row of each currency, joined
+        once per query, so the conversion happens in the database while
+        aggregating, for any currency the table holds. Currencies missing from
+        the table (or the whole table, before the first forex fetch) fall back
+        to the in-memory rates.
 
         Args:
             model: SQLAlchemy model class
             amount_field: Name of the amount field to convert
             currency_field: Name of the currency field
             is_currency_id: Whether currency_field is an ID (True) or code (False)
+            name: Alias of the joined rates subquery, unique within a query
 
         Returns:
-            SQL CASE expression for converted amount in INR
+            InrAmount of the converted amount in INR
         """
-        """Helper to create currency conversion case statement."""
-        # Fetch conversion rates once at the start
-        conversion_rates = {
-            "INR": self.get_conversion_rate_against_inr(currency_code="INR"),
-            "USD": self.get_conversion_rate_against_inr(currency_code="USD"),
-            "PLN": self.get_conversion_rate_against_inr(currency_code="PLN"),
-        }
-
-        # Currency ID to code mapping (if using currency_id)
-        currency_id_map = {
-            1: "INR",
-            2: "USD",
-            3: "PLN",
-        }
+        amount = getattr(model, amount_field)
+        currency = getattr(model, currency_field)
 
+        # One snapshot of the shared rate matrix for every branch
+        conversion_rates = fxRates.rates_to("INR")
         if is_currency_id:
             # For models using currency_id (integer)
-            return case(
+            fallback = case(
                 *[
-                    (
-                        getattr(model, currency_field) == currency_id,
-                        getattr(model, amount_field) * conversion_rates[currency_code],
-                    )
-                    for currency_id, currency_code in currency_id_map.items()
+                    (currency == currency_id, conversion_rates[currency_code])
+                    for currency_id, currency_code in CURRENCY_CODES.items()
                 ],
-                else_=getattr(model, amount_field),
+                else_=1.0,
             )
         else:
             # For models using currency (string)
-            return case(
+            fallback = case(
                 *[
-                    (
-                        getattr(model, currency_field) == currency_code,
-                        getattr(model, amount_field) * rate,
-                    )
+                    (currency == currency_code, rate)
                     for currency_code, rate in conversion_rates.items()
                 ],
-                else_=getattr(model, amount_field),
+                else_=1.0,
             )
 
-    def get_investment_data(self) -> dict:
-        """
-        Extended full dashboard analytics including:
-        - YTD & YoY income/expense/investment
-        - Asset values and returns
-        - Real cash balance (calculated)
-        - Emergency fund coverage
-        - Net worth
-        - Savings rate
-        - Category-wise spending
-        - Monthly trends
-        """
+        if not fx_rates_ready(self.db):
+            return InrAmount(amount * fallback)
 
-        # --- Try cache first ---
-        cached_map = self.get_from_cache(self.cache_key_prefix, [self.summary])
-        cached_info = cached_map.get(self.summary)
-        if cached_info:
-            return cached_info
+        return inr_amount(
+            amount, currency_code_expression(currency, is_currency_id), fallback, name
+        )
 
-        # ----- PORTFOLIO SUMMARY -----
-        summary = get_portfolio_summary(self.db)
-        total_cost = sum(v["total_cost"] for v in summary.values())
-        total_current_value = sum(v["current_value"] for v in summary.values())
-        total_returns = total_current_value - total_cost
-        weighted_xirr = (
-            sum(v["xirr"] * v["total_cost"] for v in summary.values()) / total_cost
-            if total_cost
-            else 0
+    def get_rollup_converted_amount(self):
+        """INR conversion of MonthlyRollup.total_amount.
+
+        Income and expense buckets carry a currency code, investment buckets a
+        currency_id; each is converted the same way as its raw transactions.
+        """
+        by_id = self.get_converted_amount(
+            MonthlyRollup, "total_amount", "currency_id", is_currency_id=True, name="fx_by_id"
+        )
+        by_code = self.get_converted_amount(
+            MonthlyRollup, "total_amount", "currency", name="fx_by_code"
+        )
+        return InrAmount(
+            case(
+                (MonthlyRollup.currency_id.isnot(None), by_id.expression),
+                else_=by_code.expression,
+            ),
+            by_id.joins + by_code.joins,
         )
 
-        def safe_get(key, field):
-            return round(summary.get(key, {}).get(field, 0), 2)
+    def _write_section(self, name: str, payload: dict):
+        """Cache one dashboard section as plain JSON under dashboard::<NAME>."""
+        try:
+            self.redis_client.setex(
+                _build_cache_key(self.cache_key_prefix, name),
+                self.cache_expiry_in_seconds,
+                json.dumps(payload),
+            )
+        except Exception as e:
+            self.logger.warning(f"Cache write failed for {self.cache_key_prefix}: {e}")
 
+    def get_holdings_section(self) -> dict:
+        """Portfolio summary per asset class; changes with summary rows and prices."""
+        return get_portfolio_summary(self.db)
+
+    def get_flows_section(self) -> dict:
+        """
+        Income, expense and investment flows: YTD windows, cash balance,
+        emergency fund, savings, spending categories and monthly trends.
+        """
         today = datetime.now().date()
         year_start = date(today.year, 1, 1)
         month_today = today.month
@@ -294,18 +490,73 @@ class DashboardDataCalculator(BaseFetcher):
             is_currency_id=True,
         )
 
+        # ========== SINGLE-PASS AGGREGATION ==========
+        # Every date window and the monthly trends come from the monthly rollup
+        # rows; only the current partial month is read from the raw tables.
+        N = 6
+        start_n_months_ago = _first_day_n_months_ago(today, N - 1)
+        windows = {
+            "ytd": (year_start, today),
+            "last_year_to_date": (last_year_start, last_year_today),
+            "all_time": (date(1970, 1, 1), today),
+            "last_n_months": (start_n_months_ago, today),
+        }
+
+        # investment per-type labels are also the keys of the monthly trends
+        investment_models = [
+            (
+                "Stocks",
+                StockInvestment,
+                stock_investment_converted_amount,
+                "investment_date",
+            ),
+            (
+                "Bullion",
+                BullionInvestment,
+                bullion_investment_converted_amount,
+                "investment_date",
+            ),
+            (
+                "MutualFund",
+                MutualFundInvestment,
+                mutual_fund_converted_amount,
+                "investment_date",
+            ),
+            ("Crypto", CryptoInvestment, crypto_converted_amount, "investment_date"),
+            (
+                "RealEstate",
+                RealEstateInvestment,
+                real_estate_converted_amount,
+                "investment_date",
+            ),
+        ]
+
+        sources = [
+            ("income", Income, income_converted_amount, "earned_date"),
+            ("expense", Expense, expense_converted_amount, "spent_date"),
+            *investment_models,
+        ]
+        try:
+            ensure_monthly_rollups(self.db)
+            totals = get_rollup_windowed_totals(
+                self.db, sources, self.get_rollup_converted_amount(), windows
+            )
+        except SQLAlchemyError as e:
+            # e.g. no DDL rights to create the rollup table; scan the raw rows
+            self.logger.warning(f"Monthly rollups unavailable, scanning raw: {e}")
+            self.db.rollback()
+            totals = get_windowed_totals(self.db, sources, windows)
+        income_windows = totals["income"]["windows"]
+        expense_windows = totals["expense"]["windows"]
+
+        def investment_window(name):
+            return sum(
+                totals[label]["windows"][name] for label, *_ in investment_models
+            )
+
         # ========== INCOME ==========
-        income_ytd = get_ytd_sum(
-            self.db, Income, income_converted_amount, "earned_date", year_start, today
-        )
-        income_last_year_to_date = get_last_year_sum(
-            self.db,
-            Income,
-            income_converted_amount,
-            "earned_date",
-            last_year_start,
-            last_year_today,
-        )
+        income_ytd = income_windows["ytd"]
+        income_last_year_to_date = income_windows["last_year_to_date"]
         income_change = calculate_change(income_ytd, income_last_year_to_date)
 
         income = {
@@ -315,17 +566,8 @@ class DashboardDataCalculator(BaseFetcher):
         }
 
         # ========== EXPENSE ==========
-        expense_ytd = get_ytd_sum(
-            self.db, Expense, expense_converted_amount, "spent_date", year_start, today
-        )
-        expense_last_year_to_date = get_last_year_sum(
-            self.db,
-            Expense,
-            expense_converted_amount,
-            "spent_date",
-            last_year_start,
-            last_year_today,
-        )
+        expense_ytd = expense_windows["ytd"]
+        expense_last_year_to_date = expense_windows["last_year_to_date"]
         monthly_avg_expense = expense_ytd / month_today if month_today > 0 else 0
         expense_change = calculate_change(expense_ytd, expense_last_year_to_date)
         expense_percentage_of_income = (
@@ -341,97 +583,8 @@ class DashboardDataCalculator(BaseFetcher):
         }
 
         # ========== INVESTMENT ==========
-        # Sum all investment types for YTD
-        investment_ytd = sum(
-            [
-                get_ytd_sum(
-                    self.db,
-                    StockInvestment,
-                    stock_investment_converted_amount,
-                    "investment_date",
-                    year_start,
-                    today,
-                ),
-                get_ytd_sum(
-                    self.db,
-                    BullionInvestment,
-                    bullion_investment_converted_amount,
-                    "investment_date",
-                    year_start,
-                    today,
-                ),
-                get_ytd_sum(
-                    self.db,
-                    MutualFundInvestment,
-                    mutual_fund_converted_amount,
-                    "investment_date",
-                    year_start,
-                    today,
-                ),
-                get_ytd_sum(
-                    self.db,
-                    CryptoInvestment,
-                    crypto_converted_amount,
-                    "investment_date",
-                    year_start,
-                    today,
-                ),
-                get_ytd_sum(
-                    self.db,
-                    RealEstateInvestment,
-                    real_estate_converted_amount,
-                    "investment_date",
-                    year_start,
-                    today,
-                ),
-            ]
-        )
-
-        # Sum all investment types for last year
-        investment_last_year_to_date = sum(
-            [
-                get_last_year_sum(
-                    self.db,
-                    StockInvestment,
-                    stock_investment_converted_amount,
-                    "investment_date",
-                    last_year_start,
-                    last_year_today,
-                ),
-                get_last_year_sum(
-                    self.db,
-                    BullionInvestment,
-                    bullion_investment_converted_amount,
-                    "investment_date",
-                    last_year_start,
-                    last_year_today,
-                ),
-                get_last_year_sum(
-                    self.db,
-                    MutualFundInvestment,
-                    mutual_fund_converted_amount,
-                    "investment_date",
-                    last_year_start,
-                    last_year_today,
-                ),
-                get_last_year_sum(
-                    self.db,
-                    CryptoInvestment,
-                    crypto_converted_amount,
-                    "investment_date",
-                    last_year_start,
-                    last_year_today,
-                ),
-                get_last_year_sum(
-                    self.db,
-                    RealEstateInvestment,
-                    real_estate_converted_amount,
-                    "investment_date",
-                    last_year_start,
-                    last_year_today,
-                ),
-            ]
-        )
+        investment_ytd = investment_window("ytd")
+        investment_last_year_to_date = investment_window("last_year_to_date")
 
         investment = {
             "investment": investment_ytd,
@@ -444,105 +597,14 @@ class DashboardDataCalculator(BaseFetcher):
         }
 
         # ========== REAL CASH BALANCE (computed) ==========
-        try:
-            # use get_ytd_sum as a generic range-sum helper (start from a very early date)
-            total_income_till_today = get_ytd_sum(
-                self.db,
-                Income,
-                income_converted_amount,
-                "earned_date",
-                date(1970, 1, 1),
-                today,
-            )
-        except Exception:
-            total_income_till_today = 0
-
-        try:
-            total_expenses_till_today = get_ytd_sum(
-                self.db,
-                Expense,
-                expense_converted_amount,
-                "spent_date",
-                date(1970, 1, 1),
-                today,
-            )
-        except Exception:
-            total_expenses_till_today = 0
-
-        try:
-            total_invested_till_today = (
-                    get_ytd_sum(
-                        self.db,
-                        StockInvestment,
-                        stock_investment_converted_amount,
-                        "investment_date",
-                        date(1970, 1, 1),
-                        today,
-                    )
-                    + get_ytd_sum(
-                self.db,
-                BullionInvestment,
-                bullion_investment_converted_amount,
-                "investment_date",
-                date(1970, 1, 1),
-                today,
-            )
-                    + get_ytd_sum(
-                self.db,
-                MutualFundInvestment,
-                mutual_fund_converted_amount,
-                "investment_date",
-                date(1970, 1, 1),
-                today,
-            )
-                    + get_ytd_sum(
-                self.db,
-                CryptoInvestment,
-                crypto_converted_amount,
-                "investment_date",
-                date(1970, 1, 1),
-                today,
-            )
-                    + get_ytd_sum(
-                self.db,
-                RealEstateInvestment,
-                real_estate_converted_amount,
-                "investment_date",
-                date(1970, 1, 1),
-                today,
-            )
-            )
-        except Exception:
-            total_invested_till_today = 0
-
         cash_balance = (
-                total_income_till_today
-                - total_expenses_till_today
-                - total_invested_till_today
+                income_windows["all_time"]
+                - expense_windows["all_time"]
+                - investment_window("all_time")
         )
 
         # ========== EMERGENCY FUND ==========
-        N = 6
-        start_n_months_ago = _first_day_n_months_ago(today, N - 1)
-
-        try:
-            # We use your get_ytd_sum helper as a general range-sum: start_n_months_ago..today
-            last_6_months_expense = get_ytd_sum(
-                self.db,
-                Expense,
-                expense_converted_amount,
-                "spent_date",
-                start_n_months_ago,
-                today,
-            )
-        except Exception:
-            # fallback: approximate by monthly average * N (if available)
-            try:
-                monthly_avg = expense_ytd / (today.month if today.month else 1)
-                last_6_months_expense = monthly_avg * N
-            except Exception:
-                last_6_months_expense = 0
-
+        last_6_months_expense = expense_windows["last_n_months"]
         monthly_avg_6m = (last_6_months_expense / N) if N else 0
         emergency_required = monthly_avg_6m * 6
         emergency_coverage = (
@@ -553,18 +615,6 @@ class DashboardDataCalculator(BaseFetcher):
         savings_ytd = income_ytd - expense_ytd
         savings_rate = (savings_ytd / income_ytd * 100) if income_ytd > 0 else 0
 
-        # ========== NET WORTH ==========
-        assets = {
-            "Cash": round(cash_balance, 2),
-            "Stocks": safe_get("stocks", "current_value"),
-            "Mutual_Fund": safe_get("mutual_funds", "current_value"),
-            "Gold": safe_get("gold", "current_value"),
-            "Silver": safe_get("silver", "current_value"),
-            "Land": safe_get("real_estate", "current_value"),
-            "Crypto": safe_get("crypto", "current_value"),
-        }
-        net_worth = sum(assets.values())
-
         # ========== SPENDING CATEGORIES ==========
         spending_categories = get_spending_by_category(
             self.db, Expense, expense_converted_amount
@@ -572,48 +622,15 @@ class DashboardDataCalculator(BaseFetcher):
 
         # ========== MONTHLY TRENDS ==========
         monthly_trends = {
-            "income": get_monthly_totals(
-                self.db, Income, income_converted_amount, "earned_date"
-            ),
-            "expense": get_monthly_totals(
-                self.db, Expense, expense_converted_amount, "spent_date"
-            ),
+            "income": totals["income"]["monthly"],
+            "expense": totals["expense"]["monthly"],
         }
 
-        # investment per-type and aggregated
-        investment_models = [
-            (
-                "Stocks",
-                StockInvestment,
-                stock_investment_converted_amount,
-                "investment_date",
-            ),
-            (
-                "Bullion",
-                BullionInvestment,
-                bullion_investment_converted_amount,
-                "investment_date",
-            ),
-            (
-                "MutualFund",
-                MutualFundInvestment,
-                mutual_fund_converted_amount,
-                "investment_date",
-            ),
-            ("Crypto", CryptoInvestment, crypto_converted_amount, "investment_date"),
-            (
-                "RealEstate",
-                RealEstateInvestment,
-                real_estate_converted_amount,
-                "investment_date",
-            ),
-        ]
-
         investments_by_type = {}
         agg_map = defaultdict(float)
 
-        for label, Model, conv_expr, date_field in investment_models:
-            per_type = get_monthly_totals(self.db, Model, conv_expr, date_field)
+        for label, *_ in investment_models:
+            per_type = totals[label]["monthly"]
             investments_by_type[label] = per_type
             for entry in per_type:
                 m = entry.get("month")
@@ -628,6 +645,77 @@ class DashboardDataCalculator(BaseFetcher):
             "aggregated": aggregated_investment,
         }
 
+        return {
+            "income": income,
+            "expense": expense,
+            "investment": investment,
+            "cash_balance": cash_balance,
+            "emergency_coverage": emergency_coverage,
+            "savings_ytd": savings_ytd,
+            "savings_rate": savings_rate,
+            "spending_categories": spending_categories,
+            "monthly_trends": monthly_trends,
+        }
+
+    def get_investment_data(self) -> dict:
+        """
+        Extended full dashboard analytics including:
+        - YTD & YoY income/expense/investment
+        - Asset values and returns
+        - Real cash balance (calculated)
+        - Emergency fund coverage
+        - Net worth
+        - Savings rate
+        - Category-wise spending
+        - Monthly trends
+
+        The summary is assembled from two independently cached sections (flows
+        and holdings) so a write only forces the affected section to recompute.
+        """
+
+        # --- Try cache first ---
+        cached_map = self.get_from_cache(
+            self.cache_key_prefix, [self.summary, self.flows, self.holdings]
+        )
+        cached_info = cached_map.get(self.summary)
+        if cached_info:
+            return cached_info
+
+        flows = cached_map.get(self.flows)
+        if flows is None:
+            flows = self.get_flows_section()
+            self._write_section(self.flows, flows)
+
+        summary = cached_map.get(self.holdings)
+        if summary is None:
+            summary = self.get_holdings_section()
+            self._write_section(self.holdings, summary)
+
+        # ----- PORTFOLIO SUMMARY -----
+        total_cost = sum(v["total_cost"] for v in summary.values())
+        total_current_value = sum(v["current_value"] for v in summary.values())
+        total_returns = total_current_value - total_cost
+        portfolio_xirr = get_portfolio_xirr(
+            self.db, {name: v["current_value"] for name, v in summary.items()}
+        ).get(PORTFOLIO) or 0
+
+        def safe_get(key, field):
+            return round(summary.get(key, {}).get(field, 0), 2)
+
+        cash_balance = flows["cash_balance"]
+
+        # ========== NET WORTH ==========
+        assets = {
+            "Cash": round(cash_balance, 2),
+            "Stocks": safe_get("stocks", "current_value"),
+            "Mutual_Fund": safe_get("mutual_funds", "current_value"),
+            "Gold": safe_get("gold", "current_value"),
+            "Silver": safe_get("silver", "current_value"),
+            "Land": safe_get("real_estate", "current_value"),
+            "Crypto": safe_get("crypto", "current_value"),
+        }
+        net_worth = sum(assets.values())
+
         investment_returns = {
             "Stocks": safe_get("stocks", "xirr"),
             "Mutual_Fund": safe_get("mutual_funds", "xirr"),
@@ -639,31 +727,24 @@ class DashboardDataCalculator(BaseFetcher):
 
         result = {
             "cash_balance": cash_balance,
-            "emergency_coverage": round(emergency_coverage, 2),
-            "income_ytd": income,
-            "expense_avg": expense,
-            "investment_avg": investment,
+            "emergency_coverage": round(flows["emergency_coverage"], 2),
+            "income_ytd": flows["income"],
+            "expense_avg": flows["expense"],
+            "investment_avg": flows["investment"],
             "total_returns": round(total_returns, 2),
-            "average_roi": round(weighted_xirr, 2),
-            "savings_ytd": round(savings_ytd, 2),
-            "savings_rate": round(savings_rate, 2),
+            "average_roi": round(portfolio_xirr, 2),
+            "savings_ytd": round(flows["savings_ytd"], 2),
+            "savings_rate": round(flows["savings_rate"], 2),
             "assets": assets,
             "net_worth": round(net_worth, 2),
-            "spending_categories": spending_categories,
+            "spending_categories": flows["spending_categories"],
             "investment_returns": investment_returns,
         }
 
-        try:
-
-            self.redis_client.setex(
-                _build_cache_key(self.cache_key_prefix, self.summary), self.cache_expiry_in_seconds, json.dumps(result)
-            )
-        except Exception as e:
-            self.logger.warning(f"Cache write failed for {self.cache_key_prefix}: {e}")
-            pass
+        self._write_section(self.summary, result)
 
         return result
 
 
 # Global configuration instance
-dashboardDataCalculator = DashboardDataCalculator()
+dashboardDataCalculator = LazySingleton(DashboardDataCalculator)
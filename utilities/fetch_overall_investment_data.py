@@ -1,11 +1,25 @@
-from sqlalchemy import select, func
+from datetime import date
+from typing import Dict, Optional
+
+from sqlalchemy import select, func, literal
 from sqlalchemy.orm import Session
 
-from backend.models.investments.bullion import BullionSummary
-from backend.models.investments.crypto import CryptoSummary
-from backend.models.investments.mutual_fund import MutualFundSummary
-from backend.models.investments.real_estate import RealEstateSummary
-from backend.models.investments.stock import StockSummary, DividendSummary
+from backend.models.investments.bullion import BullionInvestment, BullionSummary
+from backend.models.investments.crypto import CryptoInvestment, CryptoSummary
+from backend.models.investments.mutual_fund import (
+    MutualFundInvestment,
+    MutualFundSummary,
+)
+from backend.models.investments.real_estate import (
+    RealEstateInvestment,
+    RealEstateSummary,
+)
+from backend.models.investments.stock import (
+    DividendSummary,
+    StockInvestment,
+    StockSummary,
+)
+from utilities.common.xirr_engine import CashFlowBook
 
 
 def get_investments_symbols(db: Session):
@@ -33,9 +47,57 @@ def get_all_investments(db: Session):
     return {name: db.query(model).all() for name, model in models.items()}
 
 
+PORTFOLIO = "portfolio"
+
+INVESTMENT_MODELS = {
+    "stocks": StockInvestment,
+    "mutual_funds": MutualFundInvestment,
+    "bullion": BullionInvestment,
+    "real_estate": RealEstateInvestment,
+    "crypto": CryptoInvestment,
+}
+
+
+def get_portfolio_xirr(db: Session, current_values: Dict[str, float]) -> Dict[str, Optional[float]]:
+    """
+    XIRR of each asset and of the whole portfolio from their dated cash flows.
+
+    Every BUY is money in, every SELL is money out, and the current value of
+    each asset counts as money out today. Dividends are already part of the
+    stock summaries' current value. Bullion is keyed per metal (lower case).
+
+    Args:
+        db: Database session
+        current_values: Mapping of asset (as in get_portfolio_summary) to current value
+
+    Returns:
+        Mapping of asset, plus PORTFOLIO, to XIRR percentage (None if unsolvable)
+    """
+    book = CashFlowBook()
+    for name, model in INVESTMENT_MODELS.items():
+        key_column = model.metal_name if name == "bullion" else literal(name)
+        rows = db.query(
+            key_column,
+            model.transaction_type,
+            model.investment_date,
+            model.total_invested_amount,
+            model.total_amount_after_sale,
+        )
+        for asset, transaction_type, invested_on, invested, proceeds in rows:
+            amount = proceeds if transaction_type == "SELL" else -invested
+            book.add(asset.lower(), invested_on, amount)
+            book.add(PORTFOLIO, invested_on, amount)
+
+    today = date.today()
+    for asset, value in current_values.items():
+        book.add(asset, today, value)
+        book.add(PORTFOLIO, today, value)
+    return book.xirr()
+
+
 def get_portfolio_summary(db: Session):
     """
-        Aggregate portfolio totals and weighted XIRR across all asset types.
+        Aggregate portfolio totals and cash-flow XIRR across all asset types.
         Bullion is grouped per metal_name; others are summed.
         """
 
@@ -55,7 +117,6 @@ def get_portfolio_summary(db: Session):
                 model.metal_name,
                 func.sum(model.total_cost).label('total_cost'),
                 func.sum(model.current_value).label('current_value'),
-                (func.sum(model.xirr * model.total_cost) / func.sum(model.total_cost)).label('xirr')
             ).group_by(model.metal_name)
 
             results = db.execute(query).all()
@@ -65,7 +126,6 @@ def get_portfolio_summary(db: Session):
                 summary[metal_name] = {
                     "total_cost": float(r.total_cost or 0),
                     "current_value": float(r.current_value or 0),
-                    "xirr": round(float(r.xirr or 0), 2),
                 }
 
         else:
@@ -73,18 +133,20 @@ def get_portfolio_summary(db: Session):
                 select(
                     func.sum(model.total_cost).label("total_cost"),
                     func.sum(model.current_value).label("current_value"),
-                    (
-                            func.sum(model.xirr * model.total_cost) / func.nullif(func.sum(model.total_cost), 0)
-                    ).label("xirr"),
                 )
             ).first()
 
             summary[name] = {
                 "total_cost": float(result.total_cost or 0),
                 "current_value": float(result.current_value or 0),
-                "xirr": round(float(result.xirr or 0), 2),
             }
 
+    xirr = get_portfolio_xirr(
+        db, {name: values["current_value"] for name, values in summary.items()}
+    )
+    for name, values in summary.items():
+        values["xirr"] = round(xirr.get(name) or 0, 2)
+
     return summary
 
 
@@ -1,10 +1,15 @@
 import json
 from datetime import datetime, timezone
 from decimal import Decimal
+from typing import Dict, Optional
 
 import requests
+from sqlalchemy.orm import Session
 
 from utilities.common.base_fetcher import BaseFetcher
+from utilities.common.fx_rates import CURRENCIES, fxRates
+from utilities.common.http_client import http_client
+from utilities.common.lazy_singleton import LazySingleton
 
 
 class ForexExchangeRateFetcher(BaseFetcher):
@@ -51,7 +56,7 @@ class ForexExchangeRateFetcher(BaseFetcher):
         self.logger.info(f"Fetching exchange rates from {url}")
 
         try:
-            response = requests.get(url, timeout=15)
+            response = http_client("open_exchange").get(url, timeout=15)
             response.raise_for_status()
 
             data = response.json()
@@ -68,6 +73,7 @@ class ForexExchangeRateFetcher(BaseFetcher):
 
             try:
                 self.set_cache(cache_key, {currency_pair: payload})
+                fxRates.invalidate()
                 self.logger.info(
                     f"Cached exchange rate {from_currency}->{to_currency}: {exchange_rate}"
                 )
@@ -88,6 +94,75 @@ class ForexExchangeRateFetcher(BaseFetcher):
             self.logger.error(f"Unexpected error fetching exchange rate: {e}")
             return Decimal("1.0")
 
+    def fetch_latest_rates(self, base_currency: str = "USD") -> Dict[str, float]:
+        """Fetch the rates of every quoted currency against base_currency in one request.
+
+        Returns:
+            Dict of currency code -> units per one base_currency, empty on failure
+        """
+        url = f"{self.open_exchange_url}{self.open_exchange_api_key}/latest/{base_currency.upper()}"
+        self.logger.info(f"Fetching all exchange rates against {base_currency.upper()}")
+
+        try:
+            response = http_client("open_exchange").get(url, timeout=15)
+            response.raise_for_status()
+            rates = response.json().get("conversion_rates") or {}
+            return {code.upper(): float(rate) for code, rate in rates.items() if rate}
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"Request error fetching exchange rates: {e}")
+        except (ValueError, AttributeError, TypeError) as e:
+            self.logger.error(f"Error parsing exchange rates response: {e}")
+        return {}
+
+    def cache_pair_rates(self, units_per_usd: Dict[str, float]):
+        """Cache every pair of the tracked currencies, derived from USD quotes."""
+        cached_at = datetime.now(timezone.utc).isoformat()
+        pairs = {}
+        for from_currency in CURRENCIES:
+            for to_currency in CURRENCIES:
+                if from_currency == to_currency:
+                    continue
+                if not units_per_usd.get(from_currency) or not units_per_usd.get(
+                    to_currency
+                ):
+                    continue
+                rate = Decimal(str(units_per_usd[to_currency])) / Decimal(
+                    str(units_per_usd[from_currency])
+                )
+                pairs[f"{from_currency}-{to_currency}"] = {
+                    "from": from_currency,
+                    "to": to_currency,
+                    "rate": str(rate),
+                    "cached_at": cached_at,
+                    "source": "open-exchange",
+                }
+        self.set_cache(self.cache_key_prefix, pairs)
+        fxRates.invalidate()
+
+    def refresh_rates(self, db: Optional[Session] = None) -> int:
+        """Fetch today's rates once, cache the tracked pairs and store the day in SQL.
+
+        Returns:
+            Number of currencies stored (0 when the fetch failed)
+        """
+        # Imported here so fetchers that never persist rates don't load the models
+        from backend.services.db_services import session_scope
+        from backend.services.fx_rate_services import record_daily_rates
+
+        units_per_usd = self.fetch_latest_rates("USD")
+        if not units_per_usd:
+            return 0
+        units_per_usd["USD"] = 1.0
+
+        self.cache_pair_rates(units_per_usd)
+        with session_scope(db) as session:
+            return record_daily_rates(
+                session,
+                datetime.now(timezone.utc).date(),
+                units_per_usd,
+                "open-exchange",
+            )
+
 
 # Global configuration instance
-forexFetcher = ForexExchangeRateFetcher()
+forexFetcher = LazySingleton(ForexExchangeRateFetcher)
@@ -1,14 +1,17 @@
 import json
 import os
-from datetime import datetime, timezone, UTC
+from datetime import datetime, timezone
 from typing import Dict
 
 import requests
 from sqlalchemy.orm import Session
 
+from backend.common import change_events
 from backend.models.investments.bullion import BullionInvestment, BullionSummary
 from utilities.common.base_fetcher import BaseFetcher
-from utilities.common.financial_utils import FinancialCalculator
+from utilities.common.http_client import http_client
+from utilities.common.lazy_singleton import LazySingleton
+from utilities.common import valuation_engine
 
 
 class MetalRateFetcher(BaseFetcher):
@@ -113,7 +116,9 @@ class MetalRateFetcher(BaseFetcher):
 
         try:
             self.logger.info(f"Fetching {metal} rate from RapidAPI for city: {city}")
-            response = requests.get(endpoint, headers=headers, timeout=30)
+            response = http_client("rapidapi_bullion").get(
+                endpoint, headers=headers, timeout=30
+            )
             response.raise_for_status()
 
             data = response.json()
@@ -193,6 +198,16 @@ class MetalRateFetcher(BaseFetcher):
             self.logger.error(f"Error extracting {metal} rate from response: {e}")
             return None
 
+    def _current_prices(self, bullion_data: Dict) -> Dict[str, float]:
+        """Drop metals without a price so their rows are left untouched."""
+        prices = {}
+        for metal, current_price in bullion_data.items():
+            if current_price is None:
+                self.logger.warning(f"Skipping update for {metal} as price is None")
+                continue
+            prices[metal] = current_price
+        return prices
+
     def update_bullion_investments(self, db: Session, bullion_data: Dict) -> Dict:
         """Update bullion investment records with current prices.
 
@@ -209,67 +224,21 @@ class MetalRateFetcher(BaseFetcher):
                 - 'updated_count': Number of investments successfully updated
                 - 'errors': List of error messages (if success=True) or single error (if success=False)
         """
-
-        today = datetime.now(UTC)
-        updated_count = 0
-        errors = []
         try:
-            for metal, current_price in bullion_data.items():
-                # Get all bullion investments that need updating
-                bullion_investments = (
-                    db.query(BullionInvestment)
-                    .filter(BullionInvestment.metal_name == metal)
-                    .all()
-                )
-
-                currency_symbol = "₹"
-                if current_price is None:
-                    self.logger.warning(f"Skipping update for {metal} as price is None")
-                    continue
-
-                for investment in bullion_investments:
-                    try:
-                        self.logger.info(
-                            f"Updating Bullion investment data for {metal}"
-                        )
-                        self.logger.info(
-                            f"Current price for {metal} in INR: {currency_symbol}{current_price}"
-                        )
-
-                        current_value = current_price * investment.quantity_in_grams
-                        initial_investment = investment.total_invested_amount
-
-                        # Update current price and calculated fields
-                        investment.current_price_per_gram = current_price
-                        investment.current_total_value = current_value
-
-                        roi_value = FinancialCalculator.calculate_roi(
-                            investment.current_total_value, initial_investment
-                        )
-                        # Calculate return on investment
-                        investment.return_on_investment = roi_value
-
-                        # Calculate XIRR (simplified version) using shared utility
-                        investment.xirr = FinancialCalculator.calculate_xirr(
-                            current_value,
-                            initial_investment,
-                            investment.investment_date,
-                            today.date(),
-                        )
-
-                        updated_count += 1
-                        self.logger.debug(
-                            f"Updated {metal} investment: ${current_price}"
-                        )
-
-                    except Exception as e:
-                        self.logger.error(f"Failed to update {metal} investment: {e}")
+            updated_count = valuation_engine.revalue_investments(
+                db,
+                BullionInvestment,
+                key_column="metal_name",
+                quantity_column="quantity_in_grams",
+                price_column="current_price_per_gram",
+                prices=self._current_prices(bullion_data),
+            )
 
             # Commit all changes
             db.commit()
             self.logger.info(f"Updated {updated_count} bullion investments")
 
-            return {"success": True, "updated_count": updated_count, "errors": errors}
+            return {"success": True, "updated_count": updated_count, "errors": []}
 
         except Exception as e:
             db.rollback()
@@ -281,7 +250,7 @@ class MetalRateFetcher(BaseFetcher):
         """Update bullion summary records with current prices.
 
         Updates all bullion summary records in the database with current metal prices,
-        recalculating aggregated values, ROI, and weighted average XIRR.
+        recalculating aggregated values, ROI, and XIRR over each holding's cash flows.
 
         Args:
             db: Database session
@@ -293,87 +262,21 @@ class MetalRateFetcher(BaseFetcher):
                 - 'updated_count': Number of summaries successfully updated
                 - 'errors': List of error messages (if success=True) or single error (if success=False)
         """
-        updated_count = 0
-        errors = []
-
         try:
-            for metal, current_price in bullion_data.items():
-                # Get all crypto investments that need updating
-                bullion_summaries = (
-                    db.query(BullionSummary)
-                    .filter(BullionSummary.metal_name == metal)
-                    .all()
-                )
-                investments = (
-                    db.query(BullionInvestment)
-                    .filter(BullionInvestment.metal_name == metal)
-                    .all()
-                )
-
-                currency_symbol = "₹"
-                if current_price is None:
-                    self.logger.warning(
-                        f"Skipping summary update for {metal} as price is None"
-                    )
-                    continue
-
-                for summary in bullion_summaries:
-                    try:
-                        self.logger.info(f"Updating Bullion Summary data for {metal}")
-                        self.logger.info(
-                            f"Current price for {metal} in INR: {currency_symbol}{current_price}"
-                        )
-
-                        current_value = round(
-                            (current_price * summary.total_quantity), 2
-                        )
-
-                        initial_investment = summary.total_cost
-                        roi_value = FinancialCalculator.calculate_roi(
-                            current_value, initial_investment
-                        )
-
-                        # Weighted average XIRR calculation from Bullion Investment
-                        relevant_investments = [
-                            inv for inv in investments if inv.metal_name == metal
-                        ]
-
-                        if relevant_investments:
-                            total_weighted_xirr = sum(
-                                (investment.total_invested_amount / initial_investment)
-                                * investment.xirr
-                                for investment in relevant_investments
-                            )
-                            self.logger.info(
-                                f"Total weighted xirr calculated is: {round(total_weighted_xirr, 2)}%"
-                            )
-                        else:
-                            total_weighted_xirr = 0.0
-
-                        # Update Summary table
-                        summary.current_price_per_unit = current_price
-                        summary.current_value = current_value
-                        summary.roi = roi_value
-                        summary.xirr = total_weighted_xirr
-                        summary.last_updated = datetime.now(UTC)
-
-                        updated_count += 1
-                        self.logger.info(
-                            f"Updated {metal} investment summary with price: {currency_symbol}{current_price}"
-                        )
-
-                    except Exception as e:
-                        error_msg = (
-                            f"Error updating investment summary {summary.id}: {e}"
-                        )
-                        self.logger.error(error_msg)
-                        errors.append(error_msg)
+            updated_count = valuation_engine.revalue_summaries(
+                db,
+                BullionSummary,
+                BullionInvestment,
+                key_column="metal_name",
+                prices=self._current_prices(bullion_data),
+            )
 
             # Commit all changes
             db.commit()
             self.logger.info(f"Updated {updated_count} bullion investment summary")
+            change_events.publish(change_events.VALUATION, "refresh")
 
-            return {"success": True, "updated_count": updated_count, "errors": errors}
+            return {"success": True, "updated_count": updated_count, "errors": []}
 
         except Exception as e:
             db.rollback()
@@ -383,4 +286,4 @@ class MetalRateFetcher(BaseFetcher):
 
 
 # Global configuration instance
-bullionFetcher = MetalRateFetcher()
+bullionFetcher = LazySingleton(MetalRateFetcher)
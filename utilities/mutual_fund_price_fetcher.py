@@ -1,17 +1,22 @@
 import json
-from datetime import datetime, UTC
-from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict
 
 import requests
 from sqlalchemy.orm import Session
 
+from backend.common import change_events
 from backend.models.investments.mutual_fund import (
     MutualFundInvestment,
     MutualFundSummary,
 )
+from utilities.common.amfi_nav import load_nav_index
+from utilities.common.app_config import config
 from utilities.common.base_fetcher import BaseFetcher
-from utilities.common.financial_utils import FinancialCalculator
+from utilities.common.http_client import http_client
+from utilities.common.lazy_singleton import LazySingleton
+from utilities.common.rate_limiter import TokenBucket
+from utilities.common import valuation_engine
 
 
 class MutualFundPriceFetcher(BaseFetcher):
@@ -27,6 +32,13 @@ class MutualFundPriceFetcher(BaseFetcher):
         self.cache_expiry_in_seconds = 86400
         self.cache_key_prefix = "mutual_fund"
 
+        # Bulk NAV file, then concurrency and rate limit for per-scheme requests
+        self.nav_source = config.AMFI_NAV_SOURCE
+        self.max_workers = config.MF_MAX_WORKERS
+        self.rate_limiter = TokenBucket(
+            rate=config.MF_REQUESTS_PER_SECOND, capacity=config.MF_MAX_WORKERS
+        )
+
         super().__init__(
             "utilities.mutual_fund_fetcher",
             self.cache_key_prefix,
@@ -35,63 +47,103 @@ class MutualFundPriceFetcher(BaseFetcher):
         self.logger.debug("Mutual fund fetcher initialized")
 
     def get_mutual_fund_rates_bulk(self, scheme_code_list: list):
-        """Fetch Mutual Fund NAVs for multiple scheme codes with caching"""
+        """
+        Fetch Mutual Fund NAVs for multiple scheme codes with caching.
+
+        Cache misses are priced from AMFI's all-schemes NAV file first, one
+        download for any number of schemes. Schemes the file does not list
+        (or all of them, when it is unavailable) are fetched from RapidAPI
+        concurrently by a bounded thread pool, every request taking a token
+        from a shared bucket to stay within the API's rate limit.
+
+        Args:
+            scheme_code_list: AMFI scheme codes
+
+        Returns:
+            Dictionary mapping scheme codes to NAV data (None when not found)
+        """
         results = {}
         cached_map = self.get_from_cache(self.cache_key_prefix, scheme_code_list)
         missing_schemes = [scheme for scheme, val in cached_map.items() if val is None]
+        fetched = {}
 
         if missing_schemes:
             self.logger.info(
                 f"Cache miss for {len(missing_schemes)} mutual fund(s): {missing_schemes}"
             )
-            for scheme_code in missing_schemes:
-                try:
-                    self.logger.info(
-                        f"Fetching data from Rapid API for scheme: {scheme_code}"
-                    )
-                    endpoint = f"{self.mf_base_url}{scheme_code}"
-                    headers = {
-                        "x-rapidapi-host": self.rapid_api_mf_host,
-                        "x-rapidapi-key": self.rapid_api_key,
+            fetched.update(self._navs_from_amfi(missing_schemes))
+            remaining = [scheme for scheme in missing_schemes if scheme not in fetched]
+
+            if remaining:
+                workers = max(1, min(self.max_workers, len(remaining)))
+                with ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="mf-fetch"
+                ) as pool:
+                    futures = {
+                        pool.submit(self._fetch_scheme_nav, scheme_code): scheme_code
+                        for scheme_code in remaining
                     }
+                    for future in as_completed(futures):
+                        scheme_code = futures[future]
+                        try:
+                            fetched[scheme_code] = future.result()
+                        except requests.exceptions.RequestException as e:
+                            self.logger.error(f"Request failed for {scheme_code}: {e}")
+                        except json.JSONDecodeError as e:
+                            self.logger.error(
+                                f"Failed to parse JSON for {scheme_code}: {e}"
+                            )
+                        except Exception as e:
+                            self.logger.error(
+                                f"Unexpected error for {scheme_code}: {e}"
+                            )
 
-                    response = requests.get(endpoint, headers=headers, timeout=30)
-                    response.raise_for_status()
-                    data = response.json()
-                    mf_data = data["data"]
-
-                    # Store in cache
-                    try:
-                        self.set_cache(
-                            f"{self.cache_key_prefix}", {scheme_code: mf_data}
-                        )
-                        self.logger.info(
-                            f"Cached NAV for {mf_data['Fund_Name']} successfully"
-                        )
-                    except Exception as e:
-                        self.logger.warning(
-                            f"Failed to cache NAV for {scheme_code}: {e}"
-                        )
-
-                    results[scheme_code] = mf_data
-
-                except requests.exceptions.RequestException as e:
-                    self.logger.error(f"Request failed for {scheme_code}: {e}")
-                    results[scheme_code] = None
-                except json.JSONDecodeError as e:
-                    self.logger.error(f"Failed to parse JSON for {scheme_code}: {e}")
-                    results[scheme_code] = None
-                except Exception as e:
-                    self.logger.error(f"Unexpected error for {scheme_code}: {e}")
-                    results[scheme_code] = None
+            # Store in cache
+            try:
+                self.set_cache(self.cache_key_prefix, fetched)
+            except Exception as e:
+                self.logger.warning(f"Failed to cache mutual fund NAVs: {e}")
 
         # Merge cached and newly fetched data
         for scheme_code, cached_val in cached_map.items():
-            if cached_val is not None:
-                results[scheme_code] = cached_val
+            results[scheme_code] = (
+                cached_val if cached_val is not None else fetched.get(scheme_code)
+            )
 
         return results
 
+    def _navs_from_amfi(self, scheme_codes: list) -> Dict[str, dict]:
+        """NAVs of the given schemes from the AMFI NAV file, {} when it is unavailable."""
+        if not self.nav_source:
+            return {}
+        try:
+            navs = load_nav_index(self.nav_source, scheme_codes)
+        except Exception as e:
+            self.logger.warning(f"⚠️ AMFI NAV file unavailable ({self.nav_source}): {e}")
+            return {}
+        self.logger.info(
+            f"Priced {len(navs)}/{len(scheme_codes)} mutual fund(s) from the AMFI NAV file"
+        )
+        return navs
+
+    def _fetch_scheme_nav(self, scheme_code: str) -> dict:
+        """Fetch one scheme's NAV from RapidAPI, rate limited."""
+        self.rate_limiter.acquire()
+        self.logger.info(f"Fetching data from Rapid API for scheme: {scheme_code}")
+        endpoint = f"{self.mf_base_url}{scheme_code}"
+        headers = {
+            "x-rapidapi-host": self.rapid_api_mf_host,
+            "x-rapidapi-key": self.rapid_api_key,
+        }
+
+        response = http_client("rapidapi_mf").get(endpoint, headers=headers, timeout=30)
+        response.raise_for_status()
+        mf_data = response.json()["data"]
+        self.logger.info(
+            f"✅ {scheme_code}: NAV {mf_data['NAV']} for {mf_data['Fund_Name']}"
+        )
+        return mf_data
+
     def update_mutual_fund_investments(self, db: Session, mf_data: Dict) -> Dict:
         """Update mutual fund investment records with current NAVs.
 
@@ -108,66 +160,22 @@ class MutualFundPriceFetcher(BaseFetcher):
                 - 'updated_count': Number of investments successfully updated
                 - 'errors': List of error messages (if success=True) or single error (if success=False)
         """
-
-        today = datetime.now(UTC)
-        updated_count = 0
-        errors = []
         try:
-            for scheme_code, data in mf_data.items():
-                # Get all bullion investments that need updating
-                mutual_fund_investments = (
-                    db.query(MutualFundInvestment)
-                    .filter(
-                        MutualFundInvestment.scheme_code == scheme_code,
-                        MutualFundInvestment.transaction_type == "BUY",
-                    )
-                    .all()
-                )
-                nav = Decimal(data["NAV"])
-                currency_symbol = "₹"
-                for investment in mutual_fund_investments:
-                    try:
-                        self.logger.info(
-                            f"Updating Mutual Fund investment data for {mf_data[scheme_code]['Fund_Name']}"
-                        )
-                        self.logger.info(
-                            f"Current price for scheme code: {scheme_code} in INR is: {currency_symbol}{nav}"
-                        )
-
-                        current_value = float(nav * investment.unit_quantity)
-                        initial_investment = investment.total_invested_amount
-                        roi_value = FinancialCalculator.calculate_roi(
-                            current_value, initial_investment
-                        )
-
-                        # Calculate XIRR using shared utility
-                        investment.xirr = FinancialCalculator.calculate_xirr(
-                            current_value,
-                            initial_investment,
-                            investment.investment_date,
-                            today.date(),
-                        )
-
-                        # Updating the investment table
-                        investment.current_price_per_unit = nav
-                        investment.current_total_value = current_value
-                        investment.return_on_investment = roi_value
-
-                        updated_count += 1
-                        self.logger.debug(
-                            f"Updated {mf_data[scheme_code]['Fund_Name']}  with nav: {currency_symbol}{nav}"
-                        )
-
-                    except Exception as e:
-                        self.logger.error(
-                            f"Failed to update {mf_data[scheme_code]['Fund_Name']} investment: {e}"
-                        )
+            updated_count = valuation_engine.revalue_investments(
+                db,
+                MutualFundInvestment,
+                key_column="scheme_code",
+                quantity_column="unit_quantity",
+                price_column="current_price_per_unit",
+                prices={code: float(data["NAV"]) for code, data in mf_data.items()},
+                filters=(MutualFundInvestment.transaction_type == "BUY",),
+            )
 
             # Commit all changes
             db.commit()
             self.logger.info(f"Updated {updated_count} mutual fund investments")
 
-            return {"success": True, "updated_count": updated_count, "errors": errors}
+            return {"success": True, "updated_count": updated_count, "errors": []}
 
         except Exception as e:
             db.rollback()
@@ -179,7 +187,7 @@ class MutualFundPriceFetcher(BaseFetcher):
         """Update mutual fund summary records with current NAVs.
 
         Updates all mutual fund summary records in the database with current NAV prices,
-        recalculating aggregated values, ROI, and weighted average XIRR.
+        recalculating aggregated values, ROI, and XIRR over each holding's cash flows.
 
         Args:
             db: Database session
@@ -191,82 +199,21 @@ class MutualFundPriceFetcher(BaseFetcher):
                 - 'updated_count': Number of summaries successfully updated
                 - 'errors': List of error messages (if success=True) or single error (if success=False)
         """
-        updated_count = 0
-        errors = []
-
         try:
-            for scheme_code, data in mf_data.items():
-                # Get all mutual fund investments that need updating
-                mf_summaries = (
-                    db.query(MutualFundSummary)
-                    .filter(MutualFundSummary.scheme_code == scheme_code)
-                    .all()
-                )
-                investments = (
-                    db.query(MutualFundInvestment)
-                    .filter(MutualFundInvestment.scheme_code == scheme_code)
-                    .all()
-                )
-
-                nav = float(data["NAV"])
-                currency_symbol = "₹"
-                for summary in mf_summaries:
-                    try:
-                        self.logger.info(
-                            f"Updating Mutual Fund Summary data for {mf_data[scheme_code]['Fund_Name']}"
-                        )
-                        self.logger.info(
-                            f"Current price for scheme code: {scheme_code} in INR is: {currency_symbol}{nav}"
-                        )
-
-                        current_value = round((nav * summary.total_quantity), 2)
-
-                        initial_investment = summary.total_cost
-                        roi_value = FinancialCalculator.calculate_roi(
-                            current_value, initial_investment
-                        )
-
-                        # Weighted average XIRR calculation from Bullion Investment
-                        relevant_investments = [
-                            inv for inv in investments if inv.scheme_code == scheme_code
-                        ]
-
-                        if relevant_investments:
-                            total_weighted_xirr = sum(
-                                (investment.total_invested_amount / initial_investment)
-                                * investment.xirr
-                                for investment in relevant_investments
-                            )
-                            self.logger.info(
-                                f"Total weighted xirr calculated is: {round(total_weighted_xirr, 2)}%"
-                            )
-                        else:
-                            total_weighted_xirr = 0.0
-
-                        # Update Summary table
-                        summary.current_price_per_unit = nav
-                        summary.current_value = current_value
-                        summary.roi = roi_value
-                        summary.xirr = total_weighted_xirr
-                        summary.last_updated = datetime.now(UTC)
-
-                        updated_count += 1
-                        self.logger.info(
-                            f"Updated {mf_data[scheme_code]['Fund_Name']} investment summary with price: {currency_symbol}{nav}"
-                        )
-
-                    except Exception as e:
-                        error_msg = (
-                            f"Error updating investment summary {summary.id}: {e}"
-                        )
-                        self.logger.error(error_msg)
-                        errors.append(error_msg)
+            updated_count = valuation_engine.revalue_summaries(
+                db,
+                MutualFundSummary,
+                MutualFundInvestment,
+                key_column="scheme_code",
+                prices={code: float(data["NAV"]) for code, data in mf_data.items()},
+            )
 
             # Commit all changes
             db.commit()
             self.logger.info(f"Updated {updated_count} mutual fund investment summary")
+            change_events.publish(change_events.VALUATION, "refresh")
 
-            return {"success": True, "updated_count": updated_count, "errors": errors}
+            return {"success": True, "updated_count": updated_count, "errors": []}
 
         except Exception as e:
             db.rollback()
@@ -276,4 +223,4 @@ class MutualFundPriceFetcher(BaseFetcher):
 
 
 # Global configuration instance
-mutualFundFetcher = MutualFundPriceFetcher()
+mutualFundFetcher = LazySingleton(MutualFundPriceFetcher)
@@ -4,6 +4,7 @@ from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
 from utilities.common.financial_utils import FinancialCalculator
+from backend.common import change_events
 from backend.models.investments.real_estate import (
     RealEstateInvestment,
     RealEstateSummary,
@@ -102,8 +103,6 @@ def update_real_estate_summary(
     # Calculate the data:
     today = datetime.now(UTC)
     current_value = current_price_per_sqyds * real_estate_investment.area_in_sqyds
-    days_invested = (today.date() - real_estate_investment.investment_date).days
-    years = days_invested / 365.0
     initial_investment = real_estate_investment.total_invested_amount
 
     # Update current value
@@ -112,12 +111,16 @@ def update_real_estate_summary(
     real_estate_summary.roi = FinancialCalculator.calculate_roi(
         current_value, initial_investment
     )
-    real_estate_summary.xirr = (
-        (((current_value / initial_investment) ** (1 / years)) - 1) * 100
-        if years > 0
-        else 0.0
+    real_estate_summary.xirr = FinancialCalculator.calculate_xirr(
+        current_value,
+        initial_investment,
+        real_estate_investment.investment_date,
+        today.date(),
     )
     real_estate_summary.last_updated = today.now(UTC)
 
     db.commit()
     db.refresh(real_estate_summary)
+    change_events.publish(
+        change_events.VALUATION, "refresh", real_estate_investment.investor
+    )
@@ -1,14 +1,138 @@
+import random
 import time
-from datetime import datetime, UTC
-from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict
 
 import yfinance as yf
 from sqlalchemy.orm import Session
 
+from utilities.common.app_config import config
 from utilities.common.base_fetcher import BaseFetcher
-from utilities.common.financial_utils import FinancialCalculator
-from backend.models.investments.stock import StockInvestment, StockSummary
+from utilities.common.lazy_singleton import LazySingleton
+from utilities.common.rate_limiter import TokenBucket
+from utilities.common import valuation_engine
+from backend.common import change_events
+from backend.models.investments.stock import Dividends, StockInvestment, StockSummary
+
+# Fields kept from yf.Ticker(...).info; missing ones are stored as "N/A"
+RELEVANT_INFO_FIELDS = (
+    "currentPrice",
+    "website",
+    "industry",
+    "sector",
+    "priceHint",
+    "previousClose",
+    "open",
+    "dayLow",
+    "dayHigh",
+    "regularMarketPreviousClose",
+    "regularMarketOpen",
+    "regularMarketDayLow",
+    "regularMarketDayHigh",
+    "dividendRate",
+    "dividendYield",
+    "exDividendDate",
+    "payoutRatio",
+    "fiveYearAvgDividendYield",
+    "beta",
+    "trailingPE",
+    "forwardPE",
+    "volume",
+    "regularMarketVolume",
+    "averageVolume",
+    "averageVolume10days",
+    "averageDailyVolume10Day",
+    "bid",
+    "ask",
+    "bidSize",
+    "askSize",
+    "marketCap",
+    "fiftyTwoWeekLow",
+    "fiftyTwoWeekHigh",
+    "priceToSalesTrailing12Months",
+    "fiftyDayAverage",
+    "twoHundredDayAverage",
+    "trailingAnnualDividendRate",
+    "trailingAnnualDividendYield",
+    "currency",
+    "tradeable",
+    "enterpriseValue",
+    "profitMargins",
+    "floatShares",
+    "sharesOutstanding",
+    "heldPercentInsiders",
+    "heldPercentInstitutions",
+    "impliedSharesOutstanding",
+    "bookValue",
+    "priceToBook",
+    "lastFiscalYearEnd",
+    "nextFiscalYearEnd",
+    "mostRecentQuarter",
+    "earningsQuarterlyGrowth",
+    "netIncomeToCommon",
+    "trailingEps",
+    "forwardEps",
+    "lastSplitFactor",
+    "lastSplitDate",
+    "enterpriseToRevenue",
+    "enterpriseToEbitda",
+    "52WeekChange",
+    "SandP52WeekChange",
+    "lastDividendValue",
+    "lastDividendDate",
+    "quoteType",
+    "recommendationKey",
+    "totalCash",
+    "totalCashPerShare",
+    "ebitda",
+    "totalDebt",
+    "totalRevenue",
+    "debtToEquity",
+    "revenuePerShare",
+    "grossProfits",
+    "earningsGrowth",
+    "revenueGrowth",
+    "grossMargins",
+    "ebitdaMargins",
+    "operatingMargins",
+    "financialCurrency",
+    "symbol",
+    "customPriceAlertConfidence",
+    "shortName",
+    "longName",
+    "regularMarketTime",
+    "marketState",
+    "regularMarketChangePercent",
+    "regularMarketPrice",
+    "exchange",
+    "messageBoardId",
+    "averageDailyVolume3Month",
+    "fiftyTwoWeekLowChange",
+    "fiftyTwoWeekLowChangePercent",
+    "fiftyTwoWeekRange",
+    "fiftyTwoWeekHighChange",
+    "fiftyTwoWeekHighChangePercent",
+    "fiftyTwoWeekChangePercent",
+    "earningsTimestamp",
+    "earningsTimestampStart",
+    "earningsTimestampEnd",
+    "isEarningsDateEstimate",
+    "epsTrailingTwelveMonths",
+    "epsForward",
+    "fiftyDayAverageChange",
+    "fiftyDayAverageChangePercent",
+    "twoHundredDayAverageChange",
+    "twoHundredDayAverageChangePercent",
+    "sourceInterval",
+    "exchangeDataDelayedBy",
+    "cryptoTradeable",
+    "hasPrePostMarketData",
+    "firstTradeDateMilliseconds",
+    "regularMarketChange",
+    "regularMarketDayRange",
+    "fullExchangeName",
+    "trailingPegRatio",
+)
 
 
 class StockPriceFetcher(BaseFetcher):
@@ -23,6 +147,17 @@ class StockPriceFetcher(BaseFetcher):
         # Load config data from environment
         self.cache_expiry_in_seconds = 86400
         self.cache_key_prefix = "stock"
+        # Price-only records from the batched download live under their own
+        # prefix so they never shadow the full info records
+        self.quote_cache_key_prefix = "stock_quote"
+
+        # Concurrency, rate limit and retry policy for Yahoo Finance
+        self.max_workers = config.YF_MAX_WORKERS
+        self.max_retries = config.YF_MAX_RETRIES
+        self.backoff_base_seconds = 1
+        self.rate_limiter = TokenBucket(
+            rate=config.YF_REQUESTS_PER_SECOND, capacity=config.YF_MAX_WORKERS
+        )
 
         super().__init__(
             "utilities.stock_fetcher",
@@ -31,272 +166,72 @@ class StockPriceFetcher(BaseFetcher):
         )
         self.logger.debug("Stock fetcher initialized")
 
-    def get_stock_prices_in_bulk(self, stock_symbol_list: list):
+    def get_stock_prices_in_bulk(self, stock_symbol_list: list, price_only=False):
         """
         Fetch stock data for multiple symbols using Yahoo Finance API with Redis caching.
         Reuses standard cache helpers for consistency.
+
+        Cache misses are fetched concurrently by a bounded thread pool; every
+        request takes a token from a shared bucket, so wall time scales with the
+        rate limit instead of the symbol count. Failed symbols are retried with
+        exponential backoff.
+
+        Args:
+            stock_symbol_list: NSE symbols without the ".NS" suffix
+            price_only: Only refresh prices, via one batched yf.download call.
+                Symbols the batch cannot price fall back to the full fetch.
+
+        Returns:
+            Dictionary with 'data' (symbol -> info dict or None) and 'errors'
         """
         cached_map = self.get_from_cache(self.cache_key_prefix, stock_symbol_list)
         missing_symbols = [sym for sym, val in cached_map.items() if val is None]
         fetched = {}
         errors = {}
 
+        if missing_symbols and price_only:
+            quotes = self.get_from_cache(self.quote_cache_key_prefix, missing_symbols)
+            cached_map.update({s: q for s, q in quotes.items() if q is not None})
+            missing_symbols = [s for s in missing_symbols if quotes.get(s) is None]
+
+            if missing_symbols:
+                quoted = self._download_quotes(missing_symbols)
+                if quoted:
+                    fetched.update(quoted)
+                    self._cache_fetched(self.quote_cache_key_prefix, quoted)
+                missing_symbols = [s for s in missing_symbols if s not in quoted]
+
         if missing_symbols:
             self.logger.info(
                 f"Fetching fresh data for {len(missing_symbols)} stock(s): {missing_symbols}"
             )
 
-            for stock_symbol in missing_symbols:
-                try:
-                    self.logger.info(f"Fetching {stock_symbol} from Yahoo Finance...")
-                    ticker_info = yf.Ticker(stock_symbol + ".NS").info
-
-                    relevant_data = {
-                        "currentPrice": ticker_info.get("currentPrice", "N/A"),
-                        "website": ticker_info.get("website", "N/A"),
-                        "industry": ticker_info.get("industry", "N/A"),
-                        "sector": ticker_info.get("sector", "N/A"),
-                        "priceHint": ticker_info.get("priceHint", "N/A"),
-                        "previousClose": ticker_info.get("previousClose", "N/A"),
-                        "open": ticker_info.get("open", "N/A"),
-                        "dayLow": ticker_info.get("dayLow", "N/A"),
-                        "dayHigh": ticker_info.get("dayHigh", "N/A"),
-                        "regularMarketPreviousClose": ticker_info.get(
-                            "regularMarketPreviousClose", "N/A"
-                        ),
-                        "regularMarketOpen": ticker_info.get(
-                            "regularMarketOpen", "N/A"
-                        ),
-                        "regularMarketDayLow": ticker_info.get(
-                            "regularMarketDayLow", "N/A"
-                        ),
-                        "regularMarketDayHigh": ticker_info.get(
-                            "regularMarketDayHigh", "N/A"
-                        ),
-                        "dividendRate": ticker_info.get("dividendRate", "N/A"),
-                        "dividendYield": ticker_info.get("dividendYield", "N/A"),
-                        "exDividendDate": ticker_info.get("exDividendDate", "N/A"),
-                        "payoutRatio": ticker_info.get("payoutRatio", "N/A"),
-                        "fiveYearAvgDividendYield": ticker_info.get(
-                            "fiveYearAvgDividendYield", "N/A"
-                        ),
-                        "beta": ticker_info.get("beta", "N/A"),
-                        "trailingPE": ticker_info.get("trailingPE", "N/A"),
-                        "forwardPE": ticker_info.get("forwardPE", "N/A"),
-                        "volume": ticker_info.get("volume", "N/A"),
-                        "regularMarketVolume": ticker_info.get(
-                            "regularMarketVolume", "N/A"
-                        ),
-                        "averageVolume": ticker_info.get("averageVolume", "N/A"),
-                        "averageVolume10days": ticker_info.get(
-                            "averageVolume10days", "N/A"
-                        ),
-                        "averageDailyVolume10Day": ticker_info.get(
-                            "averageDailyVolume10Day", "N/A"
-                        ),
-                        "bid": ticker_info.get("bid", "N/A"),
-                        "ask": ticker_info.get("ask", "N/A"),
-                        "bidSize": ticker_info.get("bidSize", "N/A"),
-                        "askSize": ticker_info.get("askSize", "N/A"),
-                        "marketCap": ticker_info.get("marketCap", "N/A"),
-                        "fiftyTwoWeekLow": ticker_info.get("fiftyTwoWeekLow", "N/A"),
-                        "fiftyTwoWeekHigh": ticker_info.get("fiftyTwoWeekHigh", "N/A"),
-                        "priceToSalesTrailing12Months": ticker_info.get(
-                            "priceToSalesTrailing12Months", "N/A"
-                        ),
-                        "fiftyDayAverage": ticker_info.get("fiftyDayAverage", "N/A"),
-                        "twoHundredDayAverage": ticker_info.get(
-                            "twoHundredDayAverage", "N/A"
-                        ),
-                        "trailingAnnualDividendRate": ticker_info.get(
-                            "trailingAnnualDividendRate", "N/A"
-                        ),
-                        "trailingAnnualDividendYield": ticker_info.get(
-                            "trailingAnnualDividendYield", "N/A"
-                        ),
-                        "currency": ticker_info.get("currency", "N/A"),
-                        "tradeable": ticker_info.get("tradeable", "N/A"),
-                        "enterpriseValue": ticker_info.get("enterpriseValue", "N/A"),
-                        "profitMargins": ticker_info.get("profitMargins", "N/A"),
-                        "floatShares": ticker_info.get("floatShares", "N/A"),
-                        "sharesOutstanding": ticker_info.get(
-                            "sharesOutstanding", "N/A"
-                        ),
-                        "heldPercentInsiders": ticker_info.get(
-                            "heldPercentInsiders", "N/A"
-                        ),
-                        "heldPercentInstitutions": ticker_info.get(
-                            "heldPercentInstitutions", "N/A"
-                        ),
-                        "impliedSharesOutstanding": ticker_info.get(
-                            "impliedSharesOutstanding", "N/A"
-                        ),
-                        "bookValue": ticker_info.get("bookValue", "N/A"),
-                        "priceToBook": ticker_info.get("priceToBook", "N/A"),
-                        "lastFiscalYearEnd": ticker_info.get(
-                            "lastFiscalYearEnd", "N/A"
-                        ),
-                        "nextFiscalYearEnd": ticker_info.get(
-                            "nextFiscalYearEnd", "N/A"
-                        ),
-                        "mostRecentQuarter": ticker_info.get(
-                            "mostRecentQuarter", "N/A"
-                        ),
-                        "earningsQuarterlyGrowth": ticker_info.get(
-                            "earningsQuarterlyGrowth", "N/A"
-                        ),
-                        "netIncomeToCommon": ticker_info.get(
-                            "netIncomeToCommon", "N/A"
-                        ),
-                        "trailingEps": ticker_info.get("trailingEps", "N/A"),
-                        "forwardEps": ticker_info.get("forwardEps", "N/A"),
-                        "lastSplitFactor": ticker_info.get("lastSplitFactor", "N/A"),
-                        "lastSplitDate": ticker_info.get("lastSplitDate", "N/A"),
-                        "enterpriseToRevenue": ticker_info.get(
-                            "enterpriseToRevenue", "N/A"
-                        ),
-                        "enterpriseToEbitda": ticker_info.get(
-                            "enterpriseToEbitda", "N/A"
-                        ),
-                        "52WeekChange": ticker_info.get("52WeekChange", "N/A"),
-                        "SandP52WeekChange": ticker_info.get(
-                            "SandP52WeekChange", "N/A"
-                        ),
-                        "lastDividendValue": ticker_info.get(
-                            "lastDividendValue", "N/A"
-                        ),
-                        "lastDividendDate": ticker_info.get("lastDividendDate", "N/A"),
-                        "quoteType": ticker_info.get("quoteType", "N/A"),
-                        "recommendationKey": ticker_info.get(
-                            "recommendationKey", "N/A"
-                        ),
-                        "totalCash": ticker_info.get("totalCash", "N/A"),
-                        "totalCashPerShare": ticker_info.get(
-                            "totalCashPerShare", "N/A"
-                        ),
-                        "ebitda": ticker_info.get("ebitda", "N/A"),
-                        "totalDebt": ticker_info.get("totalDebt", "N/A"),
-                        "totalRevenue": ticker_info.get("totalRevenue", "N/A"),
-                        "debtToEquity": ticker_info.get("debtToEquity", "N/A"),
-                        "revenuePerShare": ticker_info.get("revenuePerShare", "N/A"),
-                        "grossProfits": ticker_info.get("grossProfits", "N/A"),
-                        "earningsGrowth": ticker_info.get("earningsGrowth", "N/A"),
-                        "revenueGrowth": ticker_info.get("revenueGrowth", "N/A"),
-                        "grossMargins": ticker_info.get("grossMargins", "N/A"),
-                        "ebitdaMargins": ticker_info.get("ebitdaMargins", "N/A"),
-                        "operatingMargins": ticker_info.get("operatingMargins", "N/A"),
-                        "financialCurrency": ticker_info.get(
-                            "financialCurrency", "N/A"
-                        ),
-                        "symbol": ticker_info.get("symbol", "N/A"),
-                        "customPriceAlertConfidence": ticker_info.get(
-                            "customPriceAlertConfidence", "N/A"
-                        ),
-                        "shortName": ticker_info.get("shortName", "N/A"),
-                        "longName": ticker_info.get("longName", "N/A"),
-                        "regularMarketTime": ticker_info.get(
-                            "regularMarketTime", "N/A"
-                        ),
-                        "marketState": ticker_info.get("marketState", "N/A"),
-                        "regularMarketChangePercent": ticker_info.get(
-                            "regularMarketChangePercent", "N/A"
-                        ),
-                        "regularMarketPrice": ticker_info.get(
-                            "regularMarketPrice", "N/A"
-                        ),
-                        "exchange": ticker_info.get("exchange", "N/A"),
-                        "messageBoardId": ticker_info.get("messageBoardId", "N/A"),
-                        "averageDailyVolume3Month": ticker_info.get(
-                            "averageDailyVolume3Month", "N/A"
-                        ),
-                        "fiftyTwoWeekLowChange": ticker_info.get(
-                            "fiftyTwoWeekLowChange", "N/A"
-                        ),
-                        "fiftyTwoWeekLowChangePercent": ticker_info.get(
-                            "fiftyTwoWeekLowChangePercent", "N/A"
-                        ),
-                        "fiftyTwoWeekRange": ticker_info.get(
-                            "fiftyTwoWeekRange", "N/A"
-                        ),
-                        "fiftyTwoWeekHighChange": ticker_info.get(
-                            "fiftyTwoWeekHighChange", "N/A"
-                        ),
-                        "fiftyTwoWeekHighChangePercent": ticker_info.get(
-                            "fiftyTwoWeekHighChangePercent", "N/A"
-                        ),
-                        "fiftyTwoWeekChangePercent": ticker_info.get(
-                            "fiftyTwoWeekChangePercent", "N/A"
-                        ),
-                        "earningsTimestamp": ticker_info.get(
-                            "earningsTimestamp", "N/A"
-                        ),
-                        "earningsTimestampStart": ticker_info.get(
-                            "earningsTimestampStart", "N/A"
-                        ),
-                        "earningsTimestampEnd": ticker_info.get(
-                            "earningsTimestampEnd", "N/A"
-                        ),
-                        "isEarningsDateEstimate": ticker_info.get(
-                            "isEarningsDateEstimate", "N/A"
-                        ),
-                        "epsTrailingTwelveMonths": ticker_info.get(
-                            "epsTrailingTwelveMonths", "N/A"
-                        ),
-                        "epsForward": ticker_info.get("epsForward", "N/A"),
-                        "fiftyDayAverageChange": ticker_info.get(
-                            "fiftyDayAverageChange", "N/A"
-                        ),
-                        "fiftyDayAverageChangePercent": ticker_info.get(
-                            "fiftyDayAverageChangePercent", "N/A"
-                        ),
-                        "twoHundredDayAverageChange": ticker_info.get(
-                            "twoHundredDayAverageChange", "N/A"
-                        ),
-                        "twoHundredDayAverageChangePercent": ticker_info.get(
-                            "twoHundredDayAverageChangePercent", "N/A"
-                        ),
-                        "sourceInterval": ticker_info.get("sourceInterval", "N/A"),
-                        "exchangeDataDelayedBy": ticker_info.get(
-                            "exchangeDataDelayedBy", "N/A"
-                        ),
-                        "cryptoTradeable": ticker_info.get("cryptoTradeable", "N/A"),
-                        "hasPrePostMarketData": ticker_info.get(
-                            "hasPrePostMarketData", "N/A"
-                        ),
-                        "firstTradeDateMilliseconds": ticker_info.get(
-                            "firstTradeDateMilliseconds", "N/A"
-                        ),
-                        "regularMarketChange": ticker_info.get(
-                            "regularMarketChange", "N/A"
-                        ),
-                        "regularMarketDayRange": ticker_info.get(
-                            "regularMarketDayRange", "N/A"
-                        ),
-                        "fullExchangeName": ticker_info.get("fullExchangeName", "N/A"),
-                        "trailingPegRatio": ticker_info.get("trailingPegRatio", "N/A"),
-                    }
-
-                    fetched[stock_symbol] = relevant_data
-                    self.logger.info(
-                        f"✅ {stock_symbol}: {relevant_data['currentPrice']} cached"
-                    )
-
-                except Exception as e:
-                    self.logger.error(f"❌ Error fetching {stock_symbol}: {e}")
-                    fetched[stock_symbol] = None
-                    errors[stock_symbol] = str(e)
-
-                # optional throttling
-                if len(missing_symbols) > 5:
-                    time.sleep(1)
+            workers = max(1, min(self.max_workers, len(missing_symbols)))
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="stock-fetch"
+            ) as pool:
+                futures = {
+                    pool.submit(self._fetch_ticker_info, sym): sym
+                    for sym in missing_symbols
+                }
+                for future in as_completed(futures):
+                    stock_symbol = futures[future]
+                    try:
+                        relevant_data = future.result()
+                        fetched[stock_symbol] = relevant_data
+                        self.logger.info(
+                            f"✅ {stock_symbol}: {relevant_data['currentPrice']} cached"
+                        )
+                    except Exception as e:
+                        self.logger.error(f"❌ Error fetching {stock_symbol}: {e}")
+                        fetched[stock_symbol] = None
+                        errors[stock_symbol] = str(e)
 
             # Cache only successful fetches
-            to_cache = {s: v for s, v in fetched.items() if v is not None}
-            if to_cache:
-                try:
-                    self.set_cache(self.cache_key_prefix, to_cache)
-                except Exception as e:
-                    self.logger.warning(f"⚠️ Failed to cache stock data: {e}")
+            self._cache_fetched(
+                self.cache_key_prefix,
+                {s: fetched[s] for s in missing_symbols if fetched.get(s) is not None},
+            )
 
         # Merge cached and fetched data
         final_map = {}
@@ -309,6 +244,118 @@ class StockPriceFetcher(BaseFetcher):
 
         return {"data": final_map, "errors": errors}
 
+    def _cache_fetched(self, prefix: str, to_cache: dict):
+        if not to_cache:
+            return
+        try:
+            self.set_cache(prefix, to_cache)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Failed to cache stock data: {e}")
+
+    def _fetch_ticker_info(self, stock_symbol: str) -> dict:
+        """Fetch one symbol's info, rate limited and retried with backoff."""
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                self.logger.info(f"Fetching {stock_symbol} from Yahoo Finance...")
+                ticker_info = yf.Ticker(stock_symbol + ".NS").info
+                return {
+                    field: ticker_info.get(field, "N/A")
+                    for field in RELEVANT_INFO_FIELDS
+                }
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff_base_seconds * (2**attempt)
+                delay += random.uniform(0, delay)
+                self.logger.warning(
+                    f"⚠️ {stock_symbol} attempt {attempt + 1} failed ({e}), "
+                    f"retrying in {delay:.1f}s"
+                )
+                time.sleep(delay)
+
+    def _download_quotes(self, symbols: list) -> dict:
+        """
+        Price-only fast path: one multi-ticker yf.download for all symbols.
+
+        Returns:
+            Dictionary of symbol -> quote dict with 'currentPrice' and
+            'previousClose' for every symbol that came back with prices
+        """
+        tickers = [sym + ".NS" for sym in symbols]
+        self.rate_limiter.acquire()
+        try:
+            history = yf.download(
+                tickers=tickers,
+                period="5d",
+                interval="1d",
+                group_by="ticker",
+                auto_adjust=False,
+                progress=False,
+                threads=False,
+            )
+        except Exception as e:
+            self.logger.warning(f"⚠️ Batched price download failed: {e}")
+            return {}
+
+        quotes = {}
+        for sym, ticker in zip(symbols, tickers):
+            try:
+                closes = history[ticker]["Close"].dropna()
+            except (KeyError, TypeError):
+                continue
+            if closes.empty:
+                continue
+            quotes[sym] = {
+                "currentPrice": float(closes.iloc[-1]),
+                "previousClose": (
+                    float(closes.iloc[-2])
+                    if len(closes) > 1
+                    else float(closes.iloc[-1])
+                ),
+                "symbol": ticker,
+            }
+
+        self.logger.info(f"✅ Batched prices for {len(quotes)}/{len(symbols)} stock(s)")
+        return quotes
+
+    def _current_prices(self, stock_data: Dict) -> Dict[str, float]:
+        """Pick the usable price of every symbol, skipping those without one."""
+        prices = {}
+        for symbol, data in stock_data["data"].items():
+            if data is None:
+                self.logger.warning(
+                    f"Skipping update for stock {symbol} as data is None"
+                )
+                continue
+
+            raw_price = (
+                data.get("currentPrice")
+                if data.get("currentPrice") != "N/A"
+                else data.get("previousClose")
+            )
+            if raw_price == "N/A" or raw_price is None:
+                self.logger.warning(
+                    f"Skipping update for stock {symbol} as price is N/A"
+                )
+                continue
+
+            prices[symbol] = float(raw_price)
+        return prices
+
+    def _dividend_flows(self, db: Session, symbols) -> list:
+        """Dividends received on the symbols, as (investor, symbol, date, amount) cash flows."""
+        return (
+            db.query(
+                Dividends.investor,
+                Dividends.stock_symbol,
+                Dividends.received_date,
+                Dividends.amount,
+            )
+            .filter(Dividends.stock_symbol.in_(list(symbols)))
+            .all()
+        )
+
     def update_stock_investments(
         self, db: Session, stock_data: Dict, dividend_data=None
     ) -> Dict:
@@ -328,96 +375,23 @@ class StockPriceFetcher(BaseFetcher):
                 - 'updated_count': Number of investments successfully updated
                 - 'errors': List of error messages (if success=True) or single error (if success=False)
         """
-        if dividend_data is None:
-            dividend_data = {}
-
-        today = datetime.now(UTC)
-        updated_count = 0
-        errors = []
         try:
-            for symbol, data in stock_data["data"].items():
-                # Get all bullion investments that need updating
-                if data is None:
-                    self.logger.warning(
-                        f"Skipping update for stock {symbol} as data is None"
-                    )
-                    continue
-
-                # Ensure we have price data
-                raw_price = (
-                    data.get("currentPrice")
-                    if data.get("currentPrice") != "N/A"
-                    else data.get("previousClose")
-                )
-                if raw_price == "N/A" or raw_price is None:
-                    self.logger.warning(
-                        f"Skipping update for stock {symbol} as price is N/A"
-                    )
-                    continue
-
-                price = Decimal(raw_price)
-
-                stock_investments = (
-                    db.query(StockInvestment)
-                    .filter(
-                        StockInvestment.stock_symbol == symbol,
-                        StockInvestment.transaction_type == "BUY",
-                    )
-                    .all()
-                )
-
-                dividend_amount = dividend_data.get(symbol, 0)
-                currency_symbol = "₹"
-                for investment in stock_investments:
-                    try:
-                        stock_name = data.get("shortName", symbol)
-                        self.logger.info(
-                            f"Updating Stock investment data for {stock_name}"
-                        )
-                        self.logger.info(
-                            f"Current price for stock: {symbol} in INR is: {currency_symbol}{price}"
-                        )
-
-                        current_value = (
-                            float(price * investment.stock_quantity) + dividend_amount
-                        )
-                        self.logger.info(
-                            f"We got the current value {current_value} for stock: {symbol} by adding: {float(price * investment.stock_quantity)} and dividend: {dividend_amount}"
-                        )
-                        initial_investment = investment.total_invested_amount
-                        # Calculate financial metrics using shared utility
-                        roi_value = FinancialCalculator.calculate_roi(
-                            current_value, initial_investment
-                        )
-                        # Calculate XIRR (simplified version)
-                        investment.xirr = FinancialCalculator.calculate_xirr(
-                            current_value,
-                            initial_investment,
-                            investment.investment_date,
-                            today.date(),
-                        )
-
-                        # Updating the investment table
-                        investment.current_price_per_stock = price
-                        investment.current_total_value = current_value
-                        investment.return_on_investment = roi_value
-
-                        updated_count += 1
-                        self.logger.debug(
-                            f"Updated {stock_name} with price: {currency_symbol}{price}"
-                        )
-
-                    except Exception as e:
-                        stock_name = data.get("shortName", symbol)
-                        self.logger.error(
-                            f"Failed to update {stock_name} investment: {e}"
-                        )
+            updated_count = valuation_engine.revalue_investments(
+                db,
+                StockInvestment,
+                key_column="stock_symbol",
+                quantity_column="stock_quantity",
+                price_column="current_price_per_stock",
+                prices=self._current_prices(stock_data),
+                extra_value=dividend_data,
+                filters=(StockInvestment.transaction_type == "BUY",),
+            )
 
             # Commit all changes
             db.commit()
             self.logger.info(f"Updated {updated_count} stock investments")
 
-            return {"success": True, "updated_count": updated_count, "errors": errors}
+            return {"success": True, "updated_count": updated_count, "errors": []}
 
         except Exception as e:
             db.rollback()
@@ -431,7 +405,7 @@ class StockPriceFetcher(BaseFetcher):
         """Update stock summary records with current prices.
 
         Updates all stock summary records in the database with current stock prices,
-        recalculating aggregated values (including dividends), ROI, and weighted average XIRR.
+        recalculating aggregated values (including dividends), ROI, and XIRR over each holding's cash flows.
 
         Args:
             db: Database session
@@ -444,110 +418,24 @@ class StockPriceFetcher(BaseFetcher):
                 - 'updated_count': Number of summaries successfully updated
                 - 'errors': List of error messages (if success=True) or single error (if success=False)
         """
-        if dividend_data is None:
-            dividend_data = {}
-        updated_count = 0
-        errors = []
-
         try:
-            for symbol, data in stock_data["data"].items():
-                # Get all stock investments that need updating
-                if data is None:
-                    self.logger.warning(
-                        f"Skipping summary update for stock {symbol} as data is None"
-                    )
-                    continue
-
-                # Ensure we have price data
-                raw_price = (
-                    data.get("currentPrice")
-                    if data.get("currentPrice") != "N/A"
-                    else data.get("previousClose")
-                )
-                if raw_price == "N/A" or raw_price is None:
-                    self.logger.warning(
-                        f"Skipping summary update for stock {symbol} as price is N/A"
-                    )
-                    continue
-
-                price = float(raw_price)
-
-                mf_summaries = (
-                    db.query(StockSummary)
-                    .filter(StockSummary.stock_symbol == symbol)
-                    .all()
-                )
-                investments = (
-                    db.query(StockInvestment)
-                    .filter(StockInvestment.stock_symbol == symbol)
-                    .all()
-                )
-
-                dividend_amount = dividend_data.get(symbol, 0)
-                currency_symbol = "₹"
-                for summary in mf_summaries:
-                    try:
-                        stock_name = data.get("shortName", symbol)
-                        self.logger.info(
-                            f"Updating Stock Summary data for {stock_name}"
-                        )
-                        self.logger.info(
-                            f"Current price for stock: {symbol} in INR is: {currency_symbol}{price}"
-                        )
-
-                        current_value = (
-                            round((price * summary.total_quantity), 2) + dividend_amount
-                        )
-                        self.logger.info(
-                            f"We got the current value {current_value} for stock: {symbol} by adding: {float(price * summary.total_quantity)} and dividend: {dividend_amount}"
-                        )
-
-                        initial_investment = summary.total_cost
-                        roi_value = FinancialCalculator.calculate_roi(
-                            current_value, initial_investment
-                        )
-
-                        # Weighted average XIRR calculation from Bullion Investment
-                        relevant_investments = [
-                            inv for inv in investments if inv.stock_symbol == symbol
-                        ]
-
-                        if relevant_investments:
-                            total_weighted_xirr = sum(
-                                (investment.total_invested_amount / initial_investment)
-                                * investment.xirr
-                                for investment in relevant_investments
-                            )
-                            self.logger.info(
-                                f"Total weighted xirr calculated is: {round(total_weighted_xirr, 2)}%"
-                            )
-                        else:
-                            total_weighted_xirr = 0.0
-
-                        # Update Summary table
-                        summary.current_price_per_unit = price
-                        summary.current_value = current_value
-                        summary.roi = roi_value
-                        summary.xirr = total_weighted_xirr
-                        summary.last_updated = datetime.now(UTC)
-
-                        updated_count += 1
-                        self.logger.info(
-                            f"Updated {stock_name} investment summary with price: {currency_symbol}{price}"
-                        )
-
-                    except Exception as e:
-                        error_msg = (
-                            f"Error updating investment summary {summary.id}: {e}"
-                        )
-                        self.logger.error(error_msg)
-                        errors.append(error_msg)
+            prices = self._current_prices(stock_data)
+            updated_count = valuation_engine.revalue_summaries(
+                db,
+                StockSummary,
+                StockInvestment,
+                key_column="stock_symbol",
+                prices=prices,
+                extra_value=dividend_data,
+                extra_flows=self._dividend_flows(db, prices) if dividend_data else (),
+            )
 
             # Commit all changes
             db.commit()
             self.logger.info(f"Updated {updated_count} stock investment summary")
+            change_events.publish(change_events.VALUATION, "refresh")
 
-            return {"success": True, "updated_count": updated_count, "errors": errors}
+            return {"success": True, "updated_count": updated_count, "errors": []}
 
         except Exception as e:
             db.rollback()
@@ -556,4 +444,4 @@ class StockPriceFetcher(BaseFetcher):
             return {"success": False, "error": error_msg, "updated_count": 0}
 
 
-stockFetcher = StockPriceFetcher()
+stockFetcher = LazySingleton(StockPriceFetcher)